@@ -0,0 +1,31 @@
+"""Add contact follow-up priority index
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'contacts', sa.Column('next_follow_up_at', sa.DateTime(timezone=True), nullable=True)
+    )
+    op.create_index('ix_contacts_user_next_follow_up', 'contacts', ['user_id', 'next_follow_up_at'])
+    # Backfill with: python -m app.jobs.follow_up
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contacts_user_next_follow_up', table_name='contacts')
+    op.drop_column('contacts', 'next_follow_up_at')
@@ -0,0 +1,57 @@
+"""Add normalized commitments table
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'commitments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('contact_id', sa.Integer(), nullable=False),
+        sa.Column('meeting_id', sa.Integer(), nullable=False),
+        sa.Column('owner', sa.String(length=10), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('deadline_text', sa.String(length=200), nullable=True),
+        sa.Column('due_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            'created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True
+        ),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['contact_id'], ['contacts.id']),
+        sa.ForeignKeyConstraint(['meeting_id'], ['meetings.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_commitments_id', 'commitments', ['id'])
+    op.create_index('ix_commitments_contact_id', 'commitments', ['contact_id'])
+    op.create_index('ix_commitments_meeting_id', 'commitments', ['meeting_id'])
+    op.create_index(
+        'ix_commitments_user_status_due', 'commitments', ['user_id', 'status', 'due_at']
+    )
+    # Backfill with: python -m app.jobs.commitments
+
+
+def downgrade() -> None:
+    op.drop_index('ix_commitments_user_status_due', table_name='commitments')
+    op.drop_index('ix_commitments_meeting_id', table_name='commitments')
+    op.drop_index('ix_commitments_contact_id', table_name='commitments')
+    op.drop_index('ix_commitments_id', table_name='commitments')
+    op.drop_table('commitments')
@@ -0,0 +1,68 @@
+"""Add topic/tag link tables
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'tags',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column(
+            'created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True
+        ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'name', name='uq_tags_user_name')
+    )
+    op.create_index('ix_tags_id', 'tags', ['id'])
+
+    op.create_table(
+        'contact_tags',
+        sa.Column('contact_id', sa.Integer(), nullable=False),
+        sa.Column('tag_id', sa.Integer(), nullable=False),
+        sa.Column('field', sa.String(length=50), nullable=False),
+        sa.ForeignKeyConstraint(['contact_id'], ['contacts.id']),
+        sa.ForeignKeyConstraint(['tag_id'], ['tags.id']),
+        sa.PrimaryKeyConstraint('contact_id', 'tag_id', 'field')
+    )
+    op.create_index('ix_contact_tags_tag_field', 'contact_tags', ['tag_id', 'field', 'contact_id'])
+
+    op.create_table(
+        'meeting_tags',
+        sa.Column('meeting_id', sa.Integer(), nullable=False),
+        sa.Column('tag_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['meeting_id'], ['meetings.id']),
+        sa.ForeignKeyConstraint(['tag_id'], ['tags.id']),
+        sa.PrimaryKeyConstraint('meeting_id', 'tag_id')
+    )
+    op.create_index('ix_meeting_tags_tag_meeting', 'meeting_tags', ['tag_id', 'meeting_id'])
+
+    op.create_index('ix_meetings_user_meeting_date', 'meetings', ['user_id', 'meeting_date'])
+    # Backfill with: python -m app.jobs.tags
+
+
+def downgrade() -> None:
+    op.drop_index('ix_meetings_user_meeting_date', table_name='meetings')
+    op.drop_index('ix_meeting_tags_tag_meeting', table_name='meeting_tags')
+    op.drop_table('meeting_tags')
+    op.drop_index('ix_contact_tags_tag_field', table_name='contact_tags')
+    op.drop_table('contact_tags')
+    op.drop_index('ix_tags_id', table_name='tags')
+    op.drop_table('tags')
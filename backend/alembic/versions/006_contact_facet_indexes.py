@@ -0,0 +1,31 @@
+"""Add contact facet indexes
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_contacts_user_city', 'contacts', ['user_id', 'city'])
+    op.create_index('ix_contacts_user_industry', 'contacts', ['user_id', 'current_industry'])
+    op.create_index('ix_contacts_user_stage', 'contacts', ['user_id', 'relationship_stage'])
+    op.create_index('ix_contacts_user_temperature', 'contacts', ['user_id', 'temperature_score'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contacts_user_temperature', table_name='contacts')
+    op.drop_index('ix_contacts_user_stage', table_name='contacts')
+    op.drop_index('ix_contacts_user_industry', table_name='contacts')
+    op.drop_index('ix_contacts_user_city', table_name='contacts')
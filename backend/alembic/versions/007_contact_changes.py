@@ -0,0 +1,49 @@
+"""Add contact field change log
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'contact_changes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('contact_id', sa.Integer(), nullable=False),
+        sa.Column('field', sa.String(length=50), nullable=False),
+        sa.Column('old_value', sa.JSON(), nullable=True),
+        sa.Column('new_value', sa.JSON(), nullable=True),
+        sa.Column('source', sa.String(length=20), nullable=False),
+        sa.Column('meeting_id', sa.Integer(), nullable=True),
+        sa.Column('changed_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['contact_id'], ['contacts.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_contact_changes_id', 'contact_changes', ['id'])
+    op.create_index(
+        'ix_contact_changes_contact_changed', 'contact_changes', ['contact_id', 'changed_at']
+    )
+    op.create_index('ix_contact_changes_user_changed', 'contact_changes', ['user_id', 'changed_at'])
+    # History starts empty: values before this migration cannot be reconstructed
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contact_changes_user_changed', table_name='contact_changes')
+    op.drop_index('ix_contact_changes_contact_changed', table_name='contact_changes')
+    op.drop_index('ix_contact_changes_id', table_name='contact_changes')
+    op.drop_table('contact_changes')
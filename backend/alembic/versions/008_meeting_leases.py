@@ -0,0 +1,39 @@
+"""Add meeting processing leases and attempt counters
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '008'
+down_revision: Union[str, None] = '007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'meetings', sa.Column('attempts', sa.Integer(), nullable=False, server_default='0')
+    )
+    op.add_column(
+        'meetings', sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True)
+    )
+    op.create_index('ix_meetings_status_lease', 'meetings', ['status', 'lease_expires_at'])
+    # Meetings already stuck in processing become eligible for recovery right away
+    op.execute(
+        "UPDATE meetings SET attempts = 1, lease_expires_at = CURRENT_TIMESTAMP "
+        "WHERE status = 'processing'"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_meetings_status_lease', table_name='meetings')
+    op.drop_column('meetings', 'lease_expires_at')
+    op.drop_column('meetings', 'attempts')
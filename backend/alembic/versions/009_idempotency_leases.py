@@ -0,0 +1,34 @@
+"""Add processing leases to idempotency keys
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '009'
+down_revision: Union[str, None] = '008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'idempotency_keys',
+        sa.Column('processing_expires_at', sa.DateTime(timezone=True), nullable=True)
+    )
+    # Keys already stuck in processing can be taken over by the next retry
+    op.execute(
+        "UPDATE idempotency_keys SET processing_expires_at = CURRENT_TIMESTAMP "
+        "WHERE status = 'processing'"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('idempotency_keys', 'processing_expires_at')
@@ -8,7 +8,9 @@ from sqlalchemy.orm import Session
 from app.models.database import get_db
 from app.models.models import User
 from app.models.schemas import UserCreate, UserLogin, UserResponse, Token
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.core.security import (
+    get_password_hash_async, verify_and_update_password_async, create_access_token
+)
 from app.core.config import settings
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -31,7 +33,7 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
         )
 
     # Create new user
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     db_user = User(
         email=user.email,
         hashed_password=hashed_password
@@ -54,13 +56,23 @@ async def login(user: UserLogin, db: Session = Depends(get_db)):
     db_user = db.query(User).filter(User.email == user.email).first()
 
     # Verify password
-    if not db_user or not verify_password(user.password, db_user.hashed_password):
+    valid, new_hash = False, None
+    if db_user:
+        valid, new_hash = await verify_and_update_password_async(
+            user.password, db_user.hashed_password
+        )
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Transparently upgrade hashes created under a previous cost factor
+    if new_hash:
+        db_user.hashed_password = new_hash
+        db.commit()
+
     # Create access token
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
     access_token = create_access_token(
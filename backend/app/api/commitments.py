@@ -0,0 +1,64 @@
+"""
+Commitments API endpoints.
+"""
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.models.database import get_db
+from app.models.schemas import CommitmentItem, CommitmentStatusUpdate
+from app.services.commitment_service import commitment_service
+from app.api.dependencies import CurrentUser
+
+router = APIRouter(prefix="/commitments", tags=["Commitments"])
+
+CommitmentOwner = Literal["me", "them"]
+
+OWNER_DESCRIPTION = "me: what I promised; them: what they promised; both if omitted"
+
+
+@router.get("/due-soon", response_model=list[CommitmentItem])
+async def list_due_soon_commitments(
+    current_user: CurrentUser,
+    db: Session = Depends(get_db),
+    days: int = Query(7, ge=0, le=365, description="Look-ahead window in days"),
+    owner: Optional[CommitmentOwner] = Query(None, description=OWNER_DESCRIPTION),
+    limit: int = Query(100, ge=1, le=500)
+):
+    """
+    Open commitments due within the next **days** days, soonest first.
+
+    E.g. "what do I owe people this week": `?owner=me&days=7`.
+    """
+    return commitment_service.list_due_soon(db, current_user.id, days, owner, limit)
+
+
+@router.get("/overdue", response_model=list[CommitmentItem])
+async def list_overdue_commitments(
+    current_user: CurrentUser,
+    db: Session = Depends(get_db),
+    owner: Optional[CommitmentOwner] = Query(None, description=OWNER_DESCRIPTION),
+    limit: int = Query(100, ge=1, le=500)
+):
+    """
+    Open commitments past their deadline, most overdue first.
+    """
+    return commitment_service.list_overdue(db, current_user.id, owner, limit)
+
+
+@router.patch("/{commitment_id}", response_model=CommitmentItem)
+async def update_commitment_status(
+    commitment_id: int,
+    update: CommitmentStatusUpdate,
+    current_user: CurrentUser,
+    db: Session = Depends(get_db)
+):
+    """
+    Mark a commitment as done, cancelled or open again.
+    """
+    commitment = commitment_service.update_status(
+        db, commitment_id, current_user.id, update.status
+    )
+    if not commitment:
+        raise HTTPException(status_code=404, detail="Commitment not found")
+    return commitment
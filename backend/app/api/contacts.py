@@ -1,31 +1,63 @@
 """
 Contacts API endpoints.
 """
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import Response
+from datetime import datetime, time
+from typing import Any, Optional
+from urllib.parse import quote
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
 from app.models.database import get_db
 from app.models.schemas import (
     ContactCreate, ContactUpdate, ContactListItem, ContactDetail,
-    ContactWithTimeline, MeetingCreate, MeetingListItem, ActionPlaybookDetail
+    ContactWithTimeline, MeetingCreate, MeetingListItem, ActionPlaybookDetail,
+    ContactBatchIds, ContactBatchUpdate, ContactBatchResponse, DueContactItem,
+    DuplicateCandidate, ContactMerge, ContactFacets, ContactChangeItem, ContactFieldDiff
 )
+from app.core.admission import AdmissionRejected
+from app.core.config import settings
+from app.core.query_budget import query_budget
+from app.services.cache_invalidation import timeline_cache
 from app.services.contact_service import contact_service, meeting_service
-from app.api.dependencies import CurrentUser
+from app.services.export_service import export_service, contact_markdown_filename
+from app.services.scoring_service import scoring_service
+from app.services.follow_up_service import follow_up_service
+from app.services.dedup_service import dedup_service
+from app.services.facet_service import facet_service
+from app.services.history_service import contact_history_service
+from app.services.idempotency_service import (
+    idempotency_service, IdempotencyKeyMismatch, IdempotencyInProgress
+)
+from app.api.dependencies import ContactFilters, CurrentUser, parse_fieldset
+from app.api.responses import FastJSONResponse, rows_to_dicts
 
 router = APIRouter(prefix="/contacts", tags=["Contacts"])
 
+LIST_FIELDS = list(ContactListItem.model_fields)
+DETAIL_FIELDS = list(ContactDetail.model_fields)
+MEETING_LIST_FIELDS = list(MeetingListItem.model_fields)
+TIMELINE_INCLUDES = ("meetings", "action_playbook")
+
+FIELDS_DESCRIPTION = "Comma-separated fields to return (sparse fieldset); id is always included"
+
+
+def _pick(obj: Any, fields: list[str]) -> dict[str, Any]:
+    """Serialize only the requested attributes of an ORM object."""
+    return {field: getattr(obj, field) for field in fields}
+
 
 # ==================== Contacts ====================
-@router.get("", response_model=list[ContactListItem])
+@router.get("", response_model=list[ContactListItem], dependencies=[Depends(query_budget(4))])
 async def list_contacts(
     current_user: CurrentUser,
+    filters: ContactFilters,
     db: Session = Depends(get_db),
     search: Optional[str] = Query(None, description="Search by name, company, or position"),
     skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100)
+    limit: int = Query(100, ge=1, le=100),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
 ):
     """
     List all contacts for the current user.
@@ -33,9 +65,122 @@ async def list_contacts(
     - **search**: Optional search term to filter by name, company, or position
     - **skip**: Number of results to skip (pagination)
     - **limit**: Maximum number of results to return
+    - **fields**: Optional subset of list fields to return
+    - **topic** / **project** / **industry**: Exact (case-insensitive) tag filters
+    - **city** / **relationship_stage**: Exact value filters
+    - **temperature_min** / **temperature_max**: Temperature score range
+    """
+    selected = parse_fieldset(fields, LIST_FIELDS)
+    rows, _ = contact_service.list_contacts(
+        db, current_user.id, search, skip, limit, fields=selected or LIST_FIELDS,
+        filters=filters
+    )
+    # Rows already match the response model; serialize them without re-validation
+    return FastJSONResponse(rows_to_dicts(rows))
+
+
+@router.get("/facets", response_model=ContactFacets)
+async def get_contact_facets(
+    current_user: CurrentUser,
+    filters: ContactFilters,
+    db: Session = Depends(get_db),
+    search: Optional[str] = Query(None, description="Search by name, company, or position"),
+):
+    """
+    Facet counts (city, industry, relationship stage, temperature range) for
+    the contacts matching the same search and filters as the list endpoint.
+
+    Computed in one grouped query and cached until the user's contacts change.
+    """
+    return facet_service.contact_facets(db, current_user.id, search, filters)
+
+
+@router.get("/due", response_model=list[DueContactItem])
+async def list_due_contacts(
+    current_user: CurrentUser,
+    db: Session = Depends(get_db),
+    due_before: Optional[datetime] = Query(
+        None, description="Only contacts due by this time (default: end of today)"
+    ),
+    limit: int = Query(10, ge=1, le=100)
+):
+    """
+    Who to reach out to today: contacts whose follow-up is due, most overdue first.
+
+    Backed by a precomputed, indexed due date that is refreshed whenever a
+    meeting or playbook changes.
+    """
+    due_before = due_before or datetime.combine(datetime.now().date(), time.max)
+    contacts = follow_up_service.list_due(db, current_user.id, due_before, limit)
+    playbooks = contact_service.get_action_playbooks(db, [c.id for c in contacts])
+    return [
+        DueContactItem(
+            **ContactListItem.model_validate(contact).model_dump(),
+            next_follow_up_at=contact.next_follow_up_at,
+            next_action=getattr(playbooks.get(contact.id), "next_action", None)
+        )
+        for contact in contacts
+    ]
+
+
+@router.get("/duplicates", response_model=list[DuplicateCandidate])
+async def list_duplicate_contacts(
+    current_user: CurrentUser,
+    db: Session = Depends(get_db),
+    threshold: float = Query(0.5, ge=0, le=1, description="Minimum similarity score"),
+    limit: int = Query(100, ge=1, le=500)
+):
+    """
+    Find contacts that are likely the same person ("张总", "张伟", "Zhang Wei").
+
+    Contacts are compared only within blocks sharing a phone, email, WeChat,
+    normalized name, pinyin or surname plus company, so this scales to large networks.
+    """
+    pairs = dedup_service.find_duplicates(db, current_user.id, threshold, limit)
+    ids = [cid for pair in pairs for cid in pair["contact_ids"]]
+    contacts = contact_service.get_contacts(db, ids, current_user.id)
+    return [
+        DuplicateCandidate(
+            contacts=[ContactListItem.model_validate(contacts[cid]) for cid in pair["contact_ids"]],
+            score=pair["score"],
+            reasons=pair["reasons"]
+        )
+        for pair in pairs
+    ]
+
+
+@router.get("/changes", response_model=list[ContactFieldDiff])
+async def list_contact_changes(
+    current_user: CurrentUser,
+    since: datetime = Query(..., description="Only changes at or after this time"),
+    contact_id: Optional[int] = Query(None, description="Only changes of this contact"),
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db)
+):
+    """
+    What changed since a date: net field changes of the user's contacts,
+    one item per contact and field, most recent first.
+    """
+    return contact_history_service.changes_since(db, current_user.id, since, contact_id, limit)
+
+
+@router.post("/merge", response_model=ContactDetail)
+async def merge_contacts(
+    merge: ContactMerge,
+    current_user: CurrentUser,
+    db: Session = Depends(get_db)
+):
+    """
+    Merge duplicate contacts into a primary contact.
+
+    Meetings and commitments move to the primary contact, empty fields are
+    filled from the duplicates, playbooks are merged and the duplicates are
+    deleted, all in one transaction.
     """
-    contacts, _ = contact_service.list_contacts(db, current_user.id, search, skip, limit)
-    return contacts
+    contact = dedup_service.merge(db, current_user.id, merge.primary_id, merge.duplicate_ids)
+    if not contact:
+        raise HTTPException(status_code=404, detail="Contact not found")
+    return contact
 
 
 @router.post("", response_model=ContactDetail, status_code=201)
@@ -52,18 +197,24 @@ async def create_contact(
     return contact_service.create_contact(db, current_user.id, contact)
 
 
-@router.get("/{contact_id}", response_model=ContactDetail)
+@router.get("/{contact_id}", response_model=ContactDetail, dependencies=[Depends(query_budget(3))])
 async def get_contact(
     contact_id: int,
     current_user: CurrentUser,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
 ):
     """
     Get a specific contact by ID.
+
+    - **fields**: Optional subset of contact fields to return
     """
-    contact = contact_service.get_contact(db, contact_id, current_user.id)
+    selected = parse_fieldset(fields, DETAIL_FIELDS)
+    contact = contact_service.get_contact(db, contact_id, current_user.id, selected)
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
+    if selected:
+        return FastJSONResponse(_pick(contact, selected))
     return contact
 
 
@@ -102,6 +253,128 @@ async def delete_contact(
     return Response(status_code=204)
 
 
+@router.get("/{contact_id}/history", response_model=list[ContactChangeItem])
+async def get_contact_history(
+    contact_id: int,
+    current_user: CurrentUser,
+    db: Session = Depends(get_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500)
+):
+    """
+    Field change log of a contact, newest first.
+
+    Every profile update, meeting extraction and merge appends the old and
+    new value of each changed field.
+    """
+    if not contact_service.get_contact(db, contact_id, current_user.id, ["id"]):
+        raise HTTPException(status_code=404, detail="Contact not found")
+    return contact_history_service.list_changes(db, contact_id, skip, limit)
+
+
+@router.get("/{contact_id}/as-of", response_model=ContactDetail)
+async def get_contact_as_of(
+    contact_id: int,
+    current_user: CurrentUser,
+    at: datetime = Query(..., description="Point in time to reconstruct the contact at"),
+    db: Session = Depends(get_db)
+):
+    """
+    Reconstruct a contact's profile as it was at a point in time, e.g. their
+    company and position before a job change.
+
+    Derived fields (last meeting date, temperature) keep their current values.
+    """
+    contact = contact_service.get_contact(db, contact_id, current_user.id)
+    if not contact:
+        raise HTTPException(status_code=404, detail="Contact not found")
+    values = contact_history_service.contact_as_of(db, contact, at)
+    if values is None:
+        raise HTTPException(status_code=404, detail="Contact did not exist at that time")
+    return ContactDetail(**{**ContactDetail.model_validate(contact).model_dump(), **values})
+
+
+# ==================== Batch ====================
+@router.post("/batch/get", response_model=ContactBatchResponse)
+async def batch_get_contacts(
+    batch: ContactBatchIds,
+    current_user: CurrentUser,
+    db: Session = Depends(get_db)
+):
+    """
+    Get several contacts in one query.
+
+    Results are returned in request order; unknown IDs get status **not_found**.
+    """
+    contacts = contact_service.get_contacts(db, batch.ids, current_user.id)
+    return {
+        "results": [
+            {"id": cid, "status": "found", "contact": contacts[cid]} if cid in contacts
+            else {"id": cid, "status": "not_found"}
+            for cid in batch.ids
+        ]
+    }
+
+
+@router.patch("/batch", response_model=ContactBatchResponse)
+async def batch_update_contacts(
+    batch: ContactBatchUpdate,
+    current_user: CurrentUser,
+    db: Session = Depends(get_db)
+):
+    """
+    Apply partial updates to several contacts in one transaction.
+
+    Only include fields that should be updated in each item.
+    """
+    contacts = contact_service.update_contacts(
+        db, current_user.id, [(item.id, item.update) for item in batch.items]
+    )
+    return {
+        "results": [
+            {"id": item.id, "status": "updated", "contact": contacts[item.id]}
+            if item.id in contacts
+            else {"id": item.id, "status": "not_found"}
+            for item in batch.items
+        ]
+    }
+
+
+@router.post("/batch/delete", response_model=ContactBatchResponse)
+async def batch_delete_contacts(
+    batch: ContactBatchIds,
+    current_user: CurrentUser,
+    db: Session = Depends(get_db)
+):
+    """
+    Delete several contacts in one transaction.
+
+    This will also delete all associated meetings and action playbooks.
+    """
+    deleted = contact_service.delete_contacts(db, batch.ids, current_user.id)
+    return {
+        "results": [
+            {"id": cid, "status": "deleted" if cid in deleted else "not_found"}
+            for cid in batch.ids
+        ]
+    }
+
+
+# ==================== Temperature ====================
+@router.post("/temperature/recompute")
+async def recompute_temperature(
+    current_user: CurrentUser,
+    db: Session = Depends(get_db)
+):
+    """
+    Recompute relationship temperature for all contacts of the current user.
+
+    Scores also refresh on a schedule; this triggers it immediately.
+    """
+    updated = scoring_service.recompute_user(db, current_user.id)
+    return {"updated": updated}
+
+
 # ==================== Contact Detail with Timeline ====================
 class ContactTimelineResponse(BaseModel):
     """Response for contact with timeline."""
@@ -110,11 +383,19 @@ class ContactTimelineResponse(BaseModel):
     action_playbook: Optional[ActionPlaybookDetail] = None
 
 
-@router.get("/{contact_id}/timeline", response_model=ContactTimelineResponse)
+@router.get(
+    "/{contact_id}/timeline",
+    response_model=ContactTimelineResponse,
+    dependencies=[Depends(query_budget(5))]
+)
 async def get_contact_timeline(
     contact_id: int,
     current_user: CurrentUser,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(
+        None, description="Comma-separated sections to include: meetings, action_playbook"
+    )
 ):
     """
     Get a contact with full timeline and action playbook.
@@ -123,20 +404,73 @@ async def get_contact_timeline(
     - All contact information (Identity + Status)
     - All meetings (Timeline)
     - Action playbook recommendations
+
+    Use **fields** to narrow the contact and **include** to pick sections.
     """
-    data = contact_service.get_contact_with_timeline(db, contact_id, current_user.id)
-    if not data:
+    selected = parse_fieldset(fields, DETAIL_FIELDS)
+    sections = parse_fieldset(include, TIMELINE_INCLUDES, param="include", always=())
+
+    def render() -> Optional[str]:
+        data = contact_service.get_contact_with_timeline(
+            db, contact_id, current_user.id,
+            fields=selected,
+            meeting_fields=MEETING_LIST_FIELDS,
+            include=sections
+        )
+        if not data:
+            return None
+
+        # Meetings come back as row tuples already shaped like MeetingListItem
+        content: dict[str, Any] = {
+            "contact": _pick(data["contact"], selected) if selected
+            else ContactDetail.model_validate(data["contact"])
+        }
+        if "meetings" in data:
+            content["meetings"] = rows_to_dicts(data["meetings"])
+        if "action_playbook" in data:
+            playbook = data["action_playbook"]
+            content["action_playbook"] = (
+                ActionPlaybookDetail.model_validate(playbook) if playbook else None
+            )
+        return FastJSONResponse(content).body.decode()
+
+    # The rendered body is cached, so hits skip both the queries and serialization
+    included = sections if sections is not None else ['*']
+    key = f"{contact_id}:{','.join(selected or ['*'])}:{','.join(included)}"
+    body = timeline_cache.get_or_set(
+        key, render, scope=current_user.id, ttl=settings.timeline_cache_ttl_seconds
+    )
+    if body is None:
         raise HTTPException(status_code=404, detail="Contact not found")
-
-    return {
-        "contact": data["contact"],
-        "meetings": data["meetings"],
-        "action_playbook": data["action_playbook"]
-    }
+    return Response(content=body, media_type="application/json")
 
 
 # ==================== Export ====================
-@router.get("/{contact_id}/export")
+def _attachment_headers(filename: str) -> dict[str, str]:
+    """Content-Disposition for a download, with an RFC 5987 UTF-8 filename."""
+    fallback = filename.encode("ascii", "ignore").decode("ascii") or "download"
+    disposition = f'attachment; filename="{fallback}"; filename*=UTF-8\'\'{quote(filename)}'
+    return {"Content-Disposition": disposition}
+
+
+@router.get("/export/zip", dependencies=[Depends(query_budget(None))])
+async def export_all_contacts_zip(
+    current_user: CurrentUser,
+    db: Session = Depends(get_db)
+):
+    """
+    Export every contact as a zip of Markdown files.
+
+    The archive is streamed as it is built, one contact at a time.
+    """
+    return StreamingResponse(
+        export_service.iter_markdown_zip(db, current_user.id),
+        media_type="application/zip",
+        headers=_attachment_headers("contacts.zip")
+    )
+
+
+@router.get("/{contact_id}/export", dependencies=[Depends(query_budget(None))])
 async def export_contact_markdown(
     contact_id: int,
     current_user: CurrentUser,
@@ -145,36 +479,102 @@ async def export_contact_markdown(
     """
     Export a contact as a Markdown file.
 
-    Returns a downloadable Markdown file with all contact information.
+    Returns a downloadable Markdown file with all contact information,
+    streamed while the timeline is read in batches.
     """
-    markdown = contact_service.export_contact_markdown(db, contact_id, current_user.id)
-    if not markdown:
+    contact = contact_service.get_contact(db, contact_id, current_user.id)
+    if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
 
-    contact = contact_service.get_contact(db, contact_id, current_user.id)
-    filename = f"{contact.name or 'contact'}_{contact_id}.md"
+    playbook = contact_service.get_action_playbook(db, contact_id)
+    filename = contact_markdown_filename(contact.name, contact_id)
 
-    return Response(
-        content=markdown,
-        media_type="text/markdown",
-        headers={
-            "Content-Disposition": f'attachment; filename="{filename}"'
-        }
+    # The session stays open until the response has been sent
+    return StreamingResponse(
+        contact_service.iter_contact_markdown(
+            db, contact, playbook, settings.export_batch_size
+        ),
+        media_type="text/markdown; charset=utf-8",
+        headers=_attachment_headers(filename)
     )
 
 
 # ==================== Meetings ====================
+IdempotencyKeyHeader = Header(
+    None,
+    alias="Idempotency-Key",
+    max_length=255,
+    description="Client-generated key; retries with the same key return the original result"
+)
+
+
+def _queue_full(e: AdmissionRejected) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=f"{e.reason}; retry later",
+        headers={"Retry-After": str(e.retry_after)}
+    )
+
+
+async def _create_meeting_idempotent(
+    request: Request,
+    db: Session,
+    user_id: int,
+    meeting: MeetingCreate,
+    idempotency_key: Optional[str]
+):
+    """Create a meeting, deduplicating retries that carry the same Idempotency-Key."""
+    if not idempotency_key:
+        try:
+            return await meeting_service.create_meeting_from_text(db, user_id, meeting)
+        except AdmissionRejected as e:
+            raise _queue_full(e)
+
+    fingerprint = idempotency_service.fingerprint(
+        request.method, request.url.path, meeting.model_dump(mode="json")
+    )
+
+    async def operation():
+        result = await meeting_service.create_meeting_from_text(db, user_id, meeting)
+        return MeetingListItem.model_validate(result).model_dump(mode="json")
+
+    try:
+        body, replayed = await idempotency_service.execute(
+            db, user_id, idempotency_key, fingerprint, operation, response_status=201
+        )
+    except IdempotencyKeyMismatch:
+        raise HTTPException(
+            status_code=422,
+            detail="Idempotency-Key was already used with a different request"
+        )
+    except AdmissionRejected as e:
+        raise _queue_full(e)
+    except IdempotencyInProgress:
+        raise HTTPException(
+            status_code=409,
+            detail="A request with this Idempotency-Key is in progress or failed; retry later",
+            headers={"Retry-After": "5"}
+        )
+
+    headers = {"Idempotent-Replayed": "true"} if replayed else None
+    return JSONResponse(status_code=201, content=body, headers=headers)
+
+
 @router.post("/{contact_id}/meetings", response_model=MeetingListItem, status_code=201)
 async def add_meeting_to_contact(
     contact_id: int,
     meeting: MeetingCreate,
+    request: Request,
     current_user: CurrentUser,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = IdempotencyKeyHeader
 ):
     """
     Add a meeting to a specific contact.
 
     The meeting text will be processed by LLM to extract structured information.
+    Send an **Idempotency-Key** header to make retries safe. Answers 429 with
+    Retry-After when too much LLM work is queued.
     """
     # Verify contact exists
     contact = contact_service.get_contact(db, contact_id, current_user.id)
@@ -183,11 +583,16 @@ async def add_meeting_to_contact(
 
     # Create meeting (overwrite contact_name with actual contact name)
     meeting.contact_name = contact.name
-    result = await meeting_service.create_meeting_from_text(db, current_user.id, meeting)
-    return result
+    return await _create_meeting_idempotent(
+        request, db, current_user.id, meeting, idempotency_key
+    )
 
 
-@router.get("/{contact_id}/meetings", response_model=list[MeetingListItem])
+@router.get(
+    "/{contact_id}/meetings",
+    response_model=list[MeetingListItem],
+    dependencies=[Depends(query_budget(5))]
+)
 async def list_contact_meetings(
     contact_id: int,
     current_user: CurrentUser,
@@ -203,8 +608,10 @@ async def list_contact_meetings(
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
 
-    meetings, _ = meeting_service.list_meetings(db, current_user.id, contact_id, skip, limit)
-    return meetings
+    rows, _ = meeting_service.list_meetings(
+        db, current_user.id, contact_id, skip, limit, fields=MEETING_LIST_FIELDS
+    )
+    return FastJSONResponse(rows_to_dicts(rows))
 
 
 # ==================== Standalone Meetings ====================
@@ -214,17 +621,22 @@ standalone_router = APIRouter(prefix="/meetings", tags=["Meetings"])
 @standalone_router.post("", response_model=MeetingListItem, status_code=201)
 async def create_meeting(
     meeting: MeetingCreate,
+    request: Request,
     current_user: CurrentUser,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = IdempotencyKeyHeader
 ):
     """
     Create a new meeting from conversation text.
 
     If contact_name is provided, will try to match existing contact.
     Otherwise, will create a new contact automatically.
+    Send an **Idempotency-Key** header to make retries safe. Answers 429 with
+    Retry-After when too much LLM work is queued.
     """
-    result = await meeting_service.create_meeting_from_text(db, current_user.id, meeting)
-    return result
+    return await _create_meeting_idempotent(
+        request, db, current_user.id, meeting, idempotency_key
+    )
 
 
 @standalone_router.get("", response_model=list[MeetingListItem])
@@ -232,16 +644,22 @@ async def list_meetings(
     current_user: CurrentUser,
     db: Session = Depends(get_db),
     contact_id: Optional[int] = Query(None, description="Filter by contact ID"),
+    topic: Optional[str] = Query(None, description="Only meetings about this topic"),
+    date_from: Optional[datetime] = Query(None, description="Only meetings on or after this time"),
+    date_to: Optional[datetime] = Query(None, description="Only meetings on or before this time"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100)
 ):
     """
     List all meetings for the current user.
 
-    Can be filtered by contact_id.
+    Can be filtered by contact_id, topic and a meeting date range.
     """
-    meetings, _ = meeting_service.list_meetings(db, current_user.id, contact_id, skip, limit)
-    return meetings
+    rows, _ = meeting_service.list_meetings(
+        db, current_user.id, contact_id, skip, limit, fields=MEETING_LIST_FIELDS,
+        topic=topic, date_from=date_from, date_to=date_to
+    )
+    return FastJSONResponse(rows_to_dicts(rows))
 
 
 @standalone_router.get("/{meeting_id}", response_model=MeetingListItem)
@@ -1,8 +1,8 @@
 """
 API dependencies and middleware.
 """
-from typing import Annotated, Optional
-from fastapi import Depends, HTTPException, status
+from typing import Annotated, Any, Iterable, Optional
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
@@ -44,6 +44,69 @@ async def get_current_user(
     return user
 
 
+def parse_fieldset(
+    value: Optional[str],
+    allowed: Iterable[str],
+    param: str = "fields",
+    always: tuple[str, ...] = ("id",)
+) -> Optional[list[str]]:
+    """
+    Parse a comma-separated sparse fieldset query parameter.
+
+    Returns None when the parameter is absent. Unknown names are rejected with 400.
+    """
+    if not value:
+        return None
+
+    requested = [name.strip() for name in value.split(",") if name.strip()]
+    allowed = set(allowed)
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown {param}: {', '.join(unknown)}"
+        )
+    return list(dict.fromkeys([*always, *requested]))
+
+
+def get_contact_filters(
+    topic: Optional[str] = Query(None, description="Only contacts interested in this topic"),
+    project: Optional[str] = Query(None, description="Only contacts working on this project"),
+    industry: Optional[str] = Query(None, description="Only contacts in this industry"),
+    city: Optional[str] = Query(None, description="Only contacts in this city"),
+    relationship_stage: Optional[str] = Query(
+        None, description="Only contacts at this relationship stage"
+    ),
+    temperature_min: Optional[float] = Query(
+        None, ge=0, le=100, description="Minimum temperature score"
+    ),
+    temperature_max: Optional[float] = Query(
+        None, ge=0, le=100, description="Maximum temperature score"
+    )
+) -> dict[str, Any]:
+    """Facet filters shared by the contact list and facet count endpoints."""
+    if (
+        temperature_min is not None
+        and temperature_max is not None
+        and temperature_min > temperature_max
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="temperature_min must not exceed temperature_max"
+        )
+    filters = {
+        "topic": topic,
+        "project": project,
+        "industry": industry,
+        "city": city,
+        "relationship_stage": relationship_stage,
+        "temperature_min": temperature_min,
+        "temperature_max": temperature_max,
+    }
+    return {name: value for name, value in filters.items() if value is not None}
+
+
 # Type alias for dependency injection
 CurrentUser = Annotated[User, Depends(get_current_user)]
 DBSession = Annotated[Session, Depends(get_db)]
+ContactFilters = Annotated[dict[str, Any], Depends(get_contact_filters)]
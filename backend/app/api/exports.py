@@ -0,0 +1,67 @@
+"""
+Bulk export API endpoints.
+"""
+import importlib.util
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.query_budget import query_budget
+from app.models.database import get_db
+from app.services.export_service import export_service, BULK_EXPORT_ENTITIES
+from app.api.dependencies import CurrentUser
+
+router = APIRouter(prefix="/exports", tags=["Export"])
+
+ExportEntity = Literal["contacts", "meetings", "playbooks"]
+
+
+@router.get("/bulk", dependencies=[Depends(query_budget(None))])
+async def bulk_export(
+    current_user: CurrentUser,
+    db: Session = Depends(get_db),
+    format: Literal["jsonl", "arrow"] = Query(
+        "jsonl", description="jsonl or arrow (Arrow IPC stream)"
+    ),
+    entity: Optional[ExportEntity] = Query(
+        None, description="Entity to export; required for arrow, all entities for jsonl if omitted"
+    ),
+    since: Optional[datetime] = Query(
+        None, description="Only rows created or updated at or after this watermark"
+    )
+):
+    """
+    Export contacts, meetings and playbooks in a machine-readable format.
+
+    Rows are read through a server-side cursor and streamed in fixed-size batches.
+    The X-Export-Watermark response header holds the database time the export
+    started, minus a small overlap; pass it as **since** on the next run for an
+    incremental export. Consecutive incremental exports can repeat rows, so
+    consumers must deduplicate (upsert) by entity and id.
+    """
+    headers = {"X-Export-Watermark": export_service.watermark(db).isoformat()}
+
+    if format == "arrow":
+        if entity is None:
+            raise HTTPException(status_code=400, detail="Arrow export requires an entity")
+        if importlib.util.find_spec("pyarrow") is None:
+            raise HTTPException(
+                status_code=501,
+                detail="Arrow export requires the optional 'pyarrow' dependency"
+            )
+        headers["Content-Disposition"] = f'attachment; filename="{entity}.arrows"'
+        return StreamingResponse(
+            export_service.iter_arrow(db, current_user.id, entity, since),
+            media_type="application/vnd.apache.arrow.stream",
+            headers=headers
+        )
+
+    entities = [entity] if entity else list(BULK_EXPORT_ENTITIES)
+    headers["Content-Disposition"] = 'attachment; filename="rapport_export.jsonl"'
+    return StreamingResponse(
+        export_service.iter_jsonl(db, current_user.id, entities, since),
+        media_type="application/x-ndjson",
+        headers=headers
+    )
@@ -0,0 +1,62 @@
+"""
+Matchmaking API endpoints.
+"""
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from pydantic import BaseModel
+
+from app.models.database import get_db
+from app.services.contact_service import contact_service
+from app.services.matchmaking_service import matchmaking_service
+from app.api.dependencies import CurrentUser
+
+router = APIRouter(prefix="/matches", tags=["Matchmaking"])
+
+
+class IntroductionCandidate(BaseModel):
+    """Suggested introduction: the needer needs something the offerer offers."""
+    needer_id: int
+    needer_name: Optional[str] = None
+    need: str
+    offerer_id: int
+    offerer_name: Optional[str] = None
+    offer: str
+    score: float
+    shared_terms: list[str]
+
+
+class ContactMatches(BaseModel):
+    """Introductions involving one contact."""
+    can_help_them: list[IntroductionCandidate]
+    they_can_help: list[IntroductionCandidate]
+
+
+@router.get("", response_model=list[IntroductionCandidate])
+async def list_introductions(
+    current_user: CurrentUser,
+    db: Session = Depends(get_db),
+    limit: int = Query(50, ge=1, le=200),
+    min_score: float = Query(0.3, ge=0, le=1, description="Share of the need covered by the offer")
+):
+    """
+    Ranked introduction candidates across the whole network:
+    contact A needs X and contact B offers X.
+    """
+    return matchmaking_service.find_introductions(db, current_user.id, limit, min_score)
+
+
+@router.get("/contacts/{contact_id}", response_model=ContactMatches)
+async def get_contact_matches(
+    contact_id: int,
+    current_user: CurrentUser,
+    db: Session = Depends(get_db),
+    limit: int = Query(20, ge=1, le=100),
+    min_score: float = Query(0.3, ge=0, le=1, description="Share of the need covered by the offer")
+):
+    """
+    Who can help this contact with their needs, and who needs what they offer.
+    """
+    if not contact_service.get_contact(db, contact_id, current_user.id, fields=["id"]):
+        raise HTTPException(status_code=404, detail="Contact not found")
+    return matchmaking_service.find_for_contact(db, current_user.id, contact_id, limit, min_score)
@@ -0,0 +1,22 @@
+"""
+Fast JSON responses for large payloads.
+"""
+from typing import Any, Iterable
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+# Serializes dicts, lists, Pydantic models, datetimes and enums in pydantic-core
+_any_adapter = TypeAdapter(Any)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by pydantic-core's compiled serializer instead of json.dumps."""
+
+    def render(self, content: Any) -> bytes:
+        return _any_adapter.dump_json(content)
+
+
+def rows_to_dicts(rows: Iterable[Any]) -> list[dict[str, Any]]:
+    """Convert SQLAlchemy row tuples from a column projection into plain dicts."""
+    return [row._asdict() for row in rows]
@@ -0,0 +1,49 @@
+"""
+Semantic search API endpoints.
+"""
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from pydantic import BaseModel
+
+from app.models.database import get_db
+from app.models.schemas import MeetingListItem
+from app.services.search_service import search_service
+from app.api.dependencies import CurrentUser
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+class MeetingSearchHit(BaseModel):
+    """Meeting matched by semantic search."""
+    meeting: MeetingListItem
+    contact_id: int
+    contact_name: Optional[str] = None
+    score: float
+
+
+@router.get("/meetings", response_model=list[MeetingSearchHit])
+async def search_meetings(
+    current_user: CurrentUser,
+    db: Session = Depends(get_db),
+    q: str = Query(..., min_length=1, description="Natural-language query"),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """
+    Semantic search over meeting history.
+
+    Matches meaning rather than exact keywords, e.g. "who did I talk to about
+    raising a seed round". Runs fully locally against the user's vector index.
+    """
+    # Embedding the query (possibly loading the model) and scanning the index block
+    hits = await asyncio.to_thread(search_service.search, db, current_user.id, q, limit)
+    return [
+        MeetingSearchHit(
+            meeting=MeetingListItem.model_validate(hit["meeting"]),
+            contact_id=hit["meeting"].contact_id,
+            contact_name=hit["contact_name"],
+            score=round(hit["score"], 4)
+        )
+        for hit in hits
+    ]
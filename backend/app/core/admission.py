@@ -0,0 +1,273 @@
+"""
+Admission control for LLM work: concurrency caps and fair queueing across users.
+"""
+import asyncio
+import concurrent.futures
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, Iterator, Optional
+
+from app.core.config import settings
+from app.core.metrics import LLM_BUCKETS, registry
+
+llm_admission_total = registry.counter(
+    "llm_admission_total",
+    "LLM work admitted or rejected by the admission controller.",
+    ("outcome",),
+)
+llm_queue_wait_seconds = registry.histogram(
+    "llm_queue_wait_seconds", "Time LLM work waited for an admission slot.", buckets=LLM_BUCKETS
+)
+
+
+class AdmissionRejected(Exception):
+    """The queue is full; the caller should retry after retry_after seconds."""
+
+    def __init__(self, retry_after: int, reason: str):
+        super().__init__(reason)
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+@dataclass(eq=False)
+class _Waiter:
+    user_id: int
+    start: float
+    finish: float
+    seq: int
+    future: asyncio.Future = field(repr=False)
+
+
+class AdmissionController:
+    """
+    Caps concurrent work globally and per user, and serves queued work in
+    weighted fair order across users.
+
+    Scheduling is start-time fair queueing: each request gets a finish tag of
+    max(virtual time, user's last finish tag) + cost / weight, and the waiting
+    request with the smallest tag whose user is under its concurrency cap runs
+    next. A user who submits many requests at once therefore interleaves with
+    other users instead of running ahead of them. Requests are rejected up
+    front when the global or the user's queue is full.
+
+    State is per process, so with several workers the caps apply per worker.
+    It belongs to the event loop serving requests; blocking code in other
+    threads uses blocking_slot().
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        user_max_concurrency: int,
+        max_queue_depth: int,
+        user_max_queue_depth: int,
+        weights: Optional[Dict[str, float]] = None,
+        initial_service_seconds: float = 10.0
+    ):
+        self.max_concurrency = max_concurrency
+        self.user_max_concurrency = user_max_concurrency
+        self.max_queue_depth = max_queue_depth
+        self.user_max_queue_depth = user_max_queue_depth
+        self.weights = weights or {}
+        self._running = 0
+        self._running_by_user: Dict[int, int] = {}
+        self._queues: Dict[int, deque] = {}
+        self._queued = 0
+        self._last_finish: Dict[int, float] = {}
+        self._virtual_time = 0.0
+        self._seq = 0
+        # Moving average of slot hold time, for Retry-After estimates
+        self._service_seconds = initial_service_seconds
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    def weight(self, user_id: int) -> float:
+        return max(float(self.weights.get(str(user_id), 1.0)), 0.01)
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog is expected to drain, clamped to 1..300."""
+        backlog = self._queued + self._running
+        estimate = self._service_seconds * backlog / max(self.max_concurrency, 1)
+        return min(max(math.ceil(estimate), 1), 300)
+
+    def check(self, user_id: int) -> None:
+        """
+        Raise AdmissionRejected if new work for this user would not be queued.
+
+        Lets callers fail fast before doing any work of their own.
+        """
+        if self._queued >= self.max_queue_depth:
+            llm_admission_total.inc("rejected")
+            raise AdmissionRejected(self.retry_after(), "LLM queue is full")
+        if len(self._queues.get(user_id, ())) >= self.user_max_queue_depth:
+            llm_admission_total.inc("rejected")
+            raise AdmissionRejected(self.retry_after(), "Too many queued requests for this user")
+
+    def _tag(self, user_id: int, cost: float) -> tuple[float, float]:
+        start = max(self._virtual_time, self._last_finish.get(user_id, 0.0))
+        finish = start + cost / self.weight(user_id)
+        self._last_finish[user_id] = finish
+        return start, finish
+
+    def _has_capacity(self, user_id: int) -> bool:
+        return (
+            self._running < self.max_concurrency
+            and self._running_by_user.get(user_id, 0) < self.user_max_concurrency
+        )
+
+    def _start(self, user_id: int, start: float) -> None:
+        self._running += 1
+        self._running_by_user[user_id] = self._running_by_user.get(user_id, 0) + 1
+        self._virtual_time = max(self._virtual_time, start)
+
+    def _release(self, user_id: int, held: Optional[float]) -> None:
+        self._running -= 1
+        remaining = self._running_by_user[user_id] - 1
+        if remaining:
+            self._running_by_user[user_id] = remaining
+        else:
+            del self._running_by_user[user_id]
+        if held is not None:
+            self._service_seconds = 0.8 * self._service_seconds + 0.2 * held
+        self._dispatch()
+        if not self._running and not self._queued:
+            # Fully idle: no backlog left to be fair about
+            self._last_finish.clear()
+        else:
+            self._forget_idle(user_id)
+
+    def _forget_idle(self, user_id: int) -> None:
+        # Idle users' tags are behind the virtual time and would be raised to it anyway
+        if (
+            user_id not in self._queues and user_id not in self._running_by_user
+            and self._last_finish.get(user_id, 0.0) <= self._virtual_time
+        ):
+            self._last_finish.pop(user_id, None)
+
+    def _dispatch(self) -> None:
+        """Start queued work in tag order while capacity allows."""
+        while self._running < self.max_concurrency:
+            best: Optional[_Waiter] = None
+            for user_id, queue in self._queues.items():
+                if self._running_by_user.get(user_id, 0) >= self.user_max_concurrency:
+                    continue
+                head = queue[0]
+                if best is None or (head.finish, head.seq) < (best.finish, best.seq):
+                    best = head
+            if best is None:
+                return
+            self._dequeue(best)
+            self._start(best.user_id, best.start)
+            best.future.set_result(None)
+
+    def _dequeue(self, waiter: _Waiter) -> None:
+        queue = self._queues[waiter.user_id]
+        queue.remove(waiter)
+        self._queued -= 1
+        if not queue:
+            del self._queues[waiter.user_id]
+
+    @asynccontextmanager
+    async def slot(self, user_id: int, cost: float = 1.0) -> AsyncIterator[None]:
+        """
+        Hold a concurrency slot for the duration of the block.
+
+        Raises:
+            AdmissionRejected: The global or per-user queue is full
+        """
+        must_wait = self._queued or not self._has_capacity(user_id)
+        if must_wait:
+            self.check(user_id)
+        start, finish = self._tag(user_id, cost)
+        if must_wait:
+            self._seq += 1
+            waiter = _Waiter(
+                user_id, start, finish, self._seq, asyncio.get_running_loop().create_future()
+            )
+            self._queues.setdefault(user_id, deque()).append(waiter)
+            self._queued += 1
+            queued_at = time.monotonic()
+            # A slot may already be free for this user even though others are waiting
+            self._dispatch()
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                if waiter.future.done() and not waiter.future.cancelled():
+                    # Granted just before the cancellation arrived: hand the slot on
+                    self._release(user_id, None)
+                else:
+                    self._dequeue(waiter)
+                    self._forget_idle(user_id)
+                raise
+            llm_queue_wait_seconds.observe(time.monotonic() - queued_at)
+        else:
+            self._start(user_id, start)
+            llm_queue_wait_seconds.observe(0.0)
+
+        llm_admission_total.inc("admitted")
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(user_id, time.monotonic() - started)
+
+    async def _hold(
+        self,
+        user_id: int,
+        cost: float,
+        acquired: concurrent.futures.Future,
+        released: asyncio.Event
+    ) -> None:
+        try:
+            async with self.slot(user_id, cost):
+                acquired.set_result(None)
+                await released.wait()
+        except BaseException as e:
+            if not acquired.done():
+                acquired.set_exception(e)
+            raise
+
+    @contextmanager
+    def blocking_slot(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        user_id: int,
+        cost: float = 1.0
+    ) -> Iterator[None]:
+        """
+        slot() for blocking code in a worker thread, such as batch jobs: waits
+        in the same queue as the requests served by loop, blocking the thread.
+
+        Raises:
+            AdmissionRejected: The global or per-user queue is full
+        """
+        acquired: concurrent.futures.Future = concurrent.futures.Future()
+        released = asyncio.Event()
+        asyncio.run_coroutine_threadsafe(self._hold(user_id, cost, acquired, released), loop)
+        acquired.result()
+        try:
+            yield
+        finally:
+            try:
+                loop.call_soon_threadsafe(released.set)
+            except RuntimeError:
+                # The loop has shut down, and the slot with it
+                pass
+
+
+llm_admission = AdmissionController(
+    max_concurrency=settings.llm_max_concurrency,
+    user_max_concurrency=settings.llm_user_max_concurrency,
+    max_queue_depth=settings.llm_max_queue_depth,
+    user_max_queue_depth=settings.llm_user_max_queue_depth,
+    weights=settings.llm_user_weights
+)
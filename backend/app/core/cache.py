@@ -0,0 +1,265 @@
+"""
+Cache for computed read results, shared across workers when Redis is configured.
+
+Keys are namespaced ("{prefix}:{namespace}:{scope}:{version}:{key}") and each
+namespace/scope pair (normally a user) carries a version token. Writes move
+the scope to a new version instead of deleting keys, so invalidation is one
+write on any backend and stale entries simply expire.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Version tokens outlive any entry TTL; a lost token only orphans old entries
+VERSION_TTL_SECONDS = 86400
+
+cache_requests_total = registry.counter(
+    "cache_requests_total",
+    "Cache lookups by namespace and result (hit or miss).",
+    ("namespace", "result")
+)
+cache_errors_total = registry.counter(
+    "cache_errors_total",
+    "Cache backend errors by operation; reads count as misses.",
+    ("operation",)
+)
+
+
+class LRUBackend:
+    """
+    Thread-safe in-process LRU cache with per-entry TTL.
+
+    Values are shared between requests, so callers must not mutate them. Each
+    worker process has its own copy, so invalidation does not reach other workers
+    and they may serve stale entries until their TTL expires.
+    """
+
+    def __init__(self, maxsize: int = 1024, default_ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self._data: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._set(key, value, ttl)
+
+    def add(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Set the key only if it is missing or expired."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] < time.monotonic():
+                self._set(key, value, ttl)
+
+    def _set(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.default_ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self, prefix: str = "") -> None:
+        with self._lock:
+            if not prefix:
+                self._data.clear()
+                return
+            for key in [key for key in self._data if key.startswith(prefix)]:
+                del self._data[key]
+
+
+class RedisBackend:
+    """
+    Cache shared by all workers in Redis (or anything speaking its protocol),
+    via the optional redis dependency.
+
+    Values are stored as JSON, so they must be JSON-compatible; tuples come back
+    as lists. Backend errors are logged and treated as misses so an unavailable
+    Redis degrades to uncached reads instead of failing requests.
+    """
+
+    def __init__(self, url: str, default_ttl: float = 60.0, client: Any = None):
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(
+                url,
+                socket_timeout=settings.cache_redis_timeout_seconds,
+                socket_connect_timeout=settings.cache_redis_timeout_seconds
+            )
+        self.client = client
+        self.default_ttl = default_ttl
+
+    def _ttl_ms(self, ttl: Optional[float]) -> int:
+        return max(1, int((ttl if ttl is not None else self.default_ttl) * 1000))
+
+    def _failed(self, operation: str) -> None:
+        cache_errors_total.inc(operation)
+        logger.warning("Redis cache %s failed", operation, exc_info=True)
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = self.client.get(key)
+        except Exception:
+            self._failed("get")
+            return None
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        try:
+            self.client.set(key, json.dumps(value, ensure_ascii=False), px=self._ttl_ms(ttl))
+        except Exception:
+            self._failed("set")
+
+    def add(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Set the key only if it is missing (SET NX)."""
+        try:
+            self.client.set(
+                key, json.dumps(value, ensure_ascii=False), px=self._ttl_ms(ttl), nx=True
+            )
+        except Exception:
+            self._failed("set")
+
+    def delete(self, key: str) -> None:
+        try:
+            self.client.delete(key)
+        except Exception:
+            self._failed("delete")
+
+    def clear(self, prefix: str = "") -> None:
+        try:
+            batch = []
+            for key in self.client.scan_iter(match=f"{prefix}*", count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    self.client.delete(*batch)
+                    batch = []
+            if batch:
+                self.client.delete(*batch)
+        except Exception:
+            self._failed("clear")
+
+
+class CacheNamespace:
+    """
+    Cached results of one kind, optionally partitioned by scope (e.g. a user ID)
+    that can be invalidated as a whole.
+    """
+
+    def __init__(self, cache: "Cache", name: str):
+        self.cache = cache
+        self.name = name
+
+    def _version_key(self, scope: Any) -> str:
+        return f"{self.cache.prefix}:{self.name}:v:{scope}"
+
+    def _version(self, scope: Any) -> Optional[str]:
+        backend = self.cache.backend
+        key = self._version_key(scope)
+        version = backend.get(key)
+        if version is None:
+            # Several workers may race here; set-if-absent makes them agree
+            backend.add(key, os.urandom(6).hex(), ttl=VERSION_TTL_SECONDS)
+            version = backend.get(key)
+        return version
+
+    def _key(self, key: str, scope: Any, version: str) -> str:
+        return f"{self.cache.prefix}:{self.name}:{scope}:{version}:{key}"
+
+    def get_or_set(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        scope: Any = "-",
+        ttl: Optional[float] = None
+    ) -> Any:
+        """
+        Return the cached value for key, computing and storing it on a miss.
+
+        The scope version is read once, before computing, so a result computed
+        from data that was written concurrently is stored under the old version
+        and never served after the invalidation.
+        """
+        backend = self.cache.backend
+        version = self._version(scope)
+        if version is None:
+            # Backend unavailable: without a version the result cannot be invalidated
+            cache_requests_total.inc(self.name, "miss")
+            return compute()
+        full_key = self._key(key, scope, version)
+        value = backend.get(full_key)
+        if value is not None:
+            cache_requests_total.inc(self.name, "hit")
+            return value
+        cache_requests_total.inc(self.name, "miss")
+        value = compute()
+        if value is not None:
+            backend.set(full_key, value, ttl)
+        return value
+
+    def invalidate(self, scope: Any = "-") -> None:
+        """Drop all entries of a scope by moving it to a new version."""
+        self.cache.backend.set(
+            self._version_key(scope), os.urandom(6).hex(), ttl=VERSION_TTL_SECONDS
+        )
+
+    def clear(self) -> None:
+        self.cache.backend.clear(f"{self.cache.prefix}:{self.name}:")
+
+
+class Cache:
+    """Application cache: a backend plus the key prefix shared by all namespaces."""
+
+    def __init__(self, backend: Any, prefix: str = "rapport"):
+        self.backend = backend
+        self.prefix = prefix
+        self._namespaces: dict[str, CacheNamespace] = {}
+
+    def namespace(self, name: str) -> CacheNamespace:
+        namespace = self._namespaces.get(name)
+        if namespace is None:
+            namespace = self._namespaces[name] = CacheNamespace(self, name)
+        return namespace
+
+    def clear(self) -> None:
+        self.backend.clear(f"{self.prefix}:")
+
+
+def _create_backend():
+    """Use Redis when configured and installed, else the in-process LRU."""
+    if settings.cache_backend == "redis":
+        try:
+            return RedisBackend(settings.cache_redis_url, settings.cache_default_ttl_seconds)
+        except Exception:
+            logger.exception("Redis cache unavailable, using in-process cache")
+    return LRUBackend(
+        maxsize=settings.cache_max_entries, default_ttl=settings.cache_default_ttl_seconds
+    )
+
+
+cache = Cache(_create_backend(), prefix=settings.cache_key_prefix)
@@ -0,0 +1,202 @@
+"""
+Negotiated gzip/brotli response compression.
+"""
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Optional dependency; gzip is used when it is missing
+    brotli = None
+
+# Content types that are worth compressing (JSON, Markdown, JSONL, Arrow, ...)
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/vnd.apache.arrow.stream",
+    "application/javascript",
+    "application/xml",
+)
+
+
+def _parse_accept_encoding(header: str) -> dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q}."""
+    codings = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        codings[coding] = q
+    return codings
+
+
+def negotiate_encoding(header: str) -> Optional[str]:
+    """Pick the best supported encoding from an Accept-Encoding header, if any."""
+    codings = _parse_accept_encoding(header)
+    wildcard = codings.get("*", 0.0)
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_q = None, 0.0
+    for coding in candidates:
+        q = codings.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class _Compressor:
+    """Incremental gzip or brotli compressor with a common interface."""
+
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "br":
+            # Brotli quality runs 0-11; map the shared 1-9 level onto it
+            self._brotli = brotli.Compressor(quality=min(11, max(0, round(level * 11 / 9))))
+        else:
+            self._zlib = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it so streamed output reaches the client promptly."""
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with brotli or gzip according to Accept-Encoding.
+
+    Buffered responses smaller than minimum_size are sent as-is. Streaming
+    responses (exports) are compressed chunk by chunk with a sync flush after
+    each chunk. route_levels maps path prefixes to a compression level (1-9,
+    0 disables) so cheap, fast compression can be used on some routes and
+    maximum compression on others; the longest matching prefix wins.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        level: int = 6,
+        route_levels: Optional[dict[str, int]] = None
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+        self.route_levels = sorted(
+            (route_levels or {}).items(), key=lambda item: len(item[0]), reverse=True
+        )
+
+    def _level_for(self, path: str) -> int:
+        for prefix, level in self.route_levels:
+            if path.startswith(prefix):
+                return level
+        return self.level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        level = self._level_for(scope["path"])
+        if encoding is None or level <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self.app, encoding, level, self.minimum_size)
+        await responder(scope, receive, send)
+
+
+class _CompressionResponder:
+    """Per-request state for CompressionMiddleware."""
+
+    def __init__(self, app: ASGIApp, encoding: str, level: int, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.level = level
+        self.minimum_size = minimum_size
+        self.send: Send = None
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_with_compression)
+
+    def _should_compress(self, headers: MutableHeaders) -> bool:
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES) or "+json" in content_type
+
+    async def send_with_compression(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            # Hold the start message until the first body chunk shows the response shape
+            self.start_message = message
+            self.passthrough = not self._should_compress(MutableHeaders(raw=message["headers"]))
+            return
+
+        if message_type != "http.response.body":
+            await self.send(message)
+            return
+
+        if self.passthrough:
+            if self.start_message is not None:
+                await self.send(self.start_message)
+                self.start_message = None
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            headers = MutableHeaders(raw=start["headers"])
+
+            if not more_body and len(body) < self.minimum_size:
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+
+            self.compressor = _Compressor(self.encoding, self.level)
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+
+            if not more_body:
+                # Buffered response: compress in one go and send the exact length
+                compressed = self.compressor.compress(body) + self.compressor.finish()
+                headers["Content-Length"] = str(len(compressed))
+                await self.send(start)
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+
+            # Streaming response: the final length is unknown
+            del headers["Content-Length"]
+            await self.send(start)
+
+        chunk = self.compressor.compress(body) if body else b""
+        if not more_body:
+            chunk += self.compressor.finish()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
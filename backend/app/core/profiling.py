@@ -0,0 +1,180 @@
+"""
+Opt-in sampling profiler for individual requests.
+
+Profiles are written in collapsed-stack ("folded") format, one file per
+request, which flamegraph.pl, speedscope and inferno render directly.
+"""
+import argparse
+import hashlib
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+PROFILE_HEADER = "x-profile-token"
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def create_profile_token(ttl_seconds: int = 3600) -> str:
+    """Signed token that enables profiling of requests carrying it until it expires."""
+    expires = int(time.time()) + ttl_seconds
+    signature = hmac.new(
+        settings.secret_key.encode(), f"profile:{expires}".encode(), hashlib.sha256
+    ).hexdigest()
+    return f"{expires}.{signature}"
+
+
+def verify_profile_token(token: str) -> bool:
+    """Check the signature and expiry of a profiling token."""
+    expires, _, signature = token.partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    expected = hmac.new(
+        settings.secret_key.encode(), f"profile:{expires}".encode(), hashlib.sha256
+    ).hexdigest()
+    return hmac.compare_digest(signature, expected)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(_APP_DIR):
+        filename = os.path.relpath(filename, os.path.dirname(_APP_DIR))
+    else:
+        filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def _in_app(frame) -> bool:
+    while frame is not None:
+        if frame.f_code.co_filename.startswith(_APP_DIR):
+            return True
+        frame = frame.f_back
+    return False
+
+
+class StackSampler:
+    """
+    Samples thread stacks at a fixed interval from a background thread.
+
+    The thread that started the sampler (the event loop, which runs async
+    endpoints, SQL issued from them, serialization and blocking LLM calls) is
+    always sampled; other threads only while they are inside application code,
+    which covers threadpool work such as streamed exports. Work of concurrent
+    requests on the same threads is included, so profiles are statistical.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._target = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own or (thread_id != self._target and not _in_app(frame)):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                if thread_id not in names:
+                    names.update((t.ident, t.name) for t in threading.enumerate())
+                    names[self._target] = "main"
+                stack.append(names.get(thread_id, "thread"))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+class ProfilingMiddleware:
+    """
+    Profiles requests that carry a valid signed X-Profile-Token header, plus a
+    random PROFILE_SAMPLE_RATE fraction of all traffic.
+
+    Each profile is saved under PROFILE_DIR and its file name is returned in
+    the X-Profile-Id response header. Mint tokens with:
+
+        python -m app.core.profiling --ttl 3600
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    def _should_profile(self, scope: Scope) -> bool:
+        token = Headers(scope=scope).get(PROFILE_HEADER)
+        if token and verify_profile_token(token):
+            return True
+        return settings.profile_sample_rate > 0 and random.random() < settings.profile_sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = "{}-{}-{}.folded".format(
+            datetime.now().strftime("%Y%m%dT%H%M%S"),
+            scope["method"].lower(),
+            os.urandom(4).hex()
+        )
+
+        async def send_with_profile_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Profile-Id", profile_id)
+            await send(message)
+
+        sampler = StackSampler(settings.profile_interval_ms / 1000)
+        sampler.start()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            sampler.stop()
+            elapsed = time.perf_counter() - started
+            self._save(profile_id, scope, elapsed, sampler)
+
+    @staticmethod
+    def _save(profile_id: str, scope: Scope, elapsed: float, sampler: StackSampler) -> None:
+        os.makedirs(settings.profile_dir, exist_ok=True)
+        path = os.path.join(settings.profile_dir, profile_id)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(sampler.folded())
+        # Request details next to the profile, since the folded format has no header
+        with open(path[: -len(".folded")] + ".txt", "w", encoding="utf-8") as f:
+            f.write(f"{scope['method']} {scope['path']}\n")
+            f.write(f"route: {getattr(scope.get('route'), 'path', '')}\n")
+            f.write(f"elapsed_ms: {elapsed * 1000:.1f}\n")
+            f.write(f"samples: {sum(sampler.samples.values())}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create a signed token that enables request profiling.")
+    parser.add_argument("--ttl", type=int, default=3600, help="Token lifetime in seconds")
+    args = parser.parse_args()
+    print(create_profile_token(args.ttl))
+
+
+if __name__ == "__main__":
+    main()
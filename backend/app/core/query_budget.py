@@ -0,0 +1,195 @@
+"""
+SQL query accounting: per-request query budgets and N+1 detection.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Placeholder lists like "IN (?, ?, ?)" or "VALUES (%s, %s), (%s, %s)" vary with batch size
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|:\w+)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised in strict mode when a tracked block runs more SQL statements than allowed."""
+
+
+def normalize_statement(statement: str) -> str:
+    """Statement text with whitespace and placeholder lists collapsed, for grouping repeats."""
+    statement = _WHITESPACE.sub(" ", statement.strip())
+    return _PLACEHOLDER_LIST.sub("(?)", statement)
+
+
+class QueryLog:
+    """Statements executed inside a tracked block."""
+
+    def __init__(self, label: str, budget: Optional[int] = None, strict: bool = False):
+        self.label = label
+        self.budget = budget
+        self.strict = strict
+        self.check_repeats = True
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Counter = Counter()
+
+    @property
+    def over_budget(self) -> bool:
+        return bool(self.budget) and self.count > self.budget
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements run at least threshold times, most frequent first (likely N+1 loops)."""
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+    def summary(self, top: int = 3) -> str:
+        lines = [f"{self.label}: {self.count} SQL statements in {self.seconds * 1000:.1f} ms"]
+        if self.budget:
+            lines[0] += f" (budget {self.budget})"
+        for sql, n in self.statements.most_common(top):
+            lines.append(f"  {n}x {sql[:200]}")
+        return "\n".join(lines)
+
+
+# Logs of all tracked blocks enclosing the current code, innermost last
+_active_logs: ContextVar[Tuple[QueryLog, ...]] = ContextVar("active_query_logs", default=())
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    logs = _active_logs.get()
+    if not logs:
+        return
+    # Fail before running the statement that breaks a strict budget, so the
+    # traceback points at the offending code path
+    for log in logs:
+        if log.strict and log.budget and log.count >= log.budget:
+            raise QueryBudgetExceeded(
+                f"{log.label} exceeded its budget of {log.budget} SQL statements\n{log.summary()}"
+            )
+    conn.info.setdefault("query_budget_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    logs = _active_logs.get()
+    started = conn.info.get("query_budget_started_at")
+    if not logs or not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    normalized = normalize_statement(statement)
+    for log in logs:
+        log.count += 1
+        log.seconds += elapsed
+        log.statements[normalized] += 1
+
+
+@contextmanager
+def track_queries(
+    label: str = "block",
+    budget: Optional[int] = None,
+    strict: bool = False
+) -> Iterator[QueryLog]:
+    """
+    Count and time the SQL statements run inside the block.
+
+    With strict=True the statement that would exceed the budget raises
+    QueryBudgetExceeded instead of running. Blocks can be nested; every
+    enclosing block sees the statements of the inner ones.
+    """
+    log = QueryLog(label, budget, strict)
+    token = _active_logs.set((*_active_logs.get(), log))
+    try:
+        yield log
+    finally:
+        _active_logs.reset(token)
+
+
+@contextmanager
+def assert_max_queries(budget: int, label: str = "block") -> Iterator[QueryLog]:
+    """
+    Fail if the block runs more than budget SQL statements.
+
+    Meant for tests of service methods, e.g.:
+
+        with assert_max_queries(3):
+            contact_service.get_contact_with_timeline(db, contact_id, user_id)
+    """
+    with track_queries(label, budget, strict=True) as log:
+        yield log
+    if log.over_budget:
+        raise QueryBudgetExceeded(
+            f"{label} exceeded its budget of {budget} SQL statements\n{log.summary()}"
+        )
+
+
+def current_query_log() -> Optional[QueryLog]:
+    """Log of the innermost tracked block, e.g. the current request; None outside any."""
+    logs = _active_logs.get()
+    return logs[-1] if logs else None
+
+
+def query_budget(budget: Optional[int]):
+    """
+    Route dependency that declares the SQL statement budget of an endpoint,
+    replacing the default one:
+
+        @router.get("/{contact_id}", dependencies=[Depends(query_budget(4))])
+
+    None declares an endpoint whose statement count grows with the data by
+    design, such as a streaming export reading batch after batch: it has no
+    budget and its repeated batch queries are not reported as N+1.
+    """
+    async def set_budget() -> None:
+        log = current_query_log()
+        if log is not None:
+            log.budget = budget
+            log.check_repeats = budget is not None
+    return set_budget
+
+
+class QueryBudgetMiddleware:
+    """
+    Tracks the SQL statements of each HTTP request against its budget.
+
+    Requests over budget, or repeating one statement query_repeat_threshold
+    times or more (the usual sign of an N+1 lazy-load loop), are logged with
+    their most frequent statements. In strict mode (development, CI) the
+    statement that exceeds the budget raises instead.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        label = f"{scope['method']} {scope['path']}"
+        budget = settings.query_budget_default or None
+        with track_queries(label, budget, settings.query_budget_strict) as log:
+            await self.app(scope, receive, send)
+
+        route = getattr(scope.get("route"), "path", None)
+        if route:
+            log.label = f"{scope['method']} {route}"
+        if log.over_budget:
+            logger.warning("Query budget exceeded by %s", log.summary())
+        elif (
+            log.check_repeats
+            and settings.query_repeat_threshold
+            and log.repeated(settings.query_repeat_threshold)
+        ):
+            logger.warning("Possible N+1 queries in %s", log.summary())
@@ -1,6 +1,8 @@
 """
 Security utilities: password hashing and JWT token handling.
 """
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -9,8 +11,24 @@ from passlib.context import CryptContext
 
 from app.core.config import settings
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context.
+# min/max rounds pin the accepted cost to the configured value, so hashes created
+# under a different cost are reported as needing an update on the next login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.password_hash_rounds,
+    bcrypt__min_rounds=settings.password_hash_rounds,
+    bcrypt__max_rounds=settings.password_hash_rounds,
+)
+
+# bcrypt releases the GIL while hashing, so a small dedicated thread pool keeps
+# the CPU work off the event loop without the pickling overhead of processes.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers,
+    thread_name_prefix="password-hash",
+)
+_hash_semaphore = asyncio.Semaphore(settings.password_hash_max_concurrency)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -23,6 +41,32 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def _run_in_hash_pool(func, *args):
+    """Run a blocking hashing call in the password pool, capped by the semaphore."""
+    async with _hash_semaphore:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, func, *args)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password without blocking the event loop."""
+    return await _run_in_hash_pool(pwd_context.hash, password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str,
+    hashed_password: str
+) -> tuple[bool, Optional[str]]:
+    """
+    Verify a password without blocking the event loop.
+
+    Returns:
+        Tuple of (is_valid, new_hash). new_hash is set when the stored hash was
+        created with a different cost factor and should be replaced.
+    """
+    return await _run_in_hash_pool(pwd_context.verify_and_update, plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
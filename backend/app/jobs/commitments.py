@@ -0,0 +1,37 @@
+"""
+Batch job: backfill the commitments table from existing meetings.
+
+Run once after migrating (re-running is safe):
+    python -m app.jobs.commitments [--user-id ID]
+"""
+import argparse
+import time
+from typing import Optional
+
+from app.models.database import SessionLocal
+from app.models.models import User
+from app.services.commitment_service import commitment_service
+
+
+def backfill_commitments(user_id: Optional[int] = None) -> int:
+    """Backfill commitments for one user, or all users. Returns the number of rows written."""
+    db = SessionLocal()
+    try:
+        user_ids = [user_id] if user_id is not None else [row[0] for row in db.query(User.id).all()]
+        return sum(commitment_service.backfill_user(db, uid) for uid in user_ids)
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill normalized commitments from meetings.")
+    parser.add_argument("--user-id", type=int, default=None, help="Only backfill this user")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    written = backfill_commitments(args.user_id)
+    print(f"Wrote {written} commitments in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
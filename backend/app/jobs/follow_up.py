@@ -0,0 +1,37 @@
+"""
+Batch job: rebuild the follow-up priority index (Contact.next_follow_up_at).
+
+Run once after migrating, or any time to resynchronise:
+    python -m app.jobs.follow_up [--user-id ID]
+"""
+import argparse
+import time
+from typing import Optional
+
+from app.models.database import SessionLocal
+from app.models.models import User
+from app.services.follow_up_service import follow_up_service
+
+
+def rebuild_follow_ups(user_id: Optional[int] = None) -> int:
+    """Rebuild due dates for one user, or all users. Returns the number of contacts updated."""
+    db = SessionLocal()
+    try:
+        user_ids = [user_id] if user_id is not None else [row[0] for row in db.query(User.id).all()]
+        return sum(follow_up_service.rebuild_user(db, uid) for uid in user_ids)
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the follow-up priority index.")
+    parser.add_argument("--user-id", type=int, default=None, help="Only rebuild this user")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    updated = rebuild_follow_ups(args.user_id)
+    print(f"Updated {updated} contacts in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
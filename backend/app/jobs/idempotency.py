@@ -0,0 +1,29 @@
+"""
+Batch job: delete expired Idempotency-Key records.
+
+Run from cron or manually:
+    python -m app.jobs.idempotency
+"""
+import time
+
+from app.models.database import SessionLocal
+from app.services.idempotency_service import idempotency_service
+
+
+def purge_idempotency_keys() -> int:
+    """Delete expired idempotency records. Returns the number of rows deleted."""
+    db = SessionLocal()
+    try:
+        return idempotency_service.purge_expired(db)
+    finally:
+        db.close()
+
+
+def main():
+    start = time.perf_counter()
+    deleted = purge_idempotency_keys()
+    print(f"Deleted {deleted} expired idempotency keys in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Leases that let only one API worker run each scheduled job.
+
+Every worker runs the in-process scheduler. Before each run, a worker takes
+the job's lease for one interval with a conditional UPDATE on job_leases;
+workers that lose skip that run. If the holder dies, another worker takes
+over once the lease expires.
+"""
+import os
+import socket
+from datetime import timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.database import SessionLocal
+from app.models.models import JobLease
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def try_acquire(db: Session, name: str, seconds: float, owner: str = WORKER_ID) -> bool:
+    """
+    Take the lease of a job for seconds, unless another worker holds it.
+    Expiry is read from and compared to the database clock, which all workers share.
+    """
+    now = db.execute(select(func.current_timestamp())).scalar_one()
+    expires_at = now + timedelta(seconds=seconds)
+    updated = db.query(JobLease).filter(
+        JobLease.name == name,
+        JobLease.expires_at <= now
+    ).update({JobLease.owner: owner, JobLease.expires_at: expires_at}, synchronize_session=False)
+    if not updated:
+        # First run of the job, or the lease is held; the primary key arbitrates
+        db.add(JobLease(name=name, owner=owner, expires_at=expires_at))
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return False
+    return True
+
+
+def acquire_job_lease(name: str, seconds: float) -> bool:
+    """Take the lease of a job in a session of its own. Returns whether this worker got it."""
+    db = SessionLocal()
+    try:
+        return try_acquire(db, name, seconds)
+    finally:
+        db.close()
@@ -0,0 +1,52 @@
+"""
+Batch job: retry meetings whose processing lease expired.
+
+A meeting stays "processing" if its worker dies mid-extraction, and failed
+extractions are kept processing until their retry backoff elapses. This job
+re-runs them and marks them failed once they are out of attempts.
+
+Run from cron or manually:
+    python -m app.jobs.meeting_recovery [--limit N]
+"""
+import argparse
+import asyncio
+import time
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.models.database import SessionLocal
+from app.services.contact_service import meeting_service
+
+
+def recover_meetings(
+    limit: Optional[int] = None,
+    loop: Optional[asyncio.AbstractEventLoop] = None
+) -> Dict[str, int]:
+    """
+    Retry up to limit expired meetings. Returns counts of recovered and failed meetings.
+
+    Inside the API process, pass its event loop so LLM calls go through admission control.
+    """
+    db = SessionLocal()
+    try:
+        limit = limit or settings.meeting_recovery_batch_size
+        return meeting_service.recover_expired(db, limit, loop)
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Retry meetings stuck in processing.")
+    parser.add_argument("--limit", type=int, default=None, help="Max meetings to retry")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = recover_meetings(args.limit)
+    print(
+        f"Recovered {result['recovered']} meetings, failed {result['failed']} "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
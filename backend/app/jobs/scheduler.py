@@ -0,0 +1,99 @@
+"""
+In-process scheduler for periodic batch jobs.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PeriodicJob:
+    """A synchronous job run every interval_seconds in a worker thread."""
+    name: str
+    interval_seconds: float
+    func: Callable[[], Any]
+    run_on_startup: bool = False
+    exclusive: bool = False  # Run by one worker process per interval
+
+
+class JobScheduler:
+    """
+    Runs registered jobs on fixed intervals inside the application's event loop.
+
+    Jobs are blocking (database batch work), so each run is offloaded to a thread.
+    Errors are logged and the job is retried on its next interval.
+
+    Every API worker process runs its own scheduler. Exclusive jobs take a
+    lease through acquire_lease(name, seconds) before each run, and skip the
+    run when another worker holds it.
+    """
+
+    def __init__(self, acquire_lease: Optional[Callable[[str, float], bool]] = None):
+        self._acquire_lease = acquire_lease
+        self._jobs: list[PeriodicJob] = []
+        self._tasks: list[asyncio.Task] = []
+        self._running: set[asyncio.Future] = set()
+
+    def register(
+        self,
+        name: str,
+        interval_seconds: float,
+        func: Callable[[], Any],
+        run_on_startup: bool = False,
+        exclusive: bool = False
+    ) -> None:
+        """Register a job. Must be called before start()."""
+        self._jobs.append(PeriodicJob(name, interval_seconds, func, run_on_startup, exclusive))
+
+    def _call(self, job: PeriodicJob) -> tuple[bool, Any]:
+        """Run a job in the worker thread, unless another worker holds its lease."""
+        if job.exclusive and self._acquire_lease is not None:
+            if not self._acquire_lease(job.name, job.interval_seconds):
+                return False, None
+        return True, job.func()
+
+    async def _run_once(self, job: PeriodicJob) -> Optional[Any]:
+        # A cancelled loop cannot stop the thread; stop() waits for it instead
+        run = asyncio.ensure_future(asyncio.to_thread(self._call, job))
+        self._running.add(run)
+        run.add_done_callback(self._running.discard)
+        try:
+            ran, result = await asyncio.shield(run)
+        except Exception:
+            logger.exception("Job %s failed", job.name)
+            return None
+        if not ran:
+            logger.debug("Job %s skipped: another worker holds its lease", job.name)
+            return None
+        logger.info("Job %s finished: %s", job.name, result)
+        return result
+
+    async def _loop(self, job: PeriodicJob) -> None:
+        if job.run_on_startup:
+            await self._run_once(job)
+        while True:
+            await asyncio.sleep(job.interval_seconds)
+            await self._run_once(job)
+
+    async def start(self) -> None:
+        """Start all registered jobs."""
+        for job in self._jobs:
+            self._tasks.append(asyncio.create_task(self._loop(job), name=f"job:{job.name}"))
+
+    async def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Cancel all scheduled runs and wait up to timeout seconds for jobs
+        already running in threads to finish, so the caller can release what
+        they use (e.g. dispose the engine).
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        if self._running:
+            _, pending = await asyncio.wait(set(self._running), timeout=timeout)
+            if pending:
+                logger.warning("%d jobs still running at shutdown", len(pending))
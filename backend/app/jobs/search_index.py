@@ -0,0 +1,38 @@
+"""
+Batch job: rebuild the semantic search index from meeting history.
+
+Run after enabling search, after changing the embedding model, or to compact
+the append-only index files:
+    python -m app.jobs.search_index [--user-id ID]
+"""
+import argparse
+import time
+from typing import Optional
+
+from app.models.database import SessionLocal
+from app.models.models import User
+from app.services.search_service import search_service
+
+
+def rebuild_search_index(user_id: Optional[int] = None) -> int:
+    """Rebuild the index of one user, or all users. Returns the number of meetings indexed."""
+    db = SessionLocal()
+    try:
+        user_ids = [user_id] if user_id is not None else [row[0] for row in db.query(User.id).all()]
+        return sum(search_service.rebuild_user(db, uid) for uid in user_ids)
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the semantic search index.")
+    parser.add_argument("--user-id", type=int, default=None, help="Only rebuild this user")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    indexed = rebuild_search_index(args.user_id)
+    print(f"Indexed {indexed} meetings in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
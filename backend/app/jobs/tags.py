@@ -0,0 +1,37 @@
+"""
+Batch job: backfill the topic/tag link tables from the JSON list columns.
+
+Run once after migrating (re-running is safe):
+    python -m app.jobs.tags [--user-id ID]
+"""
+import argparse
+import time
+from typing import Optional
+
+from app.models.database import SessionLocal
+from app.models.models import User
+from app.services.tag_service import tag_service
+
+
+def backfill_tags(user_id: Optional[int] = None) -> int:
+    """Backfill tags for one user, or all users. Returns the number of rows synced."""
+    db = SessionLocal()
+    try:
+        user_ids = [user_id] if user_id is not None else [row[0] for row in db.query(User.id).all()]
+        return sum(tag_service.rebuild_user(db, uid) for uid in user_ids)
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill topic/tag link tables.")
+    parser.add_argument("--user-id", type=int, default=None, help="Only backfill this user")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    synced = backfill_tags(args.user_id)
+    print(f"Synced {synced} contacts and meetings in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
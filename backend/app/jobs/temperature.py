@@ -0,0 +1,37 @@
+"""
+Batch job: recompute relationship temperature scores.
+
+Run from cron or manually:
+    python -m app.jobs.temperature [--user-id ID]
+"""
+import argparse
+import time
+from typing import Optional
+
+from app.models.database import SessionLocal
+from app.services.scoring_service import scoring_service
+
+
+def recompute_temperatures(user_id: Optional[int] = None) -> int:
+    """Recompute scores for one user, or all users. Returns the number of contacts changed."""
+    db = SessionLocal()
+    try:
+        if user_id is not None:
+            return scoring_service.recompute_user(db, user_id)
+        return scoring_service.recompute_all(db)
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute relationship temperature scores.")
+    parser.add_argument("--user-id", type=int, default=None, help="Only recompute this user")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    changed = recompute_temperatures(args.user_id)
+    print(f"Updated {changed} contacts in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
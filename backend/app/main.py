@@ -1,12 +1,97 @@
 """
 Main FastAPI application for Rapport API.
 """
+import asyncio
+import gc
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Optional
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy.orm import configure_mappers
 
 from app.core.config import settings
-from app.api import auth, contacts
+from app.core.compression import CompressionMiddleware
+from app.core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, registry
+from app.core.query_budget import QueryBudgetMiddleware
+from app.core.profiling import ProfilingMiddleware
+from app.api import auth, contacts, commitments, exports, matches, search
+from app.models.database import dispose_engine, get_engine, warm_up_pool
+from app.services.llm_service import llm_service
+from app.jobs.scheduler import JobScheduler
+from app.jobs.idempotency import purge_idempotency_keys
+from app.jobs.leases import acquire_job_lease
+from app.jobs.meeting_recovery import recover_meetings
+from app.jobs.temperature import recompute_temperatures
+
+
+def create_scheduler(loop: Optional[asyncio.AbstractEventLoop] = None) -> JobScheduler:
+    """
+    Create the scheduler with all periodic batch jobs enabled in settings.
+
+    loop is the event loop serving requests; jobs calling the LLM share its admission control.
+    Every worker process creates a scheduler; exclusive jobs run on one of them per interval.
+    """
+    scheduler = JobScheduler(acquire_lease=acquire_job_lease)
+    if settings.temperature_recompute_interval_minutes > 0:
+        scheduler.register(
+            "temperature_recompute",
+            settings.temperature_recompute_interval_minutes * 60,
+            recompute_temperatures,
+            exclusive=True,
+        )
+    if settings.meeting_recovery_interval_minutes > 0:
+        # Also at startup, to pick up meetings left behind by a crashed worker.
+        # Exclusive, so workers starting together do not all sweep and claim at once.
+        scheduler.register(
+            "meeting_recovery",
+            settings.meeting_recovery_interval_minutes * 60,
+            partial(recover_meetings, loop=loop),
+            run_on_startup=True,
+            exclusive=True,
+        )
+    if settings.idempotency_purge_interval_minutes > 0:
+        scheduler.register(
+            "idempotency_purge",
+            settings.idempotency_purge_interval_minutes * 60,
+            purge_idempotency_keys,
+            exclusive=True,
+        )
+    return scheduler
+
+
+def warm_up() -> None:
+    """
+    Create the engine, open pooled connections, configure ORM mappers and
+    build the LLM client.
+    """
+    get_engine()
+    warm_up_pool(settings.db_pool_warmup)
+    configure_mappers()
+    llm_service.get_client()
+    # Move import-time objects out of the collector's way so the first
+    # requests do not pay for a full collection
+    gc.collect()
+    gc.freeze()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared clients, and start and stop background jobs with the application."""
+    if settings.startup_warmup:
+        await asyncio.to_thread(warm_up)
+    scheduler = create_scheduler(asyncio.get_running_loop()) if settings.scheduler_enabled else None
+    if scheduler:
+        await scheduler.start()
+    try:
+        yield
+    finally:
+        if scheduler:
+            # Running jobs still use the engine
+            await scheduler.stop(settings.scheduler_shutdown_timeout_seconds)
+        dispose_engine()
 
 
 def create_app() -> FastAPI:
@@ -16,6 +101,7 @@ def create_app() -> FastAPI:
         debug=settings.debug,
         docs_url="/docs" if settings.debug else None,
         redoc_url="/redoc" if settings.debug else None,
+        lifespan=lifespan,
     )
 
     # Configure CORS
@@ -27,16 +113,46 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Negotiated gzip/brotli compression
+    if settings.compression_enabled:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.compression_minimum_size,
+            level=settings.compression_level,
+            route_levels=settings.compression_route_levels,
+        )
+
+    # Opt-in sampling profiler (signed header or sampled traffic)
+    if settings.profiling_enabled:
+        app.add_middleware(ProfilingMiddleware)
+
+    # Per-request SQL budgets and N+1 detection
+    if settings.query_budget_enabled:
+        app.add_middleware(QueryBudgetMiddleware)
+
+    # Per-route latency, SQL and LLM metrics; outermost so it times the whole stack
+    if settings.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
+
     # Include routers
     app.include_router(auth.router, prefix=settings.api_v1_prefix)
     app.include_router(contacts.router, prefix=settings.api_v1_prefix)
     app.include_router(contacts.standalone_router, prefix=settings.api_v1_prefix)
+    app.include_router(commitments.router, prefix=settings.api_v1_prefix)
+    app.include_router(exports.router, prefix=settings.api_v1_prefix)
+    app.include_router(matches.router, prefix=settings.api_v1_prefix)
+    app.include_router(search.router, prefix=settings.api_v1_prefix)
 
     # Health check
     @app.get("/health")
     async def health_check():
         return {"status": "healthy", "version": "1.0.0"}
 
+    if settings.metrics_enabled:
+        @app.get("/metrics", include_in_schema=False)
+        async def metrics():
+            return Response(registry.render(), media_type=METRICS_CONTENT_TYPE)
+
     # Root endpoint
     @app.get("/")
     async def root():
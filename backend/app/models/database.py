@@ -1,28 +1,94 @@
 """
 Database configuration and session management.
+
+The engine is created on first use (normally by the application lifespan),
+so importing the app does not connect or configure a pool.
 """
-from sqlalchemy import create_engine
+import threading
+from typing import Generator, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
 
 from app.core.config import settings
 
-# Create database engine
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    pool_recycle=3600,
-    echo=settings.debug
-)
+_engine: Optional[Engine] = None
+_engine_lock = threading.Lock()
+
+
+class _LazySessionMaker(sessionmaker):
+    """sessionmaker that binds to the application engine on first use."""
+
+    def __call__(self, **local_kw) -> Session:
+        if self.kw.get("bind") is None and "bind" not in local_kw:
+            get_engine()
+        return super().__call__(**local_kw)
+
 
 # Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = _LazySessionMaker(autocommit=False, autoflush=False)
 
 # Create Base class for models
 Base = declarative_base()
 
 
+def get_engine() -> Engine:
+    """Create the database engine on first call and return it."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                options = {}
+                if not settings.database_url.startswith("sqlite"):
+                    options.update(
+                        pool_size=settings.db_pool_size, max_overflow=settings.db_max_overflow
+                    )
+                _engine = create_engine(
+                    settings.database_url,
+                    pool_pre_ping=True,
+                    pool_recycle=3600,
+                    echo=settings.sql_echo,
+                    **options
+                )
+                SessionLocal.configure(bind=_engine)
+    return _engine
+
+
+def warm_up_pool(connections: int) -> None:
+    """Open pooled connections ahead of the first requests."""
+    if connections <= 0:
+        return
+    engine = get_engine()
+    opened = []
+    try:
+        for _ in range(connections):
+            conn = engine.connect()
+            opened.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in opened:
+            conn.close()
+
+
+def dispose_engine() -> None:
+    """Close all pooled connections, e.g. at shutdown."""
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
+            SessionLocal.configure(bind=None)
+
+
+def __getattr__(name: str):
+    # Backwards compatible access to the engine as a module attribute
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def get_db() -> Generator[Session, None, None]:
     """
     Dependency function to get database session.
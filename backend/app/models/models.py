@@ -1,7 +1,9 @@
 """
 Database models for Rapport contact memory system.
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Enum, Float
+from sqlalchemy import (
+    Column, Integer, String, Text, DateTime, ForeignKey, JSON, Enum, Float, Index, UniqueConstraint
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.models.database import Base
@@ -36,6 +38,14 @@ class Contact(Base):
     Stores Layer A (Identity) and Layer B (Status) information.
     """
     __tablename__ = "contacts"
+    __table_args__ = (
+        Index("ix_contacts_user_next_follow_up", "user_id", "next_follow_up_at"),
+        # Facet filters and counts on the contact list
+        Index("ix_contacts_user_city", "user_id", "city"),
+        Index("ix_contacts_user_industry", "user_id", "current_industry"),
+        Index("ix_contacts_user_stage", "user_id", "relationship_stage"),
+        Index("ix_contacts_user_temperature", "user_id", "temperature_score"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -94,6 +104,7 @@ class Contact(Base):
     last_verified_at = Column(DateTime(timezone=True))
     relationship_stage = Column(String(50))  # new, acquaintance, friend, ally, key_partner
     temperature_score = Column(Float)  # 0-100 relationship health score
+    next_follow_up_at = Column(DateTime(timezone=True))  # Precomputed follow-up due date
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -101,6 +112,7 @@ class Contact(Base):
     user = relationship("User", back_populates="contacts")
     meetings = relationship("Meeting", back_populates="contact", cascade="all, delete-orphan")
     action_playbooks = relationship("ActionPlaybook", back_populates="contact", cascade="all, delete-orphan", uselist=False)
+    tag_links = relationship("ContactTag", cascade="all, delete-orphan")
 
 
 class Meeting(Base):
@@ -109,6 +121,10 @@ class Meeting(Base):
     Stores Layer C (Timeline) information - append-only interaction history.
     """
     __tablename__ = "meetings"
+    __table_args__ = (
+        Index("ix_meetings_user_meeting_date", "user_id", "meeting_date"),
+        Index("ix_meetings_status_lease", "status", "lease_expires_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -136,6 +152,8 @@ class Meeting(Base):
     # Processing status
     status = Column(Enum(MeetingStatus), default=MeetingStatus.PROCESSING)
     error_message = Column(Text)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")  # Extractions started
+    lease_expires_at = Column(DateTime(timezone=True))  # While processing: when to retry it
 
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -144,6 +162,110 @@ class Meeting(Base):
     # Relationships
     user = relationship("User", back_populates="meetings")
     contact = relationship("Contact", back_populates="meetings")
+    commitments = relationship("Commitment", back_populates="meeting", cascade="all, delete-orphan")
+    tag_links = relationship("MeetingTag", cascade="all, delete-orphan")
+
+
+class CommitmentStatus(str, enum.Enum):
+    """Commitment status."""
+    OPEN = "open"
+    DONE = "done"
+    CANCELLED = "cancelled"
+
+
+class Commitment(Base):
+    """
+    A single promise extracted from a meeting, normalized out of
+    Meeting.my_commitments / their_commitments so it can be queried by due date.
+    """
+    __tablename__ = "commitments"
+    __table_args__ = (
+        Index("ix_commitments_user_status_due", "user_id", "status", "due_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    contact_id = Column(Integer, ForeignKey("contacts.id"), nullable=False, index=True)
+    meeting_id = Column(Integer, ForeignKey("meetings.id"), nullable=False, index=True)
+
+    owner = Column(String(10), nullable=False)  # me (I promised), them (they promised)
+    content = Column(Text, nullable=False)
+    deadline_text = Column(String(200))  # Deadline as extracted, e.g. "下周五"
+    due_at = Column(DateTime(timezone=True))  # Parsed deadline, null if none/unparseable
+    # open, done, cancelled
+    status = Column(String(20), nullable=False, default=CommitmentStatus.OPEN.value)
+    completed_at = Column(DateTime(timezone=True))
+
+    # Metadata
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # Relationships
+    meeting = relationship("Meeting", back_populates="commitments")
+    contact = relationship("Contact")
+
+
+class Tag(Base):
+    """
+    Normalized topic/tag name, one row per distinct name per user.
+    Mirrors JSON list values so contacts and meetings can be filtered by index.
+    """
+    __tablename__ = "tags"
+    __table_args__ = (
+        UniqueConstraint("user_id", "name", name="uq_tags_user_name"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    name = Column(String(100), nullable=False)  # Normalized: trimmed, lowercased
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class ContactTag(Base):
+    """Contact <-> tag link, per source field (focus_topics, current_projects, current_industry)."""
+    __tablename__ = "contact_tags"
+    __table_args__ = (
+        Index("ix_contact_tags_tag_field", "tag_id", "field", "contact_id"),
+    )
+
+    contact_id = Column(Integer, ForeignKey("contacts.id"), primary_key=True)
+    tag_id = Column(Integer, ForeignKey("tags.id"), primary_key=True)
+    field = Column(String(50), primary_key=True)
+
+
+class MeetingTag(Base):
+    """Meeting <-> tag link for Meeting.topics."""
+    __tablename__ = "meeting_tags"
+    __table_args__ = (
+        Index("ix_meeting_tags_tag_meeting", "tag_id", "meeting_id"),
+    )
+
+    meeting_id = Column(Integer, ForeignKey("meetings.id"), primary_key=True)
+    tag_id = Column(Integer, ForeignKey("tags.id"), primary_key=True)
+
+
+class ContactChange(Base):
+    """
+    Append-only log of contact field changes, one row per changed field.
+    Written in the same transaction as the update, so past values of a
+    contact can be reconstructed without re-running extraction.
+    """
+    __tablename__ = "contact_changes"
+    __table_args__ = (
+        Index("ix_contact_changes_contact_changed", "contact_id", "changed_at"),
+        Index("ix_contact_changes_user_changed", "user_id", "changed_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    contact_id = Column(Integer, ForeignKey("contacts.id"), nullable=False)
+
+    field = Column(String(50), nullable=False)
+    old_value = Column(JSON)
+    new_value = Column(JSON)
+    source = Column(String(20), nullable=False)  # user, meeting, merge
+    meeting_id = Column(Integer)  # Meeting the change was extracted from, if any
+    changed_at = Column(DateTime(timezone=True), nullable=False)
 
 
 class ActionPlaybook(Base):
@@ -189,3 +311,39 @@ class ActionPlaybook(Base):
 
     # Relationships
     contact = relationship("Contact", back_populates="action_playbooks")
+
+
+class IdempotencyKey(Base):
+    """
+    Idempotency record for retried write requests (Idempotency-Key header).
+    Stores the request fingerprint and, once finished, the response to replay.
+    """
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint("user_id", "key", name="uq_idempotency_keys_user_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    key = Column(String(255), nullable=False)
+    request_fingerprint = Column(String(64), nullable=False)  # sha256 of method, path and body
+
+    status = Column(String(20), nullable=False, default="processing")  # processing, completed
+    processing_expires_at = Column(DateTime(timezone=True))  # Claim lease while processing
+    response_status = Column(Integer)
+    response_body = Column(JSON)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+
+class JobLease(Base):
+    """
+    Lease on a scheduled job, so a job runs on one API worker per interval
+    even though every worker runs the scheduler.
+    """
+    __tablename__ = "job_leases"
+
+    name = Column(String(100), primary_key=True)
+    owner = Column(String(255), nullable=False)  # host:pid of the worker holding the lease
+    expires_at = Column(DateTime(timezone=True), nullable=False)  # Database clock
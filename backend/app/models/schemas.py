@@ -2,7 +2,7 @@
 Pydantic schemas for API requests and responses.
 """
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List, Any, Dict
+from typing import Optional, List, Any, Dict, Literal
 from datetime import datetime
 
 
@@ -136,6 +136,12 @@ class ContactListItem(BaseModel):
         from_attributes = True
 
 
+class DueContactItem(ContactListItem):
+    """Contact due for a follow-up, with the suggested next action."""
+    next_follow_up_at: Optional[datetime] = None
+    next_action: Optional[Dict[str, Any]] = None
+
+
 class ContactDetail(ContactBase, ContactIdentity, ContactStatus):
     """Full contact detail with all layers."""
     id: int
@@ -150,6 +156,85 @@ class ContactDetail(ContactBase, ContactIdentity, ContactStatus):
         from_attributes = True
 
 
+# ==================== Contact Batch Schemas ====================
+class ContactBatchIds(BaseModel):
+    """Schema for fetching or deleting several contacts at once."""
+    ids: List[int] = Field(..., min_length=1, max_length=100)
+
+
+class ContactBatchUpdateItem(BaseModel):
+    """A partial update for one contact in a batch."""
+    id: int
+    update: ContactUpdate
+
+
+class ContactBatchUpdate(BaseModel):
+    """Schema for updating several contacts in one transaction."""
+    items: List[ContactBatchUpdateItem] = Field(..., min_length=1, max_length=100)
+
+
+class ContactBatchResultItem(BaseModel):
+    """Per-contact result of a batch operation."""
+    id: int
+    status: str  # found, updated, deleted, not_found
+    contact: Optional[ContactDetail] = None
+
+
+class ContactBatchResponse(BaseModel):
+    """Batch operation results, in request order."""
+    results: List[ContactBatchResultItem]
+
+
+class DuplicateCandidate(BaseModel):
+    """Pair of contacts that are likely the same person."""
+    contacts: List[ContactListItem]
+    score: float
+    reasons: List[str]
+
+
+class ContactMerge(BaseModel):
+    """Schema for merging duplicate contacts into a primary contact."""
+    primary_id: int
+    duplicate_ids: List[int] = Field(..., min_length=1, max_length=50)
+
+
+class ContactChangeItem(BaseModel):
+    """One logged change of a contact field."""
+    id: int
+    contact_id: int
+    field: str
+    old_value: Any = None
+    new_value: Any = None
+    source: str
+    meeting_id: Optional[int] = None
+    changed_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ContactFieldDiff(BaseModel):
+    """Net change of a contact field over a time range."""
+    contact_id: int
+    field: str
+    old_value: Any = None
+    new_value: Any = None
+    changed_at: datetime
+    change_count: int
+
+
+class FacetValue(BaseModel):
+    """Number of matching contacts with one facet value."""
+    value: str
+    count: int
+
+
+class ContactFacets(BaseModel):
+    """Facet counts for the contacts matching the current list filters."""
+    total: int
+    facets: Dict[str, List[FacetValue]]
+
+
 # ==================== Meeting Schemas ====================
 class MeetingCreate(BaseModel):
     """Schema for creating a meeting from conversation text."""
@@ -197,6 +282,29 @@ class MeetingDetail(BaseModel):
         from_attributes = True
 
 
+# ==================== Commitment Schemas ====================
+class CommitmentItem(BaseModel):
+    """Normalized commitment extracted from a meeting."""
+    id: int
+    contact_id: int
+    meeting_id: int
+    owner: str
+    content: str
+    deadline_text: Optional[str] = None
+    due_at: Optional[datetime] = None
+    status: str
+    completed_at: Optional[datetime] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class CommitmentStatusUpdate(BaseModel):
+    """Schema for marking a commitment done or cancelled."""
+    status: Literal["open", "done", "cancelled"]
+
+
 # ==================== Action Playbook Schemas ====================
 class GiftCareSection(BaseModel):
     """D1: Gift & Care section."""
@@ -0,0 +1,89 @@
+"""
+Cache namespaces for per-user read results and their invalidation on writes.
+"""
+from typing import Iterable, Set, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import cache
+from app.models.models import ActionPlaybook, Contact, Meeting
+
+# Results derived from contact rows only (facet counts)
+contact_cache = cache.namespace("contacts")
+# Results that also include meetings and playbooks (contact timelines)
+timeline_cache = cache.namespace("timelines")
+
+NAMESPACES = {"contacts": contact_cache, "timelines": timeline_cache}
+
+
+def invalidate_user_caches(
+    user_id: int,
+    names: Iterable[str] = ("contacts", "timelines")
+) -> None:
+    """
+    Drop a user's cached results. Needed after bulk UPDATEs, which bypass the
+    ORM flush hooks below.
+    """
+    for name in names:
+        NAMESPACES[name].invalidate(user_id)
+
+
+def invalidate_on_commit(
+    session: Session,
+    user_id: int,
+    names: Iterable[str] = ("contacts", "timelines")
+) -> None:
+    """
+    Drop a user's cached results when the session's transaction commits, like
+    ORM writes do; nothing is dropped if it rolls back. For Core UPDATEs run
+    in the session.
+    """
+    session.info.setdefault("cache_writes", set()).update((name, user_id) for name in names)
+
+
+def _playbook_users(session: Session, playbooks: list) -> Set[int]:
+    # Playbooks have no user_id; resolve through their contacts
+    contact_ids = {p.contact_id for p in playbooks if p.contact_id is not None}
+    users = set()
+    for contact_id in list(contact_ids):
+        contact = session.identity_map.get(session.identity_key(Contact, contact_id))
+        if contact is not None and contact.user_id is not None:
+            users.add(contact.user_id)
+            contact_ids.discard(contact_id)
+    if contact_ids:
+        users.update(session.connection().execute(
+            select(Contact.user_id).where(Contact.id.in_(contact_ids))
+        ).scalars())
+    return users
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_writes(session: Session, flush_context) -> None:
+    """Remember which users' cached results this transaction makes stale."""
+    stale: Set[Tuple[str, int]] = set()
+    playbooks = []
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Contact) and obj.user_id is not None:
+            stale.update({("contacts", obj.user_id), ("timelines", obj.user_id)})
+        elif isinstance(obj, Meeting) and obj.user_id is not None:
+            stale.add(("timelines", obj.user_id))
+        elif isinstance(obj, ActionPlaybook):
+            playbooks.append(obj)
+    if playbooks:
+        stale.update(("timelines", user_id) for user_id in _playbook_users(session, playbooks))
+    if stale:
+        session.info.setdefault("cache_writes", set()).update(stale)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    # After commit, so a concurrent read cannot re-cache pre-commit data under the new version
+    for name, user_id in session.info.pop("cache_writes", ()):
+        NAMESPACES[name].invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    session.info.pop("cache_writes", None)
+
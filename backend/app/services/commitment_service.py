@@ -0,0 +1,225 @@
+"""
+Commitment service: normalized, due-date indexed commitments extracted from meetings.
+"""
+import calendar
+import re
+from datetime import datetime, time, timedelta
+from typing import Any, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.models import Commitment, CommitmentStatus, Meeting
+from app.services.follow_up_service import parse_interval_days
+
+COMMITMENT_OWNERS = {"me": "my_commitments", "them": "their_commitments"}
+
+_WEEKDAYS = {"一": 0, "二": 1, "三": 2, "四": 3, "五": 4, "六": 5, "日": 6, "天": 6}
+_WEEKDAY_PATTERN = re.compile(r"(下下|下个|下|本|这)?\s*(?:周|星期|礼拜)([一二三四五六日天])")
+_ISO_DATE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+_MONTH_DAY = re.compile(r"(\d{1,2})\s*月\s*(\d{1,2})\s*[日号]")
+
+_RELATIVE_DAYS = [("大后天", 3), ("后天", 2), ("明天", 1), ("明日", 1), ("今天", 0), ("今日", 0),
+                  ("tomorrow", 1), ("today", 0)]
+
+
+def _end_of_day(day: datetime) -> datetime:
+    return datetime.combine(day.date(), time(23, 59, 59))
+
+
+def parse_deadline(text: Any, anchor: datetime) -> Optional[datetime]:
+    """
+    Parse an extracted deadline ("下周五", "月底", "3月15日", "2024-03-01", "两周内")
+    relative to the meeting date. Returns the end of the due day, or None.
+    """
+    if not isinstance(text, str) or not text.strip():
+        return None
+    text = text.strip().lower()
+
+    match = _ISO_DATE.search(text)
+    if match:
+        try:
+            return _end_of_day(datetime(*map(int, match.groups())))
+        except ValueError:
+            return None
+
+    match = _MONTH_DAY.search(text)
+    if match:
+        month, day = map(int, match.groups())
+        try:
+            due = datetime(anchor.year, month, day)
+        except ValueError:
+            return None
+        if due.date() < anchor.date():
+            due = due.replace(year=anchor.year + 1)
+        return _end_of_day(due)
+
+    for keyword, days in _RELATIVE_DAYS:
+        if keyword in text:
+            return _end_of_day(anchor + timedelta(days=days))
+
+    match = _WEEKDAY_PATTERN.search(text)
+    if match:
+        prefix, weekday = match.groups()
+        weeks = {"下下": 2, "下个": 1, "下": 1}.get(prefix or "", 0)
+        monday = anchor - timedelta(days=anchor.weekday())
+        return _end_of_day(monday + timedelta(weeks=weeks, days=_WEEKDAYS[weekday]))
+
+    if "月底" in text or "月末" in text or "end of month" in text:
+        last_day = calendar.monthrange(anchor.year, anchor.month)[1]
+        return _end_of_day(anchor.replace(day=last_day))
+    if "周末" in text or "weekend" in text:
+        return _end_of_day(anchor + timedelta(days=6 - anchor.weekday()))
+
+    days = parse_interval_days(text)
+    if days:
+        return _end_of_day(anchor + timedelta(days=days))
+    return None
+
+
+class CommitmentService:
+    """
+    Keeps the commitments table in sync with the JSON commitment lists on meetings,
+    and answers due-soon / overdue queries from the (user_id, status, due_at) index.
+    """
+
+    @staticmethod
+    def build_commitments(meeting: Meeting) -> List[Commitment]:
+        """Normalize a meeting's my_commitments / their_commitments into rows."""
+        anchor = meeting.meeting_date or datetime.now()
+        commitments = []
+        for owner, attribute in COMMITMENT_OWNERS.items():
+            for item in getattr(meeting, attribute) or []:
+                if isinstance(item, dict):
+                    content = item.get("commitment")
+                    deadline = item.get("deadline")
+                else:
+                    content, deadline = item, None
+                if not content:
+                    continue
+                deadline_text = str(deadline)[:200] if deadline else None
+                commitments.append(Commitment(
+                    user_id=meeting.user_id,
+                    contact_id=meeting.contact_id,
+                    meeting_id=meeting.id,
+                    owner=owner,
+                    content=str(content),
+                    deadline_text=deadline_text,
+                    due_at=parse_deadline(deadline_text, anchor),
+                    status=CommitmentStatus.OPEN.value
+                ))
+        return commitments
+
+    @staticmethod
+    def sync_meeting(db: Session, meeting: Meeting) -> List[Commitment]:
+        """
+        Replace the normalized commitments of a meeting with its current JSON lists.
+        The caller commits.
+        """
+        meeting.commitments = CommitmentService.build_commitments(meeting)
+        return meeting.commitments
+
+    @staticmethod
+    def _open_query(db: Session, user_id: int, owner: Optional[str]):
+        query = db.query(Commitment).filter(
+            Commitment.user_id == user_id,
+            Commitment.status == CommitmentStatus.OPEN.value
+        )
+        if owner:
+            query = query.filter(Commitment.owner == owner)
+        return query
+
+    @staticmethod
+    def list_due_soon(
+        db: Session,
+        user_id: int,
+        days: int = 7,
+        owner: Optional[str] = None,
+        limit: int = 100,
+        now: Optional[datetime] = None
+    ) -> List[Commitment]:
+        """Open commitments due between now and the end of the next `days` days, soonest first."""
+        now = now or datetime.now()
+        return CommitmentService._open_query(db, user_id, owner).filter(
+            Commitment.due_at >= now,
+            Commitment.due_at <= _end_of_day(now + timedelta(days=days))
+        ).order_by(Commitment.due_at, Commitment.id).limit(limit).all()
+
+    @staticmethod
+    def list_overdue(
+        db: Session,
+        user_id: int,
+        owner: Optional[str] = None,
+        limit: int = 100,
+        now: Optional[datetime] = None
+    ) -> List[Commitment]:
+        """Open commitments past their due date, most overdue first."""
+        now = now or datetime.now()
+        return CommitmentService._open_query(db, user_id, owner).filter(
+            Commitment.due_at < now
+        ).order_by(Commitment.due_at, Commitment.id).limit(limit).all()
+
+    @staticmethod
+    def update_status(
+        db: Session,
+        commitment_id: int,
+        user_id: int,
+        status: str
+    ) -> Optional[Commitment]:
+        """Mark a commitment open, done or cancelled."""
+        commitment = db.query(Commitment).filter(
+            Commitment.id == commitment_id,
+            Commitment.user_id == user_id
+        ).first()
+        if not commitment:
+            return None
+
+        commitment.status = status
+        commitment.completed_at = datetime.now() if status == CommitmentStatus.DONE.value else None
+        db.commit()
+        db.refresh(commitment)
+        return commitment
+
+    @staticmethod
+    def backfill_user(db: Session, user_id: int, batch_size: int = 500) -> int:
+        """
+        Normalize commitments of all completed meetings of a user that have none yet.
+
+        Idempotent: meetings already synced are skipped, so statuses are preserved
+        and the job can be re-run safely.
+
+        Returns:
+            Number of commitments written
+        """
+        written = 0
+        last_id = 0
+        while True:
+            meetings = db.query(Meeting).filter(
+                Meeting.user_id == user_id,
+                Meeting.status == "completed",
+                Meeting.id > last_id
+            ).order_by(Meeting.id).limit(batch_size).all()
+            if not meetings:
+                break
+
+            meeting_ids = [m.id for m in meetings]
+            synced = {
+                row[0] for row in db.query(Commitment.meeting_id).filter(
+                    Commitment.meeting_id.in_(meeting_ids)
+                ).distinct()
+            }
+
+            rows = [
+                c for m in meetings if m.id not in synced
+                for c in CommitmentService.build_commitments(m)
+            ]
+            db.add_all(rows)
+            db.commit()
+            db.expunge_all()
+
+            written += len(rows)
+            last_id = meeting_ids[-1]
+
+        return written
+
+
+commitment_service = CommitmentService()
@@ -1,17 +1,29 @@
 """
 Contact service for managing contacts and meetings.
 """
-from typing import List, Optional, Dict, Any
-from datetime import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
-
-from app.models.models import Contact, Meeting, ActionPlaybook, User
+import asyncio
+import time
+from contextlib import nullcontext
+from typing import Iterable, Iterator, List, Optional, Dict, Any
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session, load_only, selectinload
+from sqlalchemy import and_, func, or_, update
+
+from app.core.admission import AdmissionRejected, llm_admission
+from app.core.config import settings
+from app.models.models import Contact, Meeting, MeetingStatus, ActionPlaybook, User
 from app.models.schemas import (
     ContactCreate, ContactUpdate, MeetingCreate,
     ActionPlaybookDetail
 )
 from app.services.llm_service import llm_service
+from app.services.follow_up_service import FollowUpService
+from app.services.commitment_service import CommitmentService
+from app.services.search_service import search_service
+from app.services.matchmaking_service import matchmaking_service
+from app.services.tag_service import CONTACT_TAG_FIELDS, TagService
+from app.services.history_service import ContactHistoryService
+from app.services.cache_invalidation import invalidate_on_commit
 
 
 class ContactService:
@@ -21,34 +33,74 @@ class ContactService:
     def create_contact(db: Session, user_id: int, contact: ContactCreate) -> Contact:
         """Create a new contact."""
         db_contact = Contact(**contact.model_dump(exclude_none=True), user_id=user_id)
+        FollowUpService.refresh_contact(db, db_contact, None)
         db.add(db_contact)
+        TagService.sync_contact(db, db_contact)
         db.commit()
         db.refresh(db_contact)
+        matchmaking_service.contacts_changed(user_id, [db_contact])
         return db_contact
 
     @staticmethod
-    def get_contact(db: Session, contact_id: int, user_id: int) -> Optional[Contact]:
-        """Get a contact by ID for a specific user."""
-        return db.query(Contact).filter(
+    def _load_only(query, model, fields: Optional[List[str]]):
+        """Restrict the loaded columns of a query to a sparse fieldset, if given."""
+        if not fields:
+            return query
+        return query.options(load_only(*(getattr(model, field) for field in fields)))
+
+    @staticmethod
+    def _query(db: Session, model, fields: Optional[List[str]]):
+        """
+        Query whole ORM objects, or plain row tuples when a fieldset is given.
+
+        Rows expose the same attribute access as ORM objects but skip identity-map
+        bookkeeping, which matters for large lists.
+        """
+        if not fields:
+            return db.query(model)
+        return db.query(*(getattr(model, field) for field in fields))
+
+    @staticmethod
+    def get_contact(
+        db: Session,
+        contact_id: int,
+        user_id: int,
+        fields: Optional[List[str]] = None
+    ) -> Optional[Contact]:
+        """Get a contact by ID for a specific user, optionally loading only some columns."""
+        query = db.query(Contact).filter(
             Contact.id == contact_id,
             Contact.user_id == user_id
-        ).first()
+        )
+        return ContactService._load_only(query, Contact, fields).first()
 
     @staticmethod
-    def list_contacts(
-        db: Session,
+    def filter_contacts(
+        query,
         user_id: int,
         search: Optional[str] = None,
-        skip: int = 0,
-        limit: int = 100
-    ) -> tuple[List[Contact], int]:
+        filters: Optional[Dict[str, Any]] = None
+    ):
         """
-        List contacts for a user with optional search.
+        Apply the contact list filters to a query over Contact.
 
-        Returns:
-            Tuple of (contacts list, total count)
+        Args:
+            filters: topic, project, industry (served by contact_tags), city,
+                relationship_stage, temperature_min, temperature_max
         """
-        query = db.query(Contact).filter(Contact.user_id == user_id)
+        for filter_name, value in (filters or {}).items():
+            if value is None or value == "":
+                continue
+            if filter_name in CONTACT_TAG_FIELDS:
+                query = query.filter(TagService.contact_filter(user_id, filter_name, value))
+            elif filter_name == "city":
+                query = query.filter(Contact.city == value)
+            elif filter_name == "relationship_stage":
+                query = query.filter(Contact.relationship_stage == value)
+            elif filter_name == "temperature_min":
+                query = query.filter(Contact.temperature_score >= value)
+            elif filter_name == "temperature_max":
+                query = query.filter(Contact.temperature_score <= value)
 
         if search:
             search_pattern = f"%{search}%"
@@ -59,8 +111,34 @@ class ContactService:
                     Contact.current_position.ilike(search_pattern)
                 )
             )
+        return query
+
+    @staticmethod
+    def list_contacts(
+        db: Session,
+        user_id: int,
+        search: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> tuple[List[Contact], int]:
+        """
+        List contacts for a user with optional search.
+
+        Args:
+            fields: Columns to select; rows are returned instead of ORM objects if given
+            filters: Facet filters, see filter_contacts
+
+        Returns:
+            Tuple of (contacts list, total count)
+        """
+        query = db.query(Contact).filter(Contact.user_id == user_id)
+        query = ContactService.filter_contacts(query, user_id, search, filters)
 
         total = query.count()
+        if fields:
+            query = query.with_entities(*(getattr(Contact, field) for field in fields))
         contacts = query.order_by(Contact.last_meeting_date.desc().nullslast()) \
                        .offset(skip).limit(limit).all()
 
@@ -78,12 +156,16 @@ class ContactService:
         if not db_contact:
             return None
 
+        before = ContactHistoryService.snapshot(db_contact)
         update_data = contact_update.model_dump(exclude_none=True)
         for field, value in update_data.items():
             setattr(db_contact, field, value)
+        ContactHistoryService.record_changes(db, db_contact, before, "user")
+        TagService.sync_contact(db, db_contact)
 
         db.commit()
         db.refresh(db_contact)
+        matchmaking_service.contacts_changed(user_id, [db_contact])
         return db_contact
 
     @staticmethod
@@ -93,10 +175,86 @@ class ContactService:
         if not db_contact:
             return False
 
+        ContactHistoryService.delete_for_contacts(db, [contact_id])
         db.delete(db_contact)
         db.commit()
+        matchmaking_service.contacts_removed(user_id, [contact_id])
         return True
 
+    @staticmethod
+    def get_contacts(
+        db: Session,
+        contact_ids: List[int],
+        user_id: int,
+        options: Optional[List[Any]] = None
+    ) -> Dict[int, Contact]:
+        """Get several contacts of a user in one query, keyed by contact ID."""
+        contacts = db.query(Contact).options(*(options or [])).filter(
+            Contact.id.in_(set(contact_ids)),
+            Contact.user_id == user_id
+        ).all()
+        return {contact.id: contact for contact in contacts}
+
+    @staticmethod
+    def update_contacts(
+        db: Session,
+        user_id: int,
+        updates: List[tuple[int, ContactUpdate]]
+    ) -> Dict[int, Contact]:
+        """
+        Apply partial updates to several contacts in a single transaction.
+
+        Returns:
+            Updated contacts keyed by ID; IDs not owned by the user are absent
+        """
+        contacts = ContactService.get_contacts(
+            db, [cid for cid, _ in updates], user_id, options=[selectinload(Contact.tag_links)]
+        )
+        if not contacts:
+            return {}
+
+        for contact_id, contact_update in updates:
+            db_contact = contacts.get(contact_id)
+            if not db_contact:
+                continue
+            before = ContactHistoryService.snapshot(db_contact)
+            for field, value in contact_update.model_dump(exclude_none=True).items():
+                setattr(db_contact, field, value)
+            ContactHistoryService.record_changes(db, db_contact, before, "user")
+            TagService.sync_contact(db, db_contact)
+
+        db.commit()
+        # Reload all rows in one query instead of refreshing each contact
+        updated = ContactService.get_contacts(db, list(contacts), user_id)
+        matchmaking_service.contacts_changed(user_id, updated.values())
+        return updated
+
+    @staticmethod
+    def delete_contacts(db: Session, contact_ids: List[int], user_id: int) -> set[int]:
+        """
+        Delete several contacts, with their meetings and playbooks, in a single transaction.
+
+        Returns:
+            IDs of the contacts that were deleted
+        """
+        contacts = db.query(Contact).options(
+            selectinload(Contact.meetings).selectinload(Meeting.commitments),
+            selectinload(Contact.meetings).selectinload(Meeting.tag_links),
+            selectinload(Contact.tag_links),
+            selectinload(Contact.action_playbooks)
+        ).filter(
+            Contact.id.in_(set(contact_ids)),
+            Contact.user_id == user_id
+        ).all()
+
+        ContactHistoryService.delete_for_contacts(db, [contact.id for contact in contacts])
+        for db_contact in contacts:
+            db.delete(db_contact)
+        db.commit()
+        deleted = {contact.id for contact in contacts}
+        matchmaking_service.contacts_removed(user_id, deleted)
+        return deleted
+
     @staticmethod
     def find_or_create_contact_by_name(
         db: Session,
@@ -130,33 +288,153 @@ class ContactService:
         return contact
 
     @staticmethod
-    def get_contact_with_timeline(db: Session, contact_id: int, user_id: int) -> Optional[Dict[str, Any]]:
+    def get_contact_with_timeline(
+        db: Session,
+        contact_id: int,
+        user_id: int,
+        fields: Optional[List[str]] = None,
+        meeting_fields: Optional[List[str]] = None,
+        include: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Get contact with full timeline and action playbook.
 
+        Args:
+            fields: Contact columns to load (all if None)
+            meeting_fields: Meeting columns to select; rows are returned if given
+            include: Subset of "meetings" and "action_playbook" to fetch (both if None)
+
         Returns:
             Dictionary with contact, meetings, and action_playbook
         """
-        contact = ContactService.get_contact(db, contact_id, user_id)
+        contact = ContactService.get_contact(db, contact_id, user_id, fields)
         if not contact:
             return None
 
-        # Get meetings ordered by date (newest first)
-        meetings = db.query(Meeting).filter(
-            Meeting.contact_id == contact_id,
-            Meeting.status == "completed"
-        ).order_by(Meeting.meeting_date.desc()).all()
+        data: Dict[str, Any] = {"contact": contact}
 
-        # Get action playbook
-        playbook = db.query(ActionPlaybook).filter(
+        if include is None or "meetings" in include:
+            # Get meetings ordered by date (newest first)
+            query = ContactService._query(db, Meeting, meeting_fields).filter(
+                Meeting.contact_id == contact_id,
+                Meeting.status == "completed"
+            )
+            data["meetings"] = query.order_by(Meeting.meeting_date.desc()).all()
+
+        if include is None or "action_playbook" in include:
+            # Get action playbook
+            data["action_playbook"] = ContactService.get_action_playbook(db, contact_id)
+
+        return data
+
+    @staticmethod
+    def get_action_playbook(db: Session, contact_id: int) -> Optional[ActionPlaybook]:
+        """Get the action playbook of a contact, if any."""
+        return db.query(ActionPlaybook).filter(
             ActionPlaybook.contact_id == contact_id
         ).first()
 
-        return {
-            "contact": contact,
-            "meetings": meetings,
-            "action_playbook": playbook
-        }
+    @staticmethod
+    def get_action_playbooks(db: Session, contact_ids: List[int]) -> Dict[int, ActionPlaybook]:
+        """Get action playbooks for several contacts in one query, keyed by contact ID."""
+        if not contact_ids:
+            return {}
+        playbooks = db.query(ActionPlaybook).filter(
+            ActionPlaybook.contact_id.in_(contact_ids)
+        ).all()
+        return {playbook.contact_id: playbook for playbook in playbooks}
+
+    @staticmethod
+    def iter_contacts(db: Session, user_id: int, batch_size: int = 200) -> Iterator[List[Contact]]:
+        """Iterate all contacts of a user in ID-ordered, keyset-paginated batches."""
+        last_id = 0
+        while True:
+            batch = db.query(Contact).filter(
+                Contact.user_id == user_id,
+                Contact.id > last_id
+            ).order_by(Contact.id).limit(batch_size).all()
+            if not batch:
+                return
+            yield batch
+            if len(batch) < batch_size:
+                return
+            last_id = batch[-1].id
+
+    @staticmethod
+    def iter_completed_meetings(
+        db: Session,
+        contact_id: int,
+        batch_size: int = 200
+    ) -> Iterator[Meeting]:
+        """
+        Iterate completed meetings of a contact, newest first, in keyset-paginated batches.
+
+        Only one batch is held in memory at a time, regardless of timeline length.
+        """
+        last: Optional[tuple[datetime, int]] = None
+        while True:
+            query = db.query(Meeting).filter(
+                Meeting.contact_id == contact_id,
+                Meeting.status == "completed"
+            )
+            if last:
+                last_date, last_id = last
+                query = query.filter(
+                    or_(
+                        Meeting.meeting_date < last_date,
+                        and_(Meeting.meeting_date == last_date, Meeting.id < last_id)
+                    )
+                )
+            batch = query.order_by(Meeting.meeting_date.desc(), Meeting.id.desc()) \
+                         .limit(batch_size).all()
+            if not batch:
+                return
+            yield from batch
+            if len(batch) < batch_size:
+                return
+            last = (batch[-1].meeting_date, batch[-1].id)
+
+    @staticmethod
+    def iter_completed_meetings_of(
+        db: Session,
+        contact_ids: List[int],
+        batch_size: int = 200
+    ) -> Iterator[Meeting]:
+        """
+        Iterate completed meetings of several contacts, by contact ID and then
+        newest first, in keyset-paginated batches of one query each.
+        """
+        if not contact_ids:
+            return
+        last: Optional[tuple[int, datetime, int]] = None
+        while True:
+            query = db.query(Meeting).filter(
+                Meeting.contact_id.in_(contact_ids),
+                Meeting.status == "completed"
+            )
+            if last:
+                last_contact_id, last_date, last_id = last
+                query = query.filter(
+                    or_(
+                        Meeting.contact_id > last_contact_id,
+                        and_(
+                            Meeting.contact_id == last_contact_id,
+                            or_(
+                                Meeting.meeting_date < last_date,
+                                and_(Meeting.meeting_date == last_date, Meeting.id < last_id)
+                            )
+                        )
+                    )
+                )
+            batch = query.order_by(
+                Meeting.contact_id, Meeting.meeting_date.desc(), Meeting.id.desc()
+            ).limit(batch_size).all()
+            if not batch:
+                return
+            yield from batch
+            if len(batch) < batch_size:
+                return
+            last = (batch[-1].contact_id, batch[-1].meeting_date, batch[-1].id)
 
     @staticmethod
     def export_contact_markdown(db: Session, contact_id: int, user_id: int) -> Optional[str]:
@@ -166,34 +444,76 @@ class ContactService:
         Returns:
             Markdown string or None if contact not found
         """
-        data = ContactService.get_contact_with_timeline(db, contact_id, user_id)
-        if not data:
+        contact = ContactService.get_contact(db, contact_id, user_id)
+        if not contact:
             return None
 
-        contact = data["contact"]
-        meetings = data["meetings"]
-        playbook = data["action_playbook"]
+        playbook = ContactService.get_action_playbook(db, contact_id)
+        return "".join(ContactService.iter_contact_markdown(db, contact, playbook))
+
+    @staticmethod
+    def iter_contact_markdown(
+        db: Session,
+        contact: Contact,
+        playbook: Optional[ActionPlaybook],
+        batch_size: int = 200,
+        meetings: Optional[Iterable[Meeting]] = None
+    ) -> Iterator[str]:
+        """
+        Render a contact as markdown, one section or timeline entry per chunk.
+
+        Meetings are fetched in batches while rendering, so the caller can stream
+        the output without materializing the whole document or timeline. Callers
+        rendering many contacts pass the contact's completed meetings, newest
+        first, as meetings instead.
+        """
+        yield ContactService._join_lines(ContactService._markdown_profile_lines(contact))
+
+        # Timeline Section
+        yield "## 互动历史 (Timeline)\n\n"
+
+        has_meetings = False
+        if meetings is None:
+            meetings = ContactService.iter_completed_meetings(db, contact.id, batch_size)
+        for meeting in meetings:
+            has_meetings = True
+            yield ContactService._join_lines(ContactService._markdown_meeting_lines(meeting))
+
+        if not has_meetings:
+            yield "*暂无会谈记录*\n\n"
 
-        md_lines = []
+        yield ContactService._join_lines(ContactService._markdown_playbook_lines(playbook))
 
+        # Footer
+        yield "---\n"
+        yield f"*导出时间: {datetime.now().strftime('%Y-%m-%d %H:%M')}*\n"
+
+    @staticmethod
+    def _join_lines(lines: Iterator[str]) -> str:
+        """Join markdown lines into a newline-terminated chunk."""
+        return "".join(line + "\n" for line in lines)
+
+    @staticmethod
+    def _markdown_profile_lines(contact: Contact) -> Iterator[str]:
+        """Markdown lines for the Identity and Status layers."""
         # Title
-        md_lines.append(f"# {contact.name or '未命名联系人'}")
-        md_lines.append("")
+        yield f"# {contact.name or '未命名联系人'}"
+        yield ""
 
         # Identity Section
-        md_lines.append("## 身份信息 (Identity)")
-        md_lines.append("")
+        yield "## 身份信息 (Identity)"
+        yield ""
 
         if contact.nickname:
-            md_lines.append(f"- **昵称**: {contact.nickname}")
+            yield f"- **昵称**: {contact.nickname}"
         if contact.gender:
-            md_lines.append(f"- **性别**: {contact.gender}")
+            yield f"- **性别**: {contact.gender}"
         if contact.age_group:
-            md_lines.append(f"- **年龄段**: {contact.age_group}")
+            yield f"- **年龄段**: {contact.age_group}"
         if contact.hometown:
-            md_lines.append(f"- **家乡**: {contact.hometown}")
+            yield f"- **家乡**: {contact.hometown}"
         if contact.city:
-            md_lines.append(f"- **常驻城市**: {contact.city}")
+            yield f"- **常驻城市**: {contact.city}"
 
         # Contact info
         contact_methods = []
@@ -206,39 +526,39 @@ class ContactService:
         if contact.linkedin:
             contact_methods.append(f"LinkedIn: {contact.linkedin}")
         if contact_methods:
-            md_lines.append("- **联系方式**")
+            yield "- **联系方式**"
             for cm in contact_methods:
-                md_lines.append(f"  - {cm}")
+                yield f"  - {cm}"
 
         # Education
         if contact.education_school or contact.education_major or contact.education_degree:
-            md_lines.append("- **教育背景**")
+            yield "- **教育背景**"
             if contact.education_school:
-                md_lines.append(f"  - 学校: {contact.education_school}")
+                yield f"  - 学校: {contact.education_school}"
             if contact.education_major:
-                md_lines.append(f"  - 专业: {contact.education_major}")
+                yield f"  - 专业: {contact.education_major}"
             if contact.education_degree:
-                md_lines.append(f"  - 学位: {contact.education_degree}")
+                yield f"  - 学位: {contact.education_degree}"
 
         # Career
         if contact.career_summary:
-            md_lines.append(f"- **职业概述**: {contact.career_summary}")
+            yield f"- **职业概述**: {contact.career_summary}"
 
         # Communication preferences
         if contact.preferred_contact_method or contact.preferred_contact_time or contact.communication_style:
-            md_lines.append("- **沟通偏好**")
+            yield "- **沟通偏好**"
             if contact.preferred_contact_method:
-                md_lines.append(f"  - 偏好方式: {contact.preferred_contact_method}")
+                yield f"  - 偏好方式: {contact.preferred_contact_method}"
             if contact.preferred_contact_time:
-                md_lines.append(f"  - 偏好时间: {contact.preferred_contact_time}")
+                yield f"  - 偏好时间: {contact.preferred_contact_time}"
             if contact.communication_style:
-                md_lines.append(f"  - 沟通风格: {contact.communication_style}")
+                yield f"  - 沟通风格: {contact.communication_style}"
 
-        md_lines.append("")
+        yield ""
 
         # Status Section
-        md_lines.append("## 当前状态 (Status)")
-        md_lines.append("")
+        yield "## 当前状态 (Status)"
+        yield ""
 
         current_status = []
         if contact.current_company:
@@ -248,172 +568,168 @@ class ContactService:
         if contact.current_industry:
             current_status.append(f"行业: {contact.current_industry}")
         if current_status:
-            md_lines.append("### 当前工作")
+            yield "### 当前工作"
             for item in current_status:
-                md_lines.append(f"- {item}")
+                yield f"- {item}"
 
         if contact.focus_topics:
-            md_lines.append("\n### 关注方向")
+            yield "\n### 关注方向"
             for topic in contact.focus_topics:
-                md_lines.append(f"- {topic}")
+                yield f"- {topic}"
 
         if contact.current_projects:
-            md_lines.append("\n### 当前项目")
+            yield "\n### 当前项目"
             for project in contact.current_projects:
-                md_lines.append(f"- {project}")
+                yield f"- {project}"
 
         if contact.short_term_goals or contact.long_term_goals:
-            md_lines.append("\n### 目标")
+            yield "\n### 目标"
             if contact.short_term_goals:
-                md_lines.append("**短期目标**")
+                yield "**短期目标**"
                 for goal in contact.short_term_goals:
-                    md_lines.append(f"- {goal}")
+                    yield f"- {goal}"
             if contact.long_term_goals:
-                md_lines.append("**长期目标**")
+                yield "**长期目标**"
                 for goal in contact.long_term_goals:
-                    md_lines.append(f"- {goal}")
+                    yield f"- {goal}"
 
         if contact.resource_needs or contact.resource_offers:
-            md_lines.append("\n### 资源位")
+            yield "\n### 资源位"
             if contact.resource_needs:
-                md_lines.append("**需要**")
+                yield "**需要**"
                 for need in contact.resource_needs:
-                    md_lines.append(f"- {need}")
+                    yield f"- {need}"
             if contact.resource_offers:
-                md_lines.append("**可提供**")
+                yield "**可提供**"
                 for offer in contact.resource_offers:
-                    md_lines.append(f"- {offer}")
+                    yield f"- {offer}"
 
-        md_lines.append("")
+        yield ""
 
-        # Timeline Section
-        md_lines.append("## 互动历史 (Timeline)")
-        md_lines.append("")
-
-        if meetings:
-            for meeting in meetings:
-                md_lines.append(f"### {meeting.meeting_date.strftime('%Y-%m-%d')}")
-                if meeting.location:
-                    md_lines.append(f"**地点**: {meeting.location}")
-                if meeting.scenario:
-                    md_lines.append(f"**场景**: {meeting.scenario}")
-
-                if meeting.topics:
-                    md_lines.append("\n**讨论主题**:")
-                    for topic in meeting.topics:
-                        md_lines.append(f"- {topic}")
-
-                if meeting.key_facts:
-                    md_lines.append("\n**关键事实**:")
-                    for fact in meeting.key_facts:
-                        if isinstance(fact, dict):
-                            md_lines.append(f"- {fact.get('fact', fact)}")
-                        else:
-                            md_lines.append(f"- {fact}")
-
-                if meeting.sentiment:
-                    md_lines.append(f"\n**情绪**: {meeting.sentiment}")
-
-                if meeting.my_commitments or meeting.their_commitments:
-                    md_lines.append("\n**承诺与待办**:")
-                    if meeting.my_commitments:
-                        md_lines.append("我的承诺:")
-                        for c in meeting.my_commitments:
-                            if isinstance(c, dict):
-                                md_lines.append(f"- {c.get('commitment', c)}")
-                            else:
-                                md_lines.append(f"- {c}")
-                    if meeting.their_commitments:
-                        md_lines.append("对方承诺:")
-                        for c in meeting.their_commitments:
-                            if isinstance(c, dict):
-                                md_lines.append(f"- {c.get('commitment', c)}")
-                            else:
-                                md_lines.append(f"- {c}")
-
-                if meeting.open_loops or meeting.next_conversation_hooks:
-                    md_lines.append("\n**续聊线索**:")
-                    for loop in (meeting.open_loops or []):
-                        md_lines.append(f"- 未完话题: {loop}")
-                    for hook in (meeting.next_conversation_hooks or []):
-                        md_lines.append(f"- 下次可聊: {hook}")
-
-                md_lines.append("")
-        else:
-            md_lines.append("*暂无会谈记录*")
-            md_lines.append("")
+    @staticmethod
+    def _markdown_meeting_lines(meeting: Meeting) -> Iterator[str]:
+        """Markdown lines for a single timeline entry."""
+        yield f"### {meeting.meeting_date.strftime('%Y-%m-%d')}"
+        if meeting.location:
+            yield f"**地点**: {meeting.location}"
+        if meeting.scenario:
+            yield f"**场景**: {meeting.scenario}"
+
+        if meeting.topics:
+            yield "\n**讨论主题**:"
+            for topic in meeting.topics:
+                yield f"- {topic}"
+
+        if meeting.key_facts:
+            yield "\n**关键事实**:"
+            for fact in meeting.key_facts:
+                if isinstance(fact, dict):
+                    yield f"- {fact.get('fact', fact)}"
+                else:
+                    yield f"- {fact}"
+
+        if meeting.sentiment:
+            yield f"\n**情绪**: {meeting.sentiment}"
+
+        if meeting.my_commitments or meeting.their_commitments:
+            yield "\n**承诺与待办**:"
+            if meeting.my_commitments:
+                yield "我的承诺:"
+                for c in meeting.my_commitments:
+                    if isinstance(c, dict):
+                        yield f"- {c.get('commitment', c)}"
+                    else:
+                        yield f"- {c}"
+            if meeting.their_commitments:
+                yield "对方承诺:"
+                for c in meeting.their_commitments:
+                    if isinstance(c, dict):
+                        yield f"- {c.get('commitment', c)}"
+                    else:
+                        yield f"- {c}"
+
+        if meeting.open_loops or meeting.next_conversation_hooks:
+            yield "\n**续聊线索**:"
+            for loop in (meeting.open_loops or []):
+                yield f"- 未完话题: {loop}"
+            for hook in (meeting.next_conversation_hooks or []):
+                yield f"- 下次可聊: {hook}"
+
+        yield ""
 
+    @staticmethod
+    def _markdown_playbook_lines(playbook: Optional[ActionPlaybook]) -> Iterator[str]:
+        """Markdown lines for the Action Playbook layer."""
         # Action Playbook Section
-        md_lines.append("## 行动剧本 (Action Playbook)")
-        md_lines.append("")
+        yield "## 行动剧本 (Action Playbook)"
+        yield ""
 
         if playbook:
             # Gift & Care
             if playbook.preferences or playbook.taboos:
-                md_lines.append("### 送礼与关怀 (Gift & Care)")
+                yield "### 送礼与关怀 (Gift & Care)"
                 if playbook.preferences:
-                    md_lines.append("**偏好**:")
+                    yield "**偏好**:"
                     for pref in playbook.preferences:
-                        md_lines.append(f"- {pref}")
+                        yield f"- {pref}"
                 if playbook.taboos:
-                    md_lines.append("**禁忌**:")
+                    yield "**禁忌**:"
                     for taboo in playbook.taboos:
-                        md_lines.append(f"- {taboo}")
-                md_lines.append("")
+                        yield f"- {taboo}"
+                yield ""
 
             # Conversation Hooks
             if playbook.top_topics or playbook.conversation_questions:
-                md_lines.append("### 续聊钩子 (Conversation Hooks)")
+                yield "### 续聊钩子 (Conversation Hooks)"
                 if playbook.top_topics:
-                    md_lines.append("**最投入话题**:")
+                    yield "**最投入话题**:"
                     for topic in playbook.top_topics:
-                        md_lines.append(f"- {topic}")
+                        yield f"- {topic}"
                 if playbook.conversation_questions:
-                    md_lines.append("**下次可问**:")
+                    yield "**下次可问**:"
                     for q in playbook.conversation_questions:
-                        md_lines.append(f"- {q}")
-                md_lines.append("")
+                        yield f"- {q}"
+                yield ""
 
             # Collaboration Map
             if playbook.how_i_can_help_them or playbook.how_they_can_help_me:
-                md_lines.append("### 合作地图 (Collaboration Map)")
+                yield "### 合作地图 (Collaboration Map)"
                 if playbook.how_i_can_help_them:
-                    md_lines.append("**我如何帮他**:")
+                    yield "**我如何帮他**:"
                     for item in playbook.how_i_can_help_them:
-                        md_lines.append(f"- {item}")
+                        yield f"- {item}"
                 if playbook.how_they_can_help_me:
-                    md_lines.append("**他如何帮我**:")
+                    yield "**他如何帮我**:"
                     for item in playbook.how_they_can_help_me:
-                        md_lines.append(f"- {item}")
-                md_lines.append("")
+                        yield f"- {item}"
+                yield ""
 
             # Relationship Health
-            md_lines.append("### 关系健康 (Relationship Health)")
+            yield "### 关系健康 (Relationship Health)"
             if playbook.relationship_stage:
-                md_lines.append(f"- **关系阶段**: {playbook.relationship_stage}")
+                yield f"- **关系阶段**: {playbook.relationship_stage}"
             if playbook.temperature_score is not None:
-                md_lines.append(f"- **温度分**: {playbook.temperature_score}/100")
+                yield f"- **温度分**: {playbook.temperature_score}/100"
             if playbook.next_action:
                 na = playbook.next_action
                 if isinstance(na, dict):
-                    md_lines.append(f"- **建议动作**: {na.get('action', 'N/A')}")
+                    yield f"- **建议动作**: {na.get('action', 'N/A')}"
                 else:
-                    md_lines.append(f"- **建议动作**: {na}")
-            md_lines.append("")
+                    yield f"- **建议动作**: {na}"
+            yield ""
         else:
-            md_lines.append("*暂无行动建议*")
-            md_lines.append("")
-
-        # Footer
-        md_lines.append("---")
-        md_lines.append(f"*导出时间: {datetime.now().strftime('%Y-%m-%d %H:%M')}*")
-
-        return "\n".join(md_lines)
+            yield "*暂无行动建议*"
+            yield ""
 
 
 class MeetingService:
     """Service for meeting-related operations."""
 
+    @staticmethod
+    def extraction_cost(raw_text: str) -> float:
+        """Fair-queueing cost of extracting a transcript: one unit per ~4000 characters."""
+        return 1.0 + len(raw_text) // 4000
+
     @staticmethod
     async def create_meeting_from_text(
         db: Session,
@@ -430,7 +746,13 @@ class MeetingService:
 
         Returns:
             Created meeting with extracted information
+
+        Raises:
+            AdmissionRejected: Too much LLM work is queued; nothing was written
         """
+        # Fail fast before writing anything when the LLM queue is full
+        llm_admission.check(user_id)
+
         # Find or create contact
         contact = ContactService.find_or_create_contact_by_name(
             db, user_id, meeting_data.contact_name
@@ -443,7 +765,7 @@ class MeetingService:
             db.commit()
             db.refresh(contact)
 
-        # Create meeting with processing status
+        # Create meeting with processing status, leased to this worker
         db_meeting = Meeting(
             user_id=user_id,
             contact_id=contact.id,
@@ -451,126 +773,361 @@ class MeetingService:
             meeting_date=meeting_data.meeting_date or datetime.now(),
             location=meeting_data.location,
             scenario=meeting_data.scenario,
-            status="processing"
+            status="processing",
+            attempts=1,
+            lease_expires_at=MeetingService.lease_deadline()
         )
         db.add(db_meeting)
         db.commit()
         db.refresh(db_meeting)
+        meeting_id = db_meeting.id
+
+        # Process with LLM, in fair order with other users' work and off the event loop
+        try:
+            cost = MeetingService.extraction_cost(meeting_data.raw_text)
+            queued_at = time.monotonic()
+            async with llm_admission.slot(user_id, cost=cost):
+                if not MeetingService._renew_lease_after_wait(
+                    db, meeting_id, 1, time.monotonic() - queued_at
+                ):
+                    db.refresh(db_meeting)
+                    return db_meeting
+                extracted = await asyncio.to_thread(
+                    llm_service.extract_contact_info,
+                    meeting_data.raw_text,
+                    meeting_data.contact_name
+                )
+            if MeetingService.apply_extraction(db, db_meeting, contact, extracted, attempt=1):
+                # Embedding and the index file writes block; keep them off the event loop
+                await asyncio.to_thread(search_service.index_meeting, db_meeting)
+                return db_meeting
+        except Exception as e:
+            MeetingService.record_failure(db, meeting_id, user_id, 1, e)
+
+        db.refresh(db_meeting)
+        return db_meeting
+
+    @staticmethod
+    def lease_deadline() -> datetime:
+        """When a lease taken now expires and the meeting becomes eligible for recovery."""
+        return datetime.now() + timedelta(seconds=settings.meeting_lease_seconds)
+
+    @staticmethod
+    def _update_if_owner(db: Session, meeting_id: int, attempt: int, **values) -> bool:
+        """
+        Update a processing meeting only if its current attempt is still the one
+        this worker holds; recovery increments attempts when it takes over. The
+        caller commits.
+        """
+        result = db.execute(
+            update(Meeting).where(
+                Meeting.id == meeting_id,
+                Meeting.attempts == attempt,
+                Meeting.status == MeetingStatus.PROCESSING
+            ).values(**values).execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    @staticmethod
+    def _renew_lease_after_wait(db: Session, meeting_id: int, attempt: int, waited: float) -> bool:
+        """
+        Renew the lease if a long admission queue wait used up part of it.
+
+        Returns:
+            False if recovery took the meeting over meanwhile
+        """
+        if waited <= settings.meeting_lease_seconds / 10:
+            return True
+        renewed = MeetingService._update_if_owner(
+            db, meeting_id, attempt, lease_expires_at=MeetingService.lease_deadline()
+        )
+        db.commit()
+        return renewed
+
+    @staticmethod
+    def apply_extraction(
+        db: Session,
+        db_meeting: Meeting,
+        contact: Contact,
+        extracted: Dict[str, Any],
+        attempt: int
+    ) -> bool:
+        """
+        Write an LLM extraction to the meeting, its contact and playbook, and
+        complete the meeting. The caller indexes the meeting for search.
+
+        Returns:
+            False if the lease was lost to recovery, in which case nothing is written
+        """
+        # Release the lease first, in the same transaction, so recovery cannot claim it meanwhile
+        if not MeetingService._update_if_owner(db, db_meeting.id, attempt, lease_expires_at=None):
+            db.rollback()
+            return False
+
+        # Update contact with extracted information
+        contact_data = extracted.get("contact", {})
+        before = ContactHistoryService.snapshot(contact)
+        for key, value in contact_data.items():
+            if value is not None and value != "" and value != []:
+                setattr(contact, key, value)
+        ContactHistoryService.record_changes(db, contact, before, "meeting", db_meeting.id)
+
+        # Update meeting with extracted information
+        meeting_extracted = extracted.get("meeting", {})
+        db_meeting.topics = meeting_extracted.get("topics")
+        db_meeting.key_facts = meeting_extracted.get("key_facts")
+        db_meeting.sentiment = meeting_extracted.get("sentiment")
+        db_meeting.my_commitments = meeting_extracted.get("my_commitments")
+        db_meeting.their_commitments = meeting_extracted.get("their_commitments")
+        CommitmentService.sync_meeting(db, db_meeting)
+        TagService.sync_meeting(db, db_meeting)
+        db_meeting.open_loops = meeting_extracted.get("open_loops")
+        db_meeting.next_conversation_hooks = meeting_extracted.get("next_conversation_hooks")
+
+        # Update contact last meeting date
+        contact.last_meeting_date = db_meeting.meeting_date
+        contact.last_verified_at = datetime.now()
+
+        db_meeting.status = "completed"
+        db_meeting.lease_expires_at = None
+        db_meeting.error_message = None
+
+        playbook = MeetingService.merge_action_playbook(
+            db, contact.id, extracted.get("action_playbook", {})
+        )
+
+        # Keep the follow-up priority index and topic tags current
+        FollowUpService.refresh_contact(db, contact, playbook)
+        TagService.sync_contact(db, contact)
+
+        db.commit()
+        db.refresh(db_meeting)
+
+        matchmaking_service.contacts_changed(db_meeting.user_id, [contact])
+        return True
+
+    @staticmethod
+    def record_failure(
+        db: Session,
+        meeting_id: int,
+        user_id: int,
+        attempt: int,
+        error: Exception
+    ) -> None:
+        """
+        Fail the meeting once it is out of attempts; otherwise keep it processing
+        with a lease that expires after an exponential backoff, so recovery retries it.
+        """
+        db.rollback()
+        if attempt >= settings.meeting_max_attempts:
+            values = {"status": MeetingStatus.FAILED, "lease_expires_at": None}
+        else:
+            delay = settings.meeting_retry_delay_seconds * 2 ** (attempt - 1)
+            values = {"lease_expires_at": datetime.now() + timedelta(seconds=delay)}
+        if MeetingService._update_if_owner(
+            db, meeting_id, attempt, error_message=str(error), **values
+        ):
+            # Core UPDATE: cached timelines would keep the old status and error
+            invalidate_on_commit(db, user_id, ("timelines",))
+        db.commit()
 
-        # Process with LLM
+    @staticmethod
+    def process_meeting(
+        db: Session,
+        db_meeting: Meeting,
+        attempt: int,
+        loop: Optional[asyncio.AbstractEventLoop] = None
+    ) -> None:
+        """
+        Run extraction for a meeting claimed by recovery, blocking the calling thread.
+
+        Args:
+            loop: Event loop serving requests in this process. If given, the LLM
+                call waits for an llm_admission slot like request-time
+                extraction; without one (standalone job runs) it is only
+                limited by recovery handling one meeting at a time.
+
+        Raises:
+            AdmissionRejected: The LLM queue is full; the attempt was given back
+        """
+        meeting_id = db_meeting.id
+        user_id = db_meeting.user_id
+        contact = db_meeting.contact
+        known_name = contact.name if contact.name != "未命名联系人" else None
+        queued_at = time.monotonic()
+        slot = llm_admission.blocking_slot(
+            loop, user_id, MeetingService.extraction_cost(db_meeting.raw_text)
+        ) if loop else nullcontext()
         try:
-            extracted = llm_service.extract_contact_info(
-                meeting_data.raw_text,
-                meeting_data.contact_name
+            with slot:
+                if not MeetingService._renew_lease_after_wait(
+                    db, meeting_id, attempt, time.monotonic() - queued_at
+                ):
+                    return
+                extracted = llm_service.extract_contact_info(db_meeting.raw_text, known_name)
+            if MeetingService.apply_extraction(db, db_meeting, contact, extracted, attempt):
+                search_service.index_meeting(db_meeting)
+        except AdmissionRejected:
+            # Not the meeting's fault: undo the claim, a later sweep retries it
+            db.rollback()
+            MeetingService._update_if_owner(
+                db, meeting_id, attempt, attempts=attempt - 1, lease_expires_at=datetime.now()
             )
+            db.commit()
+            raise
+        except Exception as e:
+            MeetingService.record_failure(db, meeting_id, user_id, attempt, e)
 
-            # Update contact with extracted information
-            contact_data = extracted.get("contact", {})
-            for key, value in contact_data.items():
-                if value is not None and value != "" and value != []:
-                    setattr(contact, key, value)
-
-            # Update meeting with extracted information
-            meeting_extracted = extracted.get("meeting", {})
-            db_meeting.topics = meeting_extracted.get("topics")
-            db_meeting.key_facts = meeting_extracted.get("key_facts")
-            db_meeting.sentiment = meeting_extracted.get("sentiment")
-            db_meeting.my_commitments = meeting_extracted.get("my_commitments")
-            db_meeting.their_commitments = meeting_extracted.get("their_commitments")
-            db_meeting.open_loops = meeting_extracted.get("open_loops")
-            db_meeting.next_conversation_hooks = meeting_extracted.get("next_conversation_hooks")
-
-            # Update contact last meeting date
-            contact.last_meeting_date = db_meeting.meeting_date
-            contact.last_verified_at = datetime.now()
-
-            db_meeting.status = "completed"
-
-            # Get or create action playbook
-            playbook_data = extracted.get("action_playbook", {})
-            playbook = db.query(ActionPlaybook).filter(
-                ActionPlaybook.contact_id == contact.id
-            ).first()
+    @staticmethod
+    def recover_expired(
+        db: Session,
+        limit: int = 20,
+        loop: Optional[asyncio.AbstractEventLoop] = None
+    ) -> Dict[str, int]:
+        """
+        Re-run meetings whose processing lease expired (their worker died or
+        their retry backoff elapsed) and fail those that are out of attempts.
 
-            if playbook:
-                # Update existing playbook
-                for section in ["preferences", "taboos", "gift_occasions", "gift_recommendations"]:
-                    if section in playbook_data.get("gift_care", {}):
-                        current = getattr(playbook, section, None) or []
-                        new_val = playbook_data["gift_care"][section]
-                        if isinstance(new_val, list):
-                            merged = list(set((current or []) + new_val))
-                            setattr(playbook, section, merged)
-
-                if "conversation_hooks" in playbook_data:
-                    ch = playbook_data["conversation_hooks"]
-                    if ch.get("top_topics"):
-                        current = playbook.top_topics or []
-                        merged = list(set(current + ch["top_topics"]))
-                        playbook.top_topics = merged
-                    if ch.get("conversation_questions"):
-                        current = playbook.conversation_questions or []
-                        merged = list(set(current + ch["conversation_questions"]))
-                        playbook.conversation_questions = merged
-
-                if "collaboration_map" in playbook_data:
-                    cm = playbook_data["collaboration_map"]
-                    if cm.get("how_i_can_help_them"):
-                        current = playbook.how_i_can_help_them or []
-                        merged = list(set(current + cm["how_i_can_help_them"]))
-                        playbook.how_i_can_help_them = merged
-                    if cm.get("how_they_can_help_me"):
-                        current = playbook.how_they_can_help_me or []
-                        merged = list(set(current + cm["how_they_can_help_me"]))
-                        playbook.how_they_can_help_me = merged
-
-                if "relationship_health" in playbook_data:
-                    rh = playbook_data["relationship_health"]
-                    if rh.get("relationship_stage"):
-                        playbook.relationship_stage = rh["relationship_stage"]
-                    if rh.get("temperature_score") is not None:
-                        playbook.temperature_score = rh["temperature_score"]
-                    if rh.get("next_action"):
-                        playbook.next_action = rh["next_action"]
-            else:
-                # Create new playbook
-                playbook = ActionPlaybook(contact_id=contact.id)
-                gc = playbook_data.get("gift_care", {})
-                playbook.preferences = gc.get("preferences")
-                playbook.taboos = gc.get("taboos")
-                playbook.gift_occasions = gc.get("gift_occasions")
-                playbook.gift_recommendations = gc.get("gift_recommendations")
-
-                ch = playbook_data.get("conversation_hooks", {})
-                playbook.top_topics = ch.get("top_topics")
-                playbook.open_loops = ch.get("open_loops")
-                playbook.conversation_questions = ch.get("conversation_questions")
-                playbook.conversation_avoid = ch.get("conversation_avoid")
-
-                cm = playbook_data.get("collaboration_map", {})
-                playbook.how_i_can_help_them = cm.get("how_i_can_help_them")
-                playbook.how_they_can_help_me = cm.get("how_they_can_help_me")
-                playbook.exchange_boundaries = cm.get("exchange_boundaries")
-                playbook.contact_rhythm = cm.get("contact_rhythm")
-
-                rh = playbook_data.get("relationship_health", {})
-                playbook.relationship_stage = rh.get("relationship_stage")
-                playbook.temperature_score = rh.get("temperature_score")
-                playbook.recent_risks = rh.get("recent_risks")
-                playbook.next_action = rh.get("next_action")
-
-                db.add(playbook)
+        Each meeting is claimed by incrementing its attempt counter with a
+        conditional UPDATE, so concurrent sweepers on other workers never
+        process the same attempt twice. Meetings are processed one at a time,
+        through llm_admission when loop is given (see process_meeting); the
+        sweep stops early when the LLM queue is full.
 
+        Returns:
+            {"recovered": n, "failed": n}
+        """
+        now = datetime.now()
+        expired = and_(
+            Meeting.status == MeetingStatus.PROCESSING,
+            Meeting.lease_expires_at < now
+        )
+        out_of_attempts = db.query(Meeting.id, Meeting.user_id).filter(
+            expired, Meeting.attempts >= settings.meeting_max_attempts
+        ).all()
+        failed = 0
+        if out_of_attempts:
+            failed = db.execute(
+                update(Meeting).where(
+                    Meeting.id.in_([meeting_id for meeting_id, _ in out_of_attempts]),
+                    expired,
+                    Meeting.attempts >= settings.meeting_max_attempts
+                ).values(
+                    status=MeetingStatus.FAILED,
+                    lease_expires_at=None,
+                    error_message=func.coalesce(Meeting.error_message, "Processing did not finish")
+                ).execution_options(synchronize_session=False)
+            ).rowcount
+            for user_id in {user_id for _, user_id in out_of_attempts}:
+                invalidate_on_commit(db, user_id, ("timelines",))
             db.commit()
-            db.refresh(db_meeting)
 
-        except Exception as e:
-            db_meeting.status = "failed"
-            db_meeting.error_message = str(e)
+        candidates = db.query(Meeting.id, Meeting.attempts).filter(expired) \
+                       .order_by(Meeting.lease_expires_at).limit(limit).all()
+        recovered = 0
+        for meeting_id, attempts in candidates:
+            claimed = db.execute(
+                update(Meeting).where(
+                    Meeting.id == meeting_id, Meeting.attempts == attempts, expired
+                ).values(
+                    attempts=attempts + 1, lease_expires_at=MeetingService.lease_deadline()
+                ).execution_options(synchronize_session=False)
+            ).rowcount
             db.commit()
-            db.refresh(db_meeting)
+            if not claimed:
+                continue
+            try:
+                MeetingService.process_meeting(db, db.get(Meeting, meeting_id), attempts + 1, loop)
+            except AdmissionRejected:
+                break
+            recovered += 1
 
-        return db_meeting
+        return {"recovered": recovered, "failed": failed}
+
+    @staticmethod
+    def merge_action_playbook(
+        db: Session,
+        contact_id: int,
+        playbook_data: Dict[str, Any]
+    ) -> ActionPlaybook:
+        """
+        Merge an extracted action playbook into the contact's playbook, creating
+        it if missing. List sections are unioned; the caller commits.
+        """
+        playbook = db.query(ActionPlaybook).filter(
+            ActionPlaybook.contact_id == contact_id
+        ).first()
+
+        if playbook:
+            # Update existing playbook
+            for section in ["preferences", "taboos", "gift_occasions", "gift_recommendations"]:
+                if section in playbook_data.get("gift_care", {}):
+                    current = getattr(playbook, section, None) or []
+                    new_val = playbook_data["gift_care"][section]
+                    if isinstance(new_val, list):
+                        merged = list(set((current or []) + new_val))
+                        setattr(playbook, section, merged)
+
+            if "conversation_hooks" in playbook_data:
+                ch = playbook_data["conversation_hooks"]
+                if ch.get("top_topics"):
+                    current = playbook.top_topics or []
+                    merged = list(set(current + ch["top_topics"]))
+                    playbook.top_topics = merged
+                if ch.get("conversation_questions"):
+                    current = playbook.conversation_questions or []
+                    merged = list(set(current + ch["conversation_questions"]))
+                    playbook.conversation_questions = merged
+
+            if "collaboration_map" in playbook_data:
+                cm = playbook_data["collaboration_map"]
+                if cm.get("how_i_can_help_them"):
+                    current = playbook.how_i_can_help_them or []
+                    merged = list(set(current + cm["how_i_can_help_them"]))
+                    playbook.how_i_can_help_them = merged
+                if cm.get("how_they_can_help_me"):
+                    current = playbook.how_they_can_help_me or []
+                    merged = list(set(current + cm["how_they_can_help_me"]))
+                    playbook.how_they_can_help_me = merged
+
+            if "relationship_health" in playbook_data:
+                rh = playbook_data["relationship_health"]
+                if rh.get("relationship_stage"):
+                    playbook.relationship_stage = rh["relationship_stage"]
+                if rh.get("temperature_score") is not None:
+                    playbook.temperature_score = rh["temperature_score"]
+                if rh.get("next_action"):
+                    playbook.next_action = rh["next_action"]
+        else:
+            # Create new playbook
+            playbook = ActionPlaybook(contact_id=contact_id)
+            gc = playbook_data.get("gift_care", {})
+            playbook.preferences = gc.get("preferences")
+            playbook.taboos = gc.get("taboos")
+            playbook.gift_occasions = gc.get("gift_occasions")
+            playbook.gift_recommendations = gc.get("gift_recommendations")
+
+            ch = playbook_data.get("conversation_hooks", {})
+            playbook.top_topics = ch.get("top_topics")
+            playbook.open_loops = ch.get("open_loops")
+            playbook.conversation_questions = ch.get("conversation_questions")
+            playbook.conversation_avoid = ch.get("conversation_avoid")
+
+            cm = playbook_data.get("collaboration_map", {})
+            playbook.how_i_can_help_them = cm.get("how_i_can_help_them")
+            playbook.how_they_can_help_me = cm.get("how_they_can_help_me")
+            playbook.exchange_boundaries = cm.get("exchange_boundaries")
+            playbook.contact_rhythm = cm.get("contact_rhythm")
+
+            rh = playbook_data.get("relationship_health", {})
+            playbook.relationship_stage = rh.get("relationship_stage")
+            playbook.temperature_score = rh.get("temperature_score")
+            playbook.recent_risks = rh.get("recent_risks")
+            playbook.next_action = rh.get("next_action")
+
+            db.add(playbook)
+
+        return playbook
 
     @staticmethod
     def get_meeting(db: Session, meeting_id: int, user_id: int) -> Optional[Meeting]:
@@ -586,18 +1143,32 @@ class MeetingService:
         user_id: int,
         contact_id: Optional[int] = None,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        fields: Optional[List[str]] = None,
+        topic: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
     ) -> tuple[List[Meeting], int]:
         """
-        List meetings for a user with optional contact filter.
+        List meetings for a user with optional contact, topic and date filters.
+
+        Args:
+            fields: Columns to select; rows are returned instead of ORM objects if given
+            topic: Only meetings about this topic, served by meeting_tags
 
         Returns:
             Tuple of (meetings list, total count)
         """
-        query = db.query(Meeting).filter(Meeting.user_id == user_id)
+        query = ContactService._query(db, Meeting, fields).filter(Meeting.user_id == user_id)
 
         if contact_id:
             query = query.filter(Meeting.contact_id == contact_id)
+        if topic:
+            query = query.filter(TagService.meeting_filter(user_id, topic))
+        if date_from:
+            query = query.filter(Meeting.meeting_date >= date_from)
+        if date_to:
+            query = query.filter(Meeting.meeting_date <= date_to)
 
         total = query.count()
         meetings = query.order_by(Meeting.meeting_date.desc()) \
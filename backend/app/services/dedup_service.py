@@ -0,0 +1,352 @@
+"""
+Dedup service: duplicate-contact detection and merging.
+"""
+import re
+from difflib import SequenceMatcher
+from functools import lru_cache
+from itertools import combinations
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from app.models.models import ActionPlaybook, Commitment, Contact, Meeting
+from app.services.follow_up_service import FollowUpService
+from app.services.history_service import ContactHistoryService
+from app.services.matchmaking_service import matchmaking_service
+from app.services.tag_service import TagService
+
+
+@lru_cache(maxsize=None)
+def _lazy_pinyin():
+    """pypinyin.lazy_pinyin, imported on first use since its dictionaries are slow to load."""
+    try:
+        from pypinyin import lazy_pinyin
+    except ImportError:  # Optional dependency; pinyin blocking is skipped without it
+        return None
+    return lazy_pinyin
+
+
+# Honorifics and kinship terms that are not part of the name ("张总", "李老师", "Mr. Wang")
+_HONORIFIC_SUFFIXES = re.compile(
+    r"(总经理|总监|总|董事长|董|老师|教授|博士|医生|律师|先生|女士|小姐|经理|老板|哥|姐|兄)$"
+)
+_HONORIFIC_PREFIXES = re.compile(r"^(小|老|阿)(?=[一-鿿])")
+_LATIN_TITLES = re.compile(r"\b(mr|mrs|ms|miss|dr|prof)\b\.?")
+_NON_NAME = re.compile(r"[^0-9a-z一-鿿]+")
+
+# Fields copied from a duplicate when the primary contact has no value
+_MERGE_SCALAR_FIELDS = [
+    "nickname", "gender", "age_group", "hometown", "city", "phone", "email", "wechat",
+    "linkedin", "education_school", "education_major", "education_degree", "career_summary",
+    "preferred_contact_method", "preferred_contact_time", "communication_style",
+    "current_company", "current_position", "current_industry", "current_location",
+    "startup_status", "relationship_stage", "last_verified_at",
+]
+_MERGE_LIST_FIELDS = [
+    "focus_topics", "current_projects", "short_term_goals", "long_term_goals",
+    "resource_needs", "resource_offers", "excitement_points", "anxiety_points",
+    "sensitive_points",
+]
+_PLAYBOOK_LIST_FIELDS = [
+    "preferences", "taboos", "gift_occasions", "top_topics", "open_loops",
+    "conversation_questions", "conversation_avoid", "how_i_can_help_them",
+    "how_they_can_help_me", "exchange_boundaries", "recent_risks",
+]
+_PLAYBOOK_VALUE_FIELDS = [
+    "gift_recommendations", "contact_rhythm", "relationship_stage", "temperature_score",
+    "next_action", "evidence_refs",
+]
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """Lowercase a name and strip titles, honorifics and punctuation."""
+    if not name:
+        return ""
+    name = _LATIN_TITLES.sub(" ", name.strip().lower())
+    name = _HONORIFIC_PREFIXES.sub("", _HONORIFIC_SUFFIXES.sub("", name))
+    return _NON_NAME.sub("", name)
+
+
+def name_romanizations(name: Optional[str]) -> Set[str]:
+    """
+    Romanized forms of a name, so "张伟", "Zhang Wei" and "Wei Zhang" share a key.
+    Chinese characters need the optional pypinyin dependency.
+    """
+    if not name:
+        return set()
+    name = _LATIN_TITLES.sub(" ", name.strip().lower())
+    if re.search(r"[一-鿿]", name):
+        lazy_pinyin = _lazy_pinyin()
+        if lazy_pinyin is None:
+            return set()
+        parts = [p for p in lazy_pinyin(normalize_name(name)) if p.isalpha()]
+    else:
+        parts = _NON_NAME.sub(" ", name).split()
+    if not parts:
+        return set()
+    # Chinese order (surname first) and western order (surname last)
+    forms = {"".join(parts)}
+    if len(parts) > 1:
+        forms.add("".join(parts[1:] + parts[:1]))
+    return forms
+
+
+def normalize_phone(phone: Optional[str]) -> str:
+    """Digits only, without a +86 / 0086 country prefix."""
+    digits = re.sub(r"\D", "", phone or "")
+    for prefix in ("0086", "86"):
+        if digits.startswith(prefix) and len(digits) - len(prefix) == 11:
+            digits = digits[len(prefix):]
+    return digits if len(digits) >= 6 else ""
+
+
+def _normalize_handle(value: Optional[str]) -> str:
+    return (value or "").strip().lower()
+
+
+class _Profile:
+    """Normalized identity of one contact used for blocking and scoring."""
+
+    __slots__ = ("id", "name", "romanized", "phone", "email", "wechat", "company", "city")
+
+    def __init__(self, row):
+        self.id = row.id
+        self.name = normalize_name(row.name)
+        self.romanized = name_romanizations(row.name)
+        self.phone = normalize_phone(row.phone)
+        self.email = _normalize_handle(row.email)
+        self.wechat = _normalize_handle(row.wechat)
+        self.company = normalize_name(row.current_company)
+        self.city = _normalize_handle(row.city)
+
+    def blocking_keys(self) -> Iterable[tuple[str, str]]:
+        if self.phone:
+            yield "phone", self.phone
+        if self.email:
+            yield "email", self.email
+        if self.wechat:
+            yield "wechat", self.wechat
+        if self.name:
+            yield "name", self.name
+            if self.company:
+                # "张总" and "张伟" at the same company
+                yield "surname_company", self.name[0] + "|" + self.company
+        for form in self.romanized:
+            yield "pinyin", form
+
+
+class DedupService:
+    """
+    Finds likely duplicate contacts and merges them.
+
+    Detection avoids comparing every pair: contacts are grouped into blocks by
+    shared keys (phone, email, WeChat, normalized name, pinyin, surname plus
+    company), and only pairs inside a block are scored. Blocks on weak keys
+    larger than max_block_size are skipped as uninformative.
+    """
+
+    max_block_size = 50
+    strong_keys = {"phone", "email", "wechat"}
+
+    @staticmethod
+    def _name_similarity(a: _Profile, b: _Profile) -> float:
+        if a.name and a.name == b.name:
+            return 1.0
+        if a.romanized & b.romanized:
+            return 1.0
+        if not a.name or not b.name:
+            return 0.0
+        ratio = SequenceMatcher(None, a.name, b.name).ratio()
+        # A bare surname with honorific ("张总" -> "张") matching a full name's surname
+        if min(len(a.name), len(b.name)) == 1 and a.name[0] == b.name[0]:
+            ratio = max(ratio, 0.5)
+        return ratio
+
+    @staticmethod
+    def score_pair(a: _Profile, b: _Profile) -> tuple[float, List[str]]:
+        """Similarity of two contacts in [0, 1], with the reasons behind it."""
+        score = 0.0
+        reasons: List[str] = []
+        for key in ("phone", "email", "wechat"):
+            value_a, value_b = getattr(a, key), getattr(b, key)
+            if value_a and value_b:
+                if value_a == value_b:
+                    score += 0.6
+                    reasons.append(f"same {key}")
+                else:
+                    score -= 0.3
+                    reasons.append(f"different {key}")
+
+        name_score = DedupService._name_similarity(a, b)
+        score += 0.5 * name_score
+        if name_score >= 0.8:
+            reasons.append("similar name")
+
+        if a.company and a.company == b.company:
+            score += 0.25
+            reasons.append("same company")
+        if a.city and a.city == b.city:
+            score += 0.05
+        return max(0.0, min(1.0, score)), reasons
+
+    @staticmethod
+    def find_duplicates(
+        db: Session,
+        user_id: int,
+        threshold: float = 0.5,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Candidate duplicate pairs of a user's contacts, most similar first.
+
+        Returns:
+            Dicts with contact_ids (pair), score and reasons
+        """
+        rows = db.query(
+            Contact.id, Contact.name, Contact.phone, Contact.email, Contact.wechat,
+            Contact.current_company, Contact.city
+        ).filter(Contact.user_id == user_id).all()
+        profiles = {row.id: _Profile(row) for row in rows}
+
+        blocks: Dict[tuple[str, str], List[int]] = {}
+        for profile in profiles.values():
+            for key in profile.blocking_keys():
+                blocks.setdefault(key, []).append(profile.id)
+
+        candidates: Set[tuple[int, int]] = set()
+        for (kind, _), ids in blocks.items():
+            if len(ids) < 2:
+                continue
+            if len(ids) > DedupService.max_block_size and kind not in DedupService.strong_keys:
+                continue
+            candidates.update(combinations(sorted(ids), 2))
+
+        results = []
+        for a_id, b_id in candidates:
+            score, reasons = DedupService.score_pair(profiles[a_id], profiles[b_id])
+            if score >= threshold:
+                results.append(
+                    {"contact_ids": [a_id, b_id], "score": round(score, 3), "reasons": reasons}
+                )
+
+        results.sort(key=lambda r: (-r["score"], r["contact_ids"]))
+        return results[:limit]
+
+    @staticmethod
+    def _merge_playbooks(db: Session, primary: ActionPlaybook, duplicate: ActionPlaybook) -> None:
+        for field in _PLAYBOOK_LIST_FIELDS:
+            merged = _union(getattr(primary, field), getattr(duplicate, field))
+            if merged is not None:
+                setattr(primary, field, merged)
+        for field in _PLAYBOOK_VALUE_FIELDS:
+            if getattr(primary, field) in (None, "", [], {}):
+                setattr(primary, field, getattr(duplicate, field))
+        db.delete(duplicate)
+
+    @staticmethod
+    def merge(
+        db: Session,
+        user_id: int,
+        primary_id: int,
+        duplicate_ids: List[int]
+    ) -> Optional[Contact]:
+        """
+        Merge duplicate contacts into a primary contact in a single transaction.
+
+        Meetings and commitments are re-pointed to the primary, empty profile
+        fields are filled from the duplicates, list fields are unioned, the
+        playbooks are merged and the duplicates are deleted.
+
+        Returns:
+            The merged primary contact, or None if any contact is not found
+        """
+        duplicate_ids = [cid for cid in dict.fromkeys(duplicate_ids) if cid != primary_id]
+        contacts = {
+            c.id: c for c in db.query(Contact).filter(
+                Contact.id.in_([primary_id, *duplicate_ids]),
+                Contact.user_id == user_id
+            ).all()
+        }
+        if primary_id not in contacts or any(cid not in contacts for cid in duplicate_ids):
+            return None
+        primary = contacts[primary_id]
+        if not duplicate_ids:
+            return primary
+
+        try:
+            before = ContactHistoryService.snapshot(primary)
+            # Oldest duplicate first, so the earliest known values win
+            for duplicate in sorted((contacts[cid] for cid in duplicate_ids), key=lambda c: c.id):
+                for field in _MERGE_SCALAR_FIELDS:
+                    if getattr(primary, field) in (None, ""):
+                        setattr(primary, field, getattr(duplicate, field))
+                for field in _MERGE_LIST_FIELDS:
+                    merged = _union(getattr(primary, field), getattr(duplicate, field))
+                    if merged is not None:
+                        setattr(primary, field, merged)
+                if not primary.nickname and duplicate.name and duplicate.name != primary.name:
+                    primary.nickname = duplicate.name
+
+            db.execute(
+                update(Meeting).where(Meeting.contact_id.in_(duplicate_ids))
+                .values(contact_id=primary_id),
+                execution_options={"synchronize_session": False}
+            )
+            db.execute(
+                update(Commitment).where(Commitment.contact_id.in_(duplicate_ids))
+                .values(contact_id=primary_id),
+                execution_options={"synchronize_session": False}
+            )
+
+            playbooks = db.query(ActionPlaybook).filter(
+                ActionPlaybook.contact_id.in_([primary_id, *duplicate_ids])
+            ).order_by(ActionPlaybook.id).all()
+            primary_playbook = next((p for p in playbooks if p.contact_id == primary_id), None)
+            for playbook in playbooks:
+                if playbook.contact_id == primary_id:
+                    continue
+                if primary_playbook is None:
+                    primary_playbook = playbook
+                    playbook.contact_id = primary_id
+                else:
+                    DedupService._merge_playbooks(db, primary_playbook, playbook)
+
+            # Re-pointed rows must not be cascaded away with the duplicates
+            db.flush()
+            db.expire_all()
+            ContactHistoryService.delete_for_contacts(db, duplicate_ids)
+            for cid in duplicate_ids:
+                db.delete(db.get(Contact, cid))
+
+            primary = db.get(Contact, primary_id)
+            ContactHistoryService.record_changes(db, primary, before, "merge")
+            primary.last_meeting_date = db.query(func.max(Meeting.meeting_date)).filter(
+                Meeting.contact_id == primary_id,
+                Meeting.status == "completed"
+            ).scalar()
+            FollowUpService.refresh_contact(db, primary, primary_playbook)
+            TagService.sync_contact(db, primary)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        db.refresh(primary)
+        matchmaking_service.contacts_removed(user_id, duplicate_ids)
+        matchmaking_service.contacts_changed(user_id, [primary])
+        return primary
+
+
+def _union(primary: Any, duplicate: Any) -> Optional[list]:
+    """Order-preserving union of two JSON lists; None if neither is a list."""
+    if not isinstance(primary, list) and not isinstance(duplicate, list):
+        return None
+    merged = list(primary) if isinstance(primary, list) else []
+    for item in duplicate if isinstance(duplicate, list) else []:
+        if item not in merged:
+            merged.append(item)
+    return merged
+
+
+dedup_service = DedupService()
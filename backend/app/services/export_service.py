@@ -0,0 +1,272 @@
+"""
+Export service for streaming whole-network exports.
+"""
+import enum
+import json
+import re
+import zipfile
+from datetime import datetime, timedelta
+from itertools import groupby
+from operator import attrgetter
+from typing import Any, Dict, Iterator, Optional
+
+from sqlalchemy import JSON, DateTime, Float, Integer, Table, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import ActionPlaybook, Contact, Meeting
+from app.services.contact_service import ContactService
+
+# Entities available to bulk export, in the order they are written
+BULK_EXPORT_ENTITIES: Dict[str, Table] = {
+    "contacts": Contact.__table__,
+    "meetings": Meeting.__table__,
+    "playbooks": ActionPlaybook.__table__,
+}
+
+BULK_EXPORT_FORMATS = ("jsonl", "arrow")
+
+
+class _StreamBuffer:
+    """
+    Write-only, non-seekable sink for zipfile and Arrow writers.
+
+    zipfile falls back to data descriptors when the target cannot seek, so the
+    archive can be produced front to back and drained chunk by chunk.
+    """
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def safe_filename(name: str) -> str:
+    """Strip characters that are unsafe in file names and archive paths."""
+    return re.sub(r'[\\/:*?"<>|\r\n\t]+', "_", name).strip(" .") or "contact"
+
+
+def contact_markdown_filename(name: str, contact_id: int) -> str:
+    """File name used for a single contact's markdown export."""
+    return f"{safe_filename(name or 'contact')}_{contact_id}.md"
+
+
+class ExportService:
+    """Service for exports that span a user's whole network."""
+
+    @staticmethod
+    def iter_markdown_zip(db: Session, user_id: int) -> Iterator[bytes]:
+        """
+        Stream every contact of a user as a zip of markdown files.
+
+        Contacts are fetched in batches; the playbooks and completed meetings of
+        each contact batch are read by a few queries for the whole batch, not per
+        contact. Each archive member is compressed as it is rendered, so memory
+        stays bounded by one batch.
+        """
+        batch_size = settings.export_batch_size
+        sink = _StreamBuffer()
+
+        with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for contacts in ContactService.iter_contacts(db, user_id, batch_size):
+                contact_ids = [c.id for c in contacts]
+                playbooks = ContactService.get_action_playbooks(db, contact_ids)
+                # Meetings come ordered by contact ID, like the contacts
+                timelines = groupby(
+                    ContactService.iter_completed_meetings_of(db, contact_ids, batch_size),
+                    key=attrgetter("contact_id")
+                )
+                timeline = next(timelines, None)
+                for contact in contacts:
+                    meetings = ()
+                    if timeline and timeline[0] == contact.id:
+                        meetings = timeline[1]
+                        timeline = None
+                    filename = contact_markdown_filename(contact.name, contact.id)
+                    with archive.open(filename, mode="w") as member:
+                        for chunk in ContactService.iter_contact_markdown(
+                            db, contact, playbooks.get(contact.id), batch_size, meetings
+                        ):
+                            member.write(chunk.encode("utf-8"))
+                            data = sink.drain()
+                            if data:
+                                yield data
+                    data = sink.drain()
+                    if data:
+                        yield data
+                    if timeline is None:
+                        timeline = next(timelines, None)
+
+        # Central directory is written when the archive closes
+        data = sink.drain()
+        if data:
+            yield data
+
+    @staticmethod
+    def watermark(db: Session) -> datetime:
+        """
+        Watermark for the next incremental bulk export.
+
+        Read from the database clock, which also stamps created_at/updated_at,
+        in the session's transaction before any rows are exported. It is moved
+        back by export_watermark_overlap_seconds to cover rows written by
+        transactions that were still open, so consecutive exports overlap.
+        """
+        now = db.execute(select(func.current_timestamp())).scalar_one()
+        return now - timedelta(seconds=settings.export_watermark_overlap_seconds)
+
+    @staticmethod
+    def _bulk_query(table: Table, user_id: int, since: Optional[datetime]):
+        """Select rows of one entity owned by a user, optionally modified since a watermark."""
+        query = select(table)
+        if table is ActionPlaybook.__table__:
+            # Playbooks are owned through their contact
+            contacts = Contact.__table__
+            query = query.join(contacts, table.c.contact_id == contacts.c.id) \
+                         .where(contacts.c.user_id == user_id)
+            modified_at = func.coalesce(table.c.last_updated_at, table.c.created_at)
+        else:
+            query = query.where(table.c.user_id == user_id)
+            modified_at = func.coalesce(table.c.updated_at, table.c.created_at)
+
+        if since:
+            query = query.where(modified_at >= since)
+
+        return query.order_by(table.c.id).execution_options(
+            stream_results=True,
+            yield_per=settings.export_batch_size
+        )
+
+    @staticmethod
+    def _iter_rows(
+        db: Session,
+        entity: str,
+        user_id: int,
+        since: Optional[datetime]
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream rows of an entity through a server-side cursor, one batch in memory."""
+        table = BULK_EXPORT_ENTITIES[entity]
+        result = db.execute(ExportService._bulk_query(table, user_id, since))
+        for row in result.mappings():
+            yield dict(row)
+
+    @staticmethod
+    def _jsonable(value: Any) -> Any:
+        """Convert a column value to a JSON-compatible value."""
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, enum.Enum):
+            return value.value
+        return value
+
+    @staticmethod
+    def iter_jsonl(
+        db: Session,
+        user_id: int,
+        entities: list[str],
+        since: Optional[datetime] = None
+    ) -> Iterator[str]:
+        """
+        Stream a user's data as JSON Lines.
+
+        Each line is {"type": <entity>, "data": {<column>: <value>}}. Rows are
+        buffered into chunks of export_batch_size lines before being yielded.
+        """
+        for entity in entities:
+            lines = []
+            for row in ExportService._iter_rows(db, entity, user_id, since):
+                record = {k: ExportService._jsonable(v) for k, v in row.items()}
+                lines.append(json.dumps({"type": entity, "data": record}, ensure_ascii=False))
+                if len(lines) >= settings.export_batch_size:
+                    yield "\n".join(lines) + "\n"
+                    lines = []
+            if lines:
+                yield "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _arrow_schema(table: Table):
+        """Map an entity table to an Arrow schema. JSON columns are kept as JSON text."""
+        import pyarrow as pa
+
+        fields = []
+        for column in table.columns:
+            if isinstance(column.type, Integer):
+                arrow_type = pa.int64()
+            elif isinstance(column.type, Float):
+                arrow_type = pa.float64()
+            elif isinstance(column.type, DateTime):
+                arrow_type = pa.timestamp("us")
+            else:
+                arrow_type = pa.string()
+            fields.append(pa.field(column.name, arrow_type))
+        return pa.schema(fields)
+
+    @staticmethod
+    def _arrow_value(column, value: Any) -> Any:
+        """Convert a column value for an Arrow column built by _arrow_schema."""
+        if value is None:
+            return None
+        if isinstance(column.type, JSON):
+            return json.dumps(value, ensure_ascii=False)
+        if isinstance(value, enum.Enum):
+            return value.value
+        return value
+
+    @staticmethod
+    def iter_arrow(
+        db: Session,
+        user_id: int,
+        entity: str,
+        since: Optional[datetime] = None
+    ) -> Iterator[bytes]:
+        """
+        Stream one entity as an Arrow IPC stream, one record batch per fetched batch.
+
+        Requires the optional pyarrow dependency.
+        """
+        import pyarrow as pa
+
+        table = BULK_EXPORT_ENTITIES[entity]
+        schema = ExportService._arrow_schema(table)
+        columns = list(table.columns)
+        sink = _StreamBuffer()
+
+        def to_batch(rows: list[Dict[str, Any]]):
+            arrays = [
+                pa.array([ExportService._arrow_value(c, row[c.name]) for row in rows], type=f.type)
+                for c, f in zip(columns, schema, strict=True)
+            ]
+            return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+        with pa.ipc.new_stream(pa.PythonFile(sink, mode="w"), schema) as writer:
+            rows = []
+            for row in ExportService._iter_rows(db, entity, user_id, since):
+                rows.append(row)
+                if len(rows) >= settings.export_batch_size:
+                    writer.write_batch(to_batch(rows))
+                    rows = []
+                    yield sink.drain()
+            if rows:
+                writer.write_batch(to_batch(rows))
+
+        # End-of-stream marker is written when the writer closes
+        data = sink.drain()
+        if data:
+            yield data
+
+
+export_service = ExportService()
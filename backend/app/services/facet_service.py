@@ -0,0 +1,112 @@
+"""
+Facet service: facet counts for the contact list, cached per user.
+"""
+import json
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import Contact
+from app.services.cache_invalidation import contact_cache
+
+# Temperature buckets as (label, lower bound inclusive, upper bound exclusive)
+TEMPERATURE_BUCKETS = [
+    ("0-20", 0, 20), ("20-40", 20, 40), ("40-60", 40, 60), ("60-80", 60, 80), ("80-100", 80, 101),
+]
+
+FACET_VALUE_LIMIT = 50
+
+
+class FacetService:
+    """
+    Computes facet counts (city, industry, relationship stage, temperature range)
+    for the contacts matching the current list filters.
+
+    All facets come from a single GROUP BY over the facet columns; the grouped
+    combinations are then folded into per-facet counts. Results are cached per
+    user and filter set in the "contacts" cache namespace, which is invalidated
+    whenever that user's contacts are written (ORM flushes are tracked
+    automatically; bulk UPDATEs call invalidate_on_commit or invalidate_user_caches).
+    """
+
+    @staticmethod
+    def _temperature_bucket():
+        return case(
+            *[
+                ((Contact.temperature_score >= low) & (Contact.temperature_score < high), label)
+                for label, low, high in TEMPERATURE_BUCKETS
+            ],
+            else_=None
+        )
+
+    @staticmethod
+    def _fold(rows) -> Dict[str, Any]:
+        facets: Dict[str, Dict[Any, int]] = {
+            "city": {}, "industry": {}, "relationship_stage": {}, "temperature": {}
+        }
+        total = 0
+        for city, industry, stage, bucket, count in rows:
+            total += count
+            for name, value in (
+                ("city", city), ("industry", industry),
+                ("relationship_stage", stage), ("temperature", bucket)
+            ):
+                if value is not None and value != "":
+                    facets[name][value] = facets[name].get(value, 0) + count
+
+        def ranked(counts: Dict[Any, int]) -> List[Dict[str, Any]]:
+            items = sorted(counts.items(), key=lambda item: (-item[1], str(item[0])))
+            return [{"value": value, "count": count} for value, count in items[:FACET_VALUE_LIMIT]]
+
+        order = [label for label, _, _ in TEMPERATURE_BUCKETS]
+        return {
+            "total": total,
+            "facets": {
+                "city": ranked(facets["city"]),
+                "industry": ranked(facets["industry"]),
+                "relationship_stage": ranked(facets["relationship_stage"]),
+                "temperature": [
+                    {"value": label, "count": facets["temperature"][label]}
+                    for label in order if label in facets["temperature"]
+                ],
+            },
+        }
+
+    @staticmethod
+    def contact_facets(
+        db: Session,
+        user_id: int,
+        search: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Facet counts for the user's contacts matching search and filters.
+
+        Returns:
+            {"total": n, "facets": {facet: [{"value": v, "count": n}, ...]}}
+        """
+        from app.services.contact_service import ContactService
+
+        active = {k: v for k, v in (filters or {}).items() if v is not None}
+        key = "facets:" + json.dumps({"search": search, **active}, sort_keys=True, default=str)
+
+        def compute() -> Dict[str, Any]:
+            bucket = FacetService._temperature_bucket()
+            query = db.query(
+                Contact.city, Contact.current_industry, Contact.relationship_stage, bucket,
+                func.count(Contact.id)
+            ).filter(Contact.user_id == user_id)
+            query = ContactService.filter_contacts(query, user_id, search, active)
+            rows = query.group_by(
+                Contact.city, Contact.current_industry, Contact.relationship_stage, bucket
+            ).all()
+            return FacetService._fold(rows)
+
+        return contact_cache.get_or_set(
+            key, compute, scope=user_id, ttl=settings.facet_cache_ttl_seconds
+        )
+
+
+facet_service = FacetService()
@@ -0,0 +1,182 @@
+"""
+Follow-up service: the per-user "who to reach out to" priority index.
+"""
+import re
+from datetime import datetime, timedelta
+from typing import Any, List, Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import ActionPlaybook, Contact
+from app.services.cache_invalidation import invalidate_on_commit
+
+# Keyword -> days, checked in order (longer/more specific phrases first)
+_INTERVAL_KEYWORDS = [
+    ("半年", 180), ("季度", 90), ("双周", 14), ("两周", 14), ("隔周", 14),
+    ("明天", 1), ("每天", 1), ("每日", 1), ("本周", 3), ("这周", 3),
+    ("下周", 7), ("每周", 7), ("星期", 7), ("下个月", 30), ("下月", 30),
+    ("每个月", 30), ("每月", 30), ("每年", 365),
+    ("biweekly", 14), ("fortnight", 14), ("daily", 1), ("weekly", 7),
+    ("monthly", 30), ("quarterly", 90), ("yearly", 365), ("annually", 365),
+    ("a week", 7), ("a month", 30), ("a year", 365),
+]
+
+_UNIT_DAYS = {"天": 1, "日": 1, "周": 7, "星期": 7, "月": 30, "年": 365,
+              "day": 1, "week": 7, "month": 30, "year": 365}
+
+_CN_NUMBERS = {"一": 1, "两": 2, "二": 2, "三": 3, "四": 4, "五": 5, "六": 6}
+
+# Up to three digits, so a date such as "2026年底" is not read as 2026 years
+_NUMBER_UNIT = re.compile(
+    r"(?<!\d)(\d{1,3}|[一两二三四五六])\s*(?:个)?\s*(天|日|周|星期|月|年|day|week|month|year)s?"
+)
+# How often within the period: "一年两次", "每月3次", "3 times a year", "twice a month"
+_TIMES = re.compile(r"(\d+|[一两二三四五六])\s*次|(\d+)\s*times|(twice)")
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def parse_interval_days(text: Any) -> Optional[int]:
+    """
+    Parse a free-text cadence or timing ("每两周", "下周", "every 3 weeks") into days.
+
+    A frequency within the period divides it: "一年两次" is every 182 days.
+    Returns None if nothing recognisable is found.
+    """
+    if not isinstance(text, str) or not text.strip():
+        return None
+    text = text.strip().lower()
+
+    match = _NUMBER_UNIT.search(text)
+    if match:
+        number, unit = match.groups()
+        days = _parse_count(number) * _UNIT_DAYS[unit]
+    else:
+        days = next((d for keyword, d in _INTERVAL_KEYWORDS if keyword in text), None)
+    if days is None:
+        return None
+    return max(1, days // _times_per_period(text))
+
+
+def _parse_count(number: str) -> int:
+    return int(number) if number.isdigit() else _CN_NUMBERS[number]
+
+
+def _times_per_period(text: str) -> int:
+    """How many times per period the text asks for; 1 if it does not say."""
+    match = _TIMES.search(text)
+    if not match:
+        return 1
+    chinese, english, twice = match.groups()
+    if twice:
+        return 2
+    return max(1, _parse_count(chinese or english))
+
+
+class FollowUpService:
+    """
+    Maintains Contact.next_follow_up_at, a precomputed due date indexed together
+    with user_id, so the most overdue contacts are an index range scan.
+
+    due = last meeting + min(contact rhythm interval, suggested next-action timing),
+    falling back to follow_up_default_interval_days when neither can be parsed.
+    """
+
+    @staticmethod
+    def compute_due_at(
+        last_meeting_date: Optional[datetime],
+        created_at: Optional[datetime],
+        playbook: Optional[ActionPlaybook]
+    ) -> datetime:
+        """Compute the next follow-up date of a contact."""
+        anchor = last_meeting_date or created_at or datetime.now()
+        intervals: List[int] = []
+
+        if playbook:
+            rhythm = playbook.contact_rhythm
+            if isinstance(rhythm, dict):
+                days = parse_interval_days(rhythm.get("frequency"))
+                if days:
+                    intervals.append(days)
+
+            next_action = playbook.next_action
+            timing = next_action.get("timing") if isinstance(next_action, dict) else None
+            if isinstance(timing, str) and _ISO_DATE.search(timing):
+                try:
+                    return datetime.fromisoformat(_ISO_DATE.search(timing).group())
+                except ValueError:
+                    pass
+            days = parse_interval_days(timing)
+            if days:
+                intervals.append(days)
+
+        interval = min(intervals) if intervals else settings.follow_up_default_interval_days
+        return anchor + timedelta(days=interval)
+
+    @staticmethod
+    def refresh_contact(db: Session, contact: Contact, playbook: Optional[ActionPlaybook]) -> None:
+        """Recompute the due date of one contact. The caller commits."""
+        contact.next_follow_up_at = FollowUpService.compute_due_at(
+            contact.last_meeting_date, contact.created_at, playbook
+        )
+
+    @staticmethod
+    def list_due(
+        db: Session,
+        user_id: int,
+        due_before: Optional[datetime] = None,
+        limit: int = 10
+    ) -> List[Contact]:
+        """
+        Top contacts to follow up with, most overdue first.
+
+        Served by the (user_id, next_follow_up_at) index without scanning contacts.
+        """
+        query = db.query(Contact).filter(
+            Contact.user_id == user_id,
+            Contact.next_follow_up_at.isnot(None)
+        )
+        if due_before:
+            query = query.filter(Contact.next_follow_up_at <= due_before)
+        return query.order_by(Contact.next_follow_up_at, Contact.id).limit(limit).all()
+
+    @staticmethod
+    def rebuild_user(db: Session, user_id: int, batch_size: int = 1000) -> int:
+        """
+        Recompute due dates for all contacts of a user (backfill), in batches.
+
+        Returns:
+            Number of contacts updated
+        """
+        updated = 0
+        last_id = 0
+        while True:
+            rows = db.query(
+                Contact.id, Contact.last_meeting_date, Contact.created_at, ActionPlaybook
+            ).outerjoin(
+                ActionPlaybook, ActionPlaybook.contact_id == Contact.id
+            ).filter(
+                Contact.user_id == user_id,
+                Contact.id > last_id
+            ).order_by(Contact.id).limit(batch_size).all()
+            if not rows:
+                break
+
+            db.execute(update(Contact), [
+                {
+                    "id": contact_id,
+                    "next_follow_up_at": FollowUpService.compute_due_at(last, created, playbook)
+                }
+                for contact_id, last, created, playbook in rows
+            ])
+            # Core UPDATE: due dates show in cached contact lists and timelines
+            invalidate_on_commit(db, user_id)
+            db.commit()
+            updated += len(rows)
+            last_id = rows[-1][0]
+
+        return updated
+
+
+follow_up_service = FollowUpService()
@@ -0,0 +1,191 @@
+"""
+Contact history service: append-only field change log and point-in-time reads.
+"""
+import copy
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session, aliased
+
+from app.models.models import Contact, ContactChange
+
+# Derived or bookkeeping columns that are not part of the contact's recorded history
+_UNTRACKED_FIELDS = {
+    "id", "user_id", "last_meeting_date", "last_verified_at", "temperature_score",
+    "next_follow_up_at", "created_at", "updated_at",
+}
+TRACKED_FIELDS = tuple(
+    column.name for column in Contact.__table__.columns if column.name not in _UNTRACKED_FIELDS
+)
+
+
+class ContactHistoryService:
+    """
+    Records field-level diffs of contacts into contact_changes and reads them back.
+
+    Callers take a snapshot before mutating a contact and record the diff
+    before committing, so the log is written in the same transaction as the
+    update. Past states are reconstructed backwards from the current row:
+    the value of a field at time T is the old value of its first change
+    after T, or its current value if it has not changed since.
+    """
+
+    @staticmethod
+    def snapshot(contact: Contact) -> Dict[str, Any]:
+        """Current values of the tracked fields (loads expired attributes)."""
+        return {field: copy.deepcopy(getattr(contact, field)) for field in TRACKED_FIELDS}
+
+    @staticmethod
+    def record_changes(
+        db: Session,
+        contact: Contact,
+        before: Dict[str, Any],
+        source: str,
+        meeting_id: Optional[int] = None
+    ) -> int:
+        """
+        Append one change row per tracked field that differs from the snapshot,
+        stamped by the database clock like Contact.created_at. The caller commits.
+
+        Returns:
+            Number of changed fields
+        """
+        changed_at = func.now()
+        changes = [
+            ContactChange(
+                user_id=contact.user_id,
+                contact_id=contact.id,
+                field=field,
+                old_value=before.get(field),
+                new_value=getattr(contact, field),
+                source=source,
+                meeting_id=meeting_id,
+                changed_at=changed_at
+            )
+            for field in TRACKED_FIELDS
+            if getattr(contact, field) != before.get(field)
+        ]
+        db.add_all(changes)
+        return len(changes)
+
+    @staticmethod
+    def delete_for_contacts(db: Session, contact_ids: Iterable[int]) -> None:
+        """Drop the history of contacts being deleted. The caller commits."""
+        contact_ids = list(contact_ids)
+        if contact_ids:
+            db.query(ContactChange).filter(
+                ContactChange.contact_id.in_(contact_ids)
+            ).delete(synchronize_session=False)
+
+    @staticmethod
+    def list_changes(
+        db: Session,
+        contact_id: int,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[ContactChange]:
+        """Change log of one contact, newest first."""
+        return db.query(ContactChange).filter(
+            ContactChange.contact_id == contact_id
+        ).order_by(
+            ContactChange.changed_at.desc(), ContactChange.id.desc()
+        ).offset(skip).limit(limit).all()
+
+    @staticmethod
+    def contact_as_of(db: Session, contact: Contact, at: datetime) -> Optional[Dict[str, Any]]:
+        """
+        Tracked field values of a contact as they were at the given time.
+
+        History is only as old as the change log: fields changed before it
+        existed read as their earliest logged (or current) value.
+
+        Returns:
+            Field values, or None if the contact did not exist yet
+        """
+        created = db.query(Contact.id).filter(
+            Contact.id == contact.id,
+            Contact.created_at > at
+        ).first()
+        if created:
+            return None
+
+        values = ContactHistoryService.snapshot(contact)
+        later = db.query(
+            ContactChange.field, ContactChange.old_value
+        ).filter(
+            ContactChange.contact_id == contact.id,
+            ContactChange.changed_at > at
+        ).order_by(ContactChange.changed_at, ContactChange.id)
+
+        seen = set()
+        for field, old_value in later:
+            if field in seen or field not in values:
+                continue
+            values[field] = old_value
+            seen.add(field)
+        return values
+
+    @staticmethod
+    def changes_since(
+        db: Session,
+        user_id: int,
+        since: datetime,
+        contact_id: Optional[int] = None,
+        limit: int = 500
+    ) -> List[Dict[str, Any]]:
+        """
+        Net field changes of a user's contacts since a time, one item per
+        (contact, field): the value before the first change and after the last.
+        Fields that ended up back at their original value are omitted.
+
+        The first and last change of each field are picked in SQL (lowest and
+        highest ID in the range) and the result is streamed, so only up to
+        limit items are held in memory however many rows changed.
+
+        Returns:
+            Items ordered by most recent change first
+        """
+        spans = db.query(
+            ContactChange.contact_id,
+            ContactChange.field,
+            func.min(ContactChange.id).label("first_id"),
+            func.max(ContactChange.id).label("last_id"),
+            func.count(ContactChange.id).label("change_count")
+        ).filter(
+            ContactChange.user_id == user_id,
+            ContactChange.changed_at >= since
+        )
+        if contact_id is not None:
+            spans = spans.filter(ContactChange.contact_id == contact_id)
+        spans = spans.group_by(ContactChange.contact_id, ContactChange.field).subquery()
+
+        first, last = aliased(ContactChange), aliased(ContactChange)
+        query = db.query(
+            spans.c.contact_id, spans.c.field, first.old_value, last.new_value,
+            last.changed_at, spans.c.change_count
+        ).join(
+            first, first.id == spans.c.first_id
+        ).join(
+            last, last.id == spans.c.last_id
+        ).order_by(last.changed_at.desc(), last.id.desc())
+
+        items: List[Dict[str, Any]] = []
+        for cid, field, old_value, new_value, changed_at, change_count in query.yield_per(200):
+            # JSON values compare reliably only after loading
+            if old_value == new_value:
+                continue
+            items.append({
+                "contact_id": cid,
+                "field": field,
+                "old_value": old_value,
+                "new_value": new_value,
+                "changed_at": changed_at,
+                "change_count": change_count,
+            })
+            if len(items) >= limit:
+                break
+        return items
+
+
+contact_history_service = ContactHistoryService()
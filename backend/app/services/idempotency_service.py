@@ -0,0 +1,241 @@
+"""
+Idempotency service for safely retried write requests.
+"""
+import asyncio
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import IdempotencyKey
+
+
+# (record ID, processing_expires_at) of a key this request holds
+_Claim = tuple[int, datetime]
+
+
+class IdempotencyKeyMismatch(Exception):
+    """The key was already used for a request with a different fingerprint."""
+
+
+class IdempotencyInProgress(Exception):
+    """The original request is still running, or failed and can be retried."""
+
+
+class IdempotencyService:
+    """
+    Service for Idempotency-Key handling.
+
+    The first request with a key claims it and runs the operation. A duplicate
+    arriving on the same worker while it runs awaits the same in-flight job; a
+    duplicate on another worker polls the stored record until the response is
+    available. Completed responses are replayed until the key expires.
+
+    A claim is leased for idempotency_lease_seconds. If the request holding it
+    dies without releasing the key, the next retry after the lease takes the
+    key over and runs the operation again. Expired records are deleted by the
+    idempotency purge job.
+    """
+
+    def __init__(self):
+        # (user_id, key) -> (fingerprint, future of the response body)
+        self._inflight: Dict[tuple[int, str], tuple[str, asyncio.Future]] = {}
+
+    @staticmethod
+    def fingerprint(method: str, path: str, payload: Any) -> str:
+        """Fingerprint a request from its method, path and JSON body."""
+        canonical = json.dumps(
+            {"method": method, "path": path, "body": payload},
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def purge_expired(db: Session) -> int:
+        """Delete expired idempotency records. Returns the number of rows deleted."""
+        deleted = db.query(IdempotencyKey).filter(
+            IdempotencyKey.expires_at < datetime.now()
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+    @staticmethod
+    def lease_deadline() -> datetime:
+        """
+        When a claim taken now expires and the key can be claimed by a retry.
+        Whole seconds, so the value compares equal after a database round trip.
+        """
+        return datetime.now().replace(microsecond=0) + timedelta(
+            seconds=settings.idempotency_lease_seconds
+        )
+
+    @staticmethod
+    def _get_record(db: Session, user_id: int, key: str) -> Optional[IdempotencyKey]:
+        return db.query(IdempotencyKey).filter(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key
+        ).first()
+
+    @staticmethod
+    def _claimed(db: Session, claim: _Claim):
+        """Query for the record while the claim is still ours."""
+        record_id, claimed_until = claim
+        return db.query(IdempotencyKey).filter(
+            IdempotencyKey.id == record_id,
+            IdempotencyKey.status == "processing",
+            IdempotencyKey.processing_expires_at == claimed_until
+        )
+
+    def _insert_claim(
+        self,
+        db: Session,
+        user_id: int,
+        key: str,
+        fingerprint: str
+    ) -> Optional[_Claim]:
+        """Claim a new key; the unique constraint arbitrates between workers."""
+        claimed_until = self.lease_deadline()
+        record = IdempotencyKey(
+            user_id=user_id,
+            key=key,
+            request_fingerprint=fingerprint,
+            status="processing",
+            processing_expires_at=claimed_until,
+            expires_at=datetime.now() + timedelta(hours=settings.idempotency_ttl_hours)
+        )
+        db.add(record)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return None
+        return record.id, claimed_until
+
+    def _reclaim(self, db: Session, record: IdempotencyKey) -> Optional[_Claim]:
+        """
+        Take over a key whose claim expired because its request died. Only one
+        of several racing retries matches the old claim and wins.
+        """
+        claimed_until = self.lease_deadline()
+        updated = self._claimed(db, (record.id, record.processing_expires_at)).update(
+            {IdempotencyKey.processing_expires_at: claimed_until},
+            synchronize_session=False
+        )
+        db.commit()
+        return (record.id, claimed_until) if updated else None
+
+    async def execute(
+        self,
+        db: Session,
+        user_id: int,
+        key: str,
+        fingerprint: str,
+        operation: Callable[[], Awaitable[Dict[str, Any]]],
+        response_status: int = 200
+    ) -> tuple[Dict[str, Any], bool]:
+        """
+        Run an operation at most once per (user, key).
+
+        Args:
+            operation: Coroutine factory returning the JSON-serializable response body
+            response_status: Status code stored alongside the body
+
+        Returns:
+            Tuple of (response body, replayed)
+
+        Raises:
+            IdempotencyKeyMismatch: Key reused with a different request
+            IdempotencyInProgress: Original request still running elsewhere or failed
+        """
+        inflight = self._inflight.get((user_id, key))
+        if inflight:
+            inflight_fingerprint, future = inflight
+            if inflight_fingerprint != fingerprint:
+                raise IdempotencyKeyMismatch()
+            return await asyncio.shield(future), True
+
+        record = self._get_record(db, user_id, key)
+        if record and record.expires_at <= datetime.now():
+            # Expired but not purged yet; the key is free again
+            db.query(IdempotencyKey).filter(
+                IdempotencyKey.id == record.id,
+                IdempotencyKey.expires_at == record.expires_at
+            ).delete(synchronize_session=False)
+            db.commit()
+            record = None
+
+        claim = None if record else self._insert_claim(db, user_id, key, fingerprint)
+        if claim is None:
+            record = record or self._get_record(db, user_id, key)
+            if not record:
+                raise IdempotencyInProgress()
+            body, claim = await self._replay(db, record, fingerprint)
+            if claim is None:
+                return body, True
+
+        future = asyncio.get_running_loop().create_future()
+        # Avoid "exception was never retrieved" warnings when nobody attached
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[(user_id, key)] = (fingerprint, future)
+        try:
+            body = await operation()
+        except BaseException:
+            # Release the key so the client can retry, unless a retry took it over
+            db.rollback()
+            self._claimed(db, claim).delete(synchronize_session=False)
+            db.commit()
+            future.set_exception(IdempotencyInProgress())
+            raise
+        finally:
+            self._inflight.pop((user_id, key), None)
+
+        self._claimed(db, claim).update({
+            IdempotencyKey.status: "completed",
+            IdempotencyKey.processing_expires_at: None,
+            IdempotencyKey.response_status: response_status,
+            IdempotencyKey.response_body: body,
+        }, synchronize_session=False)
+        db.commit()
+        future.set_result(body)
+        return body, False
+
+    async def _replay(
+        self,
+        db: Session,
+        record: IdempotencyKey,
+        fingerprint: str
+    ) -> tuple[Optional[Dict[str, Any]], Optional[_Claim]]:
+        """
+        Return the stored response, waiting for another worker to finish if needed.
+
+        Returns (response body, None), or (None, claim) when the original
+        request died and this one took over the key; the caller then runs the
+        operation itself.
+        """
+        if record.request_fingerprint != fingerprint:
+            raise IdempotencyKeyMismatch()
+
+        record_id = record.id
+        deadline = asyncio.get_running_loop().time() + settings.idempotency_wait_seconds
+        while record.status != "completed":
+            claimed_until = record.processing_expires_at
+            if claimed_until is None or claimed_until <= datetime.now():
+                claim = self._reclaim(db, record)
+                if claim:
+                    return None, claim
+            if asyncio.get_running_loop().time() >= deadline:
+                raise IdempotencyInProgress()
+            await asyncio.sleep(0.5)
+            db.expire_all()
+            record = db.query(IdempotencyKey).filter(IdempotencyKey.id == record_id).first()
+            if not record:
+                # The original request failed and released the key
+                raise IdempotencyInProgress()
+        return record.response_body, None
+
+
+idempotency_service = IdempotencyService()
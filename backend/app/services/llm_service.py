@@ -2,25 +2,54 @@
 LLM service for extracting structured contact information from conversation text.
 """
 import json
+import threading
+import time
 from typing import Optional, Dict, Any
-from openai import OpenAI
 from app.core.config import settings
+from app.core.metrics import observe_llm_call
 
 
 class LLMService:
     """Service for LLM-based text extraction and structuring."""
 
     def __init__(self):
-        """Initialize the LLM service with OpenAI-compatible client."""
-        self.client = OpenAI(
-            api_key=settings.llm_api_key or "dummy-key",
-            base_url=settings.llm_base_url
-        )
+        """Initialize the LLM service; the OpenAI-compatible client is created on first use."""
+        self._client = None
+        self._client_lock = threading.Lock()
         self.model = settings.llm_model
         self.temperature = settings.llm_temperature
         self.max_tokens = settings.llm_max_tokens
         self.max_retries = settings.llm_max_retries
 
+    @property
+    def client(self):
+        """OpenAI-compatible client, created (and the openai package imported) on first use."""
+        return self.get_client()
+
+    def get_client(self):
+        """Return the client, creating it now if needed, e.g. at startup instead of on first use."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from openai import OpenAI
+
+                    self._client = OpenAI(
+                        api_key=settings.llm_api_key or "dummy-key",
+                        base_url=settings.llm_base_url
+                    )
+        return self._client
+
+    def _complete(self, operation: str, **kwargs):
+        """Call the chat completions API, recording its latency per operation."""
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            response = self.client.chat.completions.create(**kwargs)
+            outcome = "ok"
+            return response
+        finally:
+            observe_llm_call(operation, time.perf_counter() - started, outcome)
+
     def _create_system_prompt(self) -> str:
         """Create the system prompt for contact extraction."""
         return """你是一个专业的联系人信息提取专家。你的任务是从对话文本中提取结构化的联系人信息。
@@ -149,7 +178,8 @@ class LLMService:
 
         for attempt in range(self.max_retries + 1):
             try:
-                response = self.client.chat.completions.create(
+                response = self._complete(
+                    "extract_contact_info",
                     model=self.model,
                     messages=[
                         {"role": "system", "content": system_prompt},
@@ -217,7 +247,8 @@ class LLMService:
 
         for attempt in range(self.max_retries + 1):
             try:
-                response = self.client.chat.completions.create(
+                response = self._complete(
+                    "update_action_playbook",
                     model=self.model,
                     messages=[
                         {"role": "system", "content": "你是联系人关系管理专家，负责维护和更新行动剧本。"},
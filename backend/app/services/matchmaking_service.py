@@ -0,0 +1,365 @@
+"""
+Matchmaking service: introduction candidates from resource needs and offers.
+"""
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import Contact
+
+_LATIN_TOKEN = re.compile(r"[a-z0-9]+")
+_CJK_RUN = re.compile(r"[一-鿿㐀-䶿]+")
+
+# Words that say "need"/"offer"/"resource" rather than what is needed or offered
+_FILLER = re.compile(
+    r"需要|需求|寻找|想找|想要|希望|可以|可提供|提供|能够|能|帮忙|帮助|对接|介绍|相关|资源|方面|一些|的"
+)
+_STOP_WORDS = {
+    "a", "an", "and", "the", "of", "for", "to", "in", "on", "with", "need", "needs", "looking",
+    "offer", "offers", "provide", "can", "help", "some", "intro", "introduction", "resource",
+    "resources",
+}
+
+
+def resource_terms(text: Any) -> Set[str]:
+    """
+    Normalize a free-text need or offer into match terms: lowercase latin words
+    and CJK character bigrams (single characters for one-character runs), with
+    filler words such as 需要 / 提供 / looking for removed.
+    """
+    if not isinstance(text, str):
+        return set()
+    text = _FILLER.sub(" ", text.lower())
+    terms = {t for t in _LATIN_TOKEN.findall(text) if t not in _STOP_WORDS and len(t) > 1}
+    for run in _CJK_RUN.findall(text):
+        if len(run) == 1:
+            terms.add(run)
+        else:
+            terms.update(run[i:i + 2] for i in range(len(run) - 1))
+    return terms
+
+
+Signature = frozenset  # Normalized terms of a need or offer item
+ItemRef = tuple[int, int]  # (contact_id, position in the contact's needs or offers)
+
+
+@dataclass
+class _ContactEntry:
+    name: Optional[str]
+    needs: List[tuple[str, Signature]] = field(default_factory=list)  # (original text, terms)
+    offers: List[tuple[str, Signature]] = field(default_factory=list)
+
+
+class _Side:
+    """
+    One side (needs or offers) of a user's index. Items with the same normalized
+    terms share a signature, so matching runs over distinct signatures rather
+    than over every contact's items.
+    """
+
+    def __init__(self):
+        self.items: Dict[Signature, Set[ItemRef]] = {}
+        self.postings: Dict[str, Set[Signature]] = {}  # term -> signatures containing it
+
+    def add(self, signature: Signature, ref: ItemRef) -> None:
+        members = self.items.get(signature)
+        if members is None:
+            members = self.items[signature] = set()
+            for term in signature:
+                self.postings.setdefault(term, set()).add(signature)
+        members.add(ref)
+
+    def discard(self, signature: Signature, ref: ItemRef) -> None:
+        members = self.items.get(signature)
+        if members is None:
+            return
+        members.discard(ref)
+        if not members:
+            del self.items[signature]
+            for term in signature:
+                posting = self.postings.get(term)
+                if posting is not None:
+                    posting.discard(signature)
+                    if not posting:
+                        del self.postings[term]
+
+    def idf(self, term: str) -> float:
+        """Inverse document frequency over distinct signatures; rare terms weigh more."""
+        return math.log(1.0 + len(self.items) / (1.0 + len(self.postings.get(term, ()))))
+
+
+class _UserIndex:
+    """
+    Inverted indexes of one user's network, term -> signatures, for needs and
+    for offers, plus the per-contact entries they were built from.
+    """
+
+    def __init__(self):
+        self.contacts: Dict[int, _ContactEntry] = {}
+        self.needs = _Side()
+        self.offers = _Side()
+        self.built_at = time.monotonic()
+
+    @staticmethod
+    def _items(values: Any) -> List[tuple[str, Signature]]:
+        items = []
+        for value in values or []:
+            terms = resource_terms(value)
+            if terms:
+                items.append((str(value), frozenset(terms)))
+        return items
+
+    def _sections(self, entry: _ContactEntry):
+        return ((entry.needs, self.needs), (entry.offers, self.offers))
+
+    def remove(self, contact_id: int) -> None:
+        entry = self.contacts.pop(contact_id, None)
+        if not entry:
+            return
+        for items, side in self._sections(entry):
+            for position, (_, signature) in enumerate(items):
+                side.discard(signature, (contact_id, position))
+
+    def upsert(
+        self,
+        contact_id: int,
+        name: Optional[str],
+        needs: Any,
+        offers: Any
+    ) -> None:
+        self.remove(contact_id)
+        entry = _ContactEntry(name=name, needs=self._items(needs), offers=self._items(offers))
+        if not entry.needs and not entry.offers:
+            return
+        self.contacts[contact_id] = entry
+        for items, side in self._sections(entry):
+            for position, (_, signature) in enumerate(items):
+                side.add(signature, (contact_id, position))
+
+
+class MatchmakingService:
+    """
+    Finds introductions across a user's network: contact A needs X, contact B offers X.
+
+    Each user's needs/offers are held in in-memory inverted indexes, built on
+    first use and updated incrementally as contacts change. Items are grouped by
+    their normalized terms, and a need is scored against the offers sharing a
+    term with it by the IDF-weighted share of the need's terms the offer covers;
+    only the postings of a need's heaviest terms are probed (prefix filtering),
+    since an offer missing all of them cannot reach min_score. Ranked signature
+    pairs are then expanded into contact pairs only until the limit is reached.
+
+    Terms carried by more than matchmaking_max_term_share of the distinct
+    offers/needs are ignored as too generic, which keeps posting lists short at
+    tens of thousands of contacts. Indexes older than
+    matchmaking_index_ttl_seconds are dropped and rebuilt on next use, which
+    picks up writes made by other worker processes. At most
+    matchmaking_max_indexes users' indexes are kept, least recently used first out.
+    """
+
+    # Terms are never treated as generic while carried by fewer signatures than this
+    min_generic_postings = 100
+
+    def __init__(self):
+        self._indexes: "OrderedDict[int, _UserIndex]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def _build(self, db: Session, user_id: int) -> _UserIndex:
+        index = _UserIndex()
+        rows = db.query(
+            Contact.id, Contact.name, Contact.resource_needs, Contact.resource_offers
+        ).filter(
+            Contact.user_id == user_id
+        ).execution_options(yield_per=settings.export_batch_size)
+        for contact_id, name, needs, offers in rows:
+            index.upsert(contact_id, name, needs, offers)
+        return index
+
+    def _evict_expired(self) -> None:
+        """Drop indexes older than the TTL, so users not seen again do not hold memory."""
+        now = time.monotonic()
+        ttl = settings.matchmaking_index_ttl_seconds
+        for user_id in [uid for uid, index in self._indexes.items() if now - index.built_at > ttl]:
+            del self._indexes[user_id]
+
+    def _index(self, db: Session, user_id: int) -> _UserIndex:
+        with self._lock:
+            self._evict_expired()
+            index = self._indexes.get(user_id)
+            if index is None:
+                index = self._build(db, user_id)
+                self._indexes[user_id] = index
+                while len(self._indexes) > settings.matchmaking_max_indexes:
+                    self._indexes.popitem(last=False)
+            self._indexes.move_to_end(user_id)
+            return index
+
+    def contacts_changed(self, user_id: int, contacts: Iterable[Contact]) -> None:
+        """Re-index contacts after a write. No-op until the user's index is built."""
+        with self._lock:
+            index = self._indexes.get(user_id)
+            if index is None:
+                return
+            for contact in contacts:
+                index.upsert(
+                    contact.id, contact.name, contact.resource_needs, contact.resource_offers
+                )
+
+    def contacts_removed(self, user_id: int, contact_ids: Iterable[int]) -> None:
+        """Drop deleted contacts from the user's index."""
+        with self._lock:
+            index = self._indexes.get(user_id)
+            if index is None:
+                return
+            for contact_id in contact_ids:
+                index.remove(contact_id)
+
+    def _max_postings(self, side: _Side) -> int:
+        generic = int(len(side.items) * settings.matchmaking_max_term_share)
+        return max(self.min_generic_postings, generic)
+
+    def _score_pairs(
+        self,
+        index: _UserIndex,
+        need_signatures: Iterable[Signature],
+        offer_signatures: Optional[Set[Signature]],
+        min_score: float
+    ) -> List[tuple[float, Signature, Signature, Signature]]:
+        """
+        Score (need, offer) signature pairs sharing at least one term.
+
+        Returns (score, need, offer, shared terms) tuples, best first.
+        """
+        max_postings = self._max_postings(index.offers)
+        idf_cache: Dict[str, float] = {}
+        pairs = []
+        for need in need_signatures:
+            weights = {}
+            for term in need:
+                if term not in idf_cache:
+                    idf_cache[term] = index.offers.idf(term)
+                weights[term] = idf_cache[term]
+            need_weight = sum(weights.values()) or 1.0
+
+            # Prefix filter: an offer sharing none of the heaviest terms covering more than
+            # (1 - min_score) of the need's weight cannot reach min_score, so only probe those
+            candidates: Set[Signature] = set()
+            covered = 0.0
+            for term in sorted(need, key=weights.__getitem__, reverse=True):
+                if covered > (1.0 - min_score) * need_weight:
+                    break
+                covered += weights[term]
+                posting = index.offers.postings.get(term)
+                if posting and len(posting) <= max_postings:
+                    candidates.update(posting)
+            if offer_signatures is not None:
+                candidates &= offer_signatures
+
+            for offer in candidates:
+                shared = need & offer
+                score = sum(weights[t] for t in shared) / need_weight
+                if score >= min_score:
+                    pairs.append((score, need, offer, shared))
+
+        pairs.sort(key=lambda pair: pair[0], reverse=True)
+        return pairs
+
+    @staticmethod
+    def _expand(
+        index: _UserIndex,
+        pairs: List[tuple[float, Signature, Signature, Signature]],
+        limit: int,
+        needer_id: Optional[int] = None,
+        offerer_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Turn ranked signature pairs into contact introductions until the limit is reached."""
+        results: List[Dict[str, Any]] = []
+        # Best offer per (needer, need item, offerer): pairs are visited best first
+        seen: Set[tuple[int, int, int]] = set()
+        for score, need, offer, shared in pairs:
+            needers = index.needs.items.get(need, ())
+            offerers = index.offers.items.get(offer, ())
+            for n_id, n_pos in sorted(needers):
+                if needer_id is not None and n_id != needer_id:
+                    continue
+                for o_id, o_pos in sorted(offerers):
+                    if o_id == n_id or (offerer_id is not None and o_id != offerer_id):
+                        continue
+                    if (n_id, n_pos, o_id) in seen:
+                        continue
+                    seen.add((n_id, n_pos, o_id))
+                    needer, offerer = index.contacts[n_id], index.contacts[o_id]
+                    results.append({
+                        "needer_id": n_id,
+                        "needer_name": needer.name,
+                        "need": needer.needs[n_pos][0],
+                        "offerer_id": o_id,
+                        "offerer_name": offerer.name,
+                        "offer": offerer.offers[o_pos][0],
+                        "score": round(score, 4),
+                        "shared_terms": sorted(shared),
+                    })
+                    if len(results) >= limit:
+                        return results
+        return results
+
+    def find_introductions(
+        self,
+        db: Session,
+        user_id: int,
+        limit: int = 50,
+        min_score: float = 0.3
+    ) -> List[Dict[str, Any]]:
+        """Best introduction candidates across the user's whole network."""
+        with self._lock:
+            index = self._index(db, user_id)
+            pairs = self._score_pairs(index, list(index.needs.items), None, min_score)
+            return self._expand(index, pairs, limit)
+
+    def find_for_contact(
+        self,
+        db: Session,
+        user_id: int,
+        contact_id: int,
+        limit: int = 20,
+        min_score: float = 0.3
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Introductions involving one contact.
+
+        Returns:
+            {"can_help_them": who offers what they need,
+             "they_can_help": who needs what they offer}
+        """
+        with self._lock:
+            index = self._index(db, user_id)
+            entry = index.contacts.get(contact_id)
+            if not entry:
+                return {"can_help_them": [], "they_can_help": []}
+
+            own_needs = {signature for _, signature in entry.needs}
+            pairs = self._score_pairs(index, own_needs, None, min_score)
+            can_help_them = self._expand(index, pairs, limit, needer_id=contact_id)
+
+            own_offers = {signature for _, signature in entry.offers}
+            max_postings = self._max_postings(index.needs)
+            need_candidates: Set[Signature] = set()
+            for signature in own_offers:
+                for term in signature:
+                    posting = index.needs.postings.get(term)
+                    if posting and len(posting) <= max_postings:
+                        need_candidates.update(posting)
+            pairs = self._score_pairs(index, need_candidates, own_offers, min_score)
+            they_can_help = self._expand(index, pairs, limit, offerer_id=contact_id)
+
+        return {"can_help_them": can_help_them, "they_can_help": they_can_help}
+
+
+matchmaking_service = MatchmakingService()
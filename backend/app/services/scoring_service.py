@@ -0,0 +1,190 @@
+"""
+Scoring service for relationship temperature.
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import case, func, update
+from sqlalchemy.orm import Session
+
+from app.models.models import ActionPlaybook, Commitment, CommitmentStatus, Contact, Meeting, User
+from app.services.cache_invalidation import invalidate_user_caches
+
+
+class ScoringService:
+    """
+    Recomputes relationship temperature (0-100) for all contacts of a user in one
+    vectorized pass over per-contact meeting aggregates.
+
+    temperature = 100 * (w_recency   * exp(-days_since_last / recency_tau)
+                       + w_frequency * (1 - exp(-meetings_in_window / frequency_scale))
+                       + w_sentiment * (mean_sentiment + 1) / 2
+                       + w_commitments * (1 - min(open_commitments, cap) / cap))
+    """
+
+    recency_tau_days = 30.0
+    frequency_window_days = 90
+    frequency_scale = 3.0
+    commitment_window_days = 30
+    commitment_cap = 5.0
+    weights = {"recency": 0.45, "frequency": 0.25, "sentiment": 0.2, "commitments": 0.1}
+
+    # Scores that moved less than this are not written back
+    write_threshold = 0.1
+    write_chunk_size = 1000
+
+    @staticmethod
+    def _meeting_aggregates(db: Session, user_id: int, now: datetime):
+        """Per-contact (last meeting, meetings in window, mean sentiment) in one grouped query."""
+        window_start = now - timedelta(days=ScoringService.frequency_window_days)
+        return db.query(
+            Meeting.contact_id,
+            func.max(Meeting.meeting_date),
+            func.sum(case((Meeting.meeting_date >= window_start, 1), else_=0)),
+            func.avg(case(
+                (Meeting.sentiment == "positive", 1.0),
+                (Meeting.sentiment == "negative", -1.0),
+                else_=0.0
+            ))
+        ).filter(
+            Meeting.user_id == user_id,
+            Meeting.status == "completed"
+        ).group_by(Meeting.contact_id).all()
+
+    @staticmethod
+    def _open_commitment_counts(db: Session, user_id: int, now: datetime) -> dict[int, int]:
+        """Count open commitments from recent meetings, per contact, from the commitments table."""
+        since = now - timedelta(days=ScoringService.commitment_window_days)
+        rows = db.query(
+            Commitment.contact_id, func.count(Commitment.id)
+        ).join(
+            Meeting, Meeting.id == Commitment.meeting_id
+        ).filter(
+            Commitment.user_id == user_id,
+            Commitment.status == CommitmentStatus.OPEN.value,
+            Meeting.meeting_date >= since
+        ).group_by(Commitment.contact_id).all()
+        return {contact_id: count for contact_id, count in rows}
+
+    @staticmethod
+    def compute_scores(
+        days_since_last: np.ndarray,
+        meetings_in_window: np.ndarray,
+        mean_sentiment: np.ndarray,
+        open_commitments: np.ndarray
+    ) -> np.ndarray:
+        """
+        Vectorized temperature formula.
+
+        days_since_last is NaN for contacts without meetings; they get no recency credit.
+        """
+        w = ScoringService.weights
+        days = np.nan_to_num(days_since_last, nan=np.inf)
+        recency = np.exp(-days / ScoringService.recency_tau_days)
+        frequency = 1.0 - np.exp(-meetings_in_window / ScoringService.frequency_scale)
+        sentiment = (np.clip(mean_sentiment, -1.0, 1.0) + 1.0) / 2.0
+        commitments = 1.0 - np.minimum(open_commitments, ScoringService.commitment_cap) \
+            / ScoringService.commitment_cap
+
+        score = 100.0 * (
+            w["recency"] * recency
+            + w["frequency"] * frequency
+            + w["sentiment"] * sentiment
+            + w["commitments"] * commitments
+        )
+        return np.round(np.clip(score, 0.0, 100.0), 1)
+
+    @staticmethod
+    def recompute_user(db: Session, user_id: int, now: Optional[datetime] = None) -> int:
+        """
+        Recompute and bulk-write temperature scores for all contacts of a user.
+
+        Returns:
+            Number of contacts whose score changed
+        """
+        now = now or datetime.now()
+
+        contacts = db.query(Contact.id, Contact.temperature_score) \
+                     .filter(Contact.user_id == user_id) \
+                     .order_by(Contact.id).all()
+        if not contacts:
+            return 0
+
+        ids = np.fromiter((c[0] for c in contacts), dtype=np.int64, count=len(contacts))
+        current = np.array(
+            [np.nan if c[1] is None else c[1] for c in contacts], dtype=np.float64
+        )
+
+        n = len(ids)
+        days_since_last = np.full(n, np.nan)
+        meetings_in_window = np.zeros(n)
+        mean_sentiment = np.zeros(n)
+        open_commitments = np.zeros(n)
+
+        aggregates = ScoringService._meeting_aggregates(db, user_id, now)
+        if aggregates:
+            agg_ids = np.array([row[0] for row in aggregates], dtype=np.int64)
+            idx = np.searchsorted(ids, agg_ids)
+            now_ts = now.timestamp()
+            days_since_last[idx] = np.array(
+                [(now_ts - row[1].timestamp()) / 86400.0 for row in aggregates]
+            ).clip(min=0.0)
+            meetings_in_window[idx] = np.array(
+                [row[2] or 0 for row in aggregates], dtype=np.float64
+            )
+            mean_sentiment[idx] = np.array(
+                [row[3] or 0.0 for row in aggregates], dtype=np.float64
+            )
+
+        commitment_counts = ScoringService._open_commitment_counts(db, user_id, now)
+        if commitment_counts:
+            idx = np.searchsorted(ids, np.fromiter(commitment_counts.keys(), dtype=np.int64))
+            open_commitments[idx] = np.fromiter(commitment_counts.values(), dtype=np.float64)
+
+        scores = ScoringService.compute_scores(
+            days_since_last, meetings_in_window, mean_sentiment, open_commitments
+        )
+
+        changed = np.isnan(current) | (np.abs(current - scores) >= ScoringService.write_threshold)
+        changed_ids = ids[changed]
+        changed_scores = scores[changed]
+        if not len(changed_ids):
+            return 0
+
+        ScoringService._write_scores(db, changed_ids, changed_scores)
+        # Bulk UPDATEs bypass the ORM flush hooks, so drop cached temperatures explicitly
+        invalidate_user_caches(user_id)
+        return int(len(changed_ids))
+
+    @staticmethod
+    def _write_scores(db: Session, ids: np.ndarray, scores: np.ndarray) -> None:
+        """Bulk UPDATE contacts and their playbooks by primary key in chunks, in one transaction."""
+        score_by_contact = dict(zip(ids.tolist(), scores.tolist(), strict=True))
+        chunk = ScoringService.write_chunk_size
+
+        contact_rows = [{"id": cid, "temperature_score": s} for cid, s in score_by_contact.items()]
+        for start in range(0, len(contact_rows), chunk):
+            db.execute(update(Contact), contact_rows[start:start + chunk])
+
+        contact_ids = list(score_by_contact)
+        for start in range(0, len(contact_ids), chunk):
+            playbooks = db.query(ActionPlaybook.id, ActionPlaybook.contact_id).filter(
+                ActionPlaybook.contact_id.in_(contact_ids[start:start + chunk])
+            ).all()
+            if playbooks:
+                db.execute(update(ActionPlaybook), [
+                    {"id": pid, "temperature_score": score_by_contact[cid]}
+                    for pid, cid in playbooks
+                ])
+
+        db.commit()
+
+    @staticmethod
+    def recompute_all(db: Session, now: Optional[datetime] = None) -> int:
+        """Recompute temperature scores for every user. Returns the number of contacts changed."""
+        user_ids = [row[0] for row in db.query(User.id).all()]
+        return sum(ScoringService.recompute_user(db, user_id, now) for user_id in user_ids)
+
+
+scoring_service = ScoringService()
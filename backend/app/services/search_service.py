@@ -0,0 +1,382 @@
+"""
+Semantic search service: offline embedding search over meeting history.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import Contact, Meeting
+
+try:
+    import fcntl
+except ImportError:  # Windows: indexes are only safe to share between threads of one process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_LATIN_TOKEN = re.compile(r"[a-z0-9]+")
+_CJK_RUN = re.compile(r"[一-鿿㐀-䶿]+")
+
+
+def meeting_search_text(meeting: Meeting) -> str:
+    """Text indexed for a meeting: raw transcript, topics and key facts."""
+    parts = [meeting.raw_text or ""]
+    parts.extend(str(topic) for topic in meeting.topics or [])
+    for fact in meeting.key_facts or []:
+        parts.append(str(fact.get("fact", "")) if isinstance(fact, dict) else str(fact))
+    return "\n".join(p for p in parts if p)
+
+
+class HashingEmbedder:
+    """
+    Dependency-free fallback embedder: signed feature hashing of latin words and
+    CJK character uni/bi-grams, with sublinear term frequency and L2 normalization.
+    """
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    @staticmethod
+    def _features(text: str) -> Iterable[str]:
+        text = text.lower()
+        for token in _LATIN_TOKEN.findall(text):
+            yield token
+        for run in _CJK_RUN.findall(text):
+            yield from run
+            for i in range(len(run) - 1):
+                yield run[i:i + 2]
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        counts: Dict[int, float] = {}
+        for feature in self._features(text):
+            digest = int.from_bytes(
+                hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little"
+            )
+            bucket = digest % self.dim
+            sign = 1.0 if (digest >> 63) & 1 else -1.0
+            counts[bucket] = counts.get(bucket, 0.0) + sign
+
+        vector = np.zeros(self.dim, dtype=np.float32)
+        if counts:
+            buckets = np.fromiter(counts.keys(), dtype=np.int64)
+            values = np.fromiter(counts.values(), dtype=np.float32)
+            vector[buckets] = np.sign(values) * np.log1p(np.abs(values))
+        return vector
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.vstack([self._embed_one(t) for t in texts]) if texts \
+            else np.zeros((0, self.dim), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+class SentenceTransformerEmbedder:
+    """CPU embedding model via the optional sentence-transformers dependency."""
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+
+        self._model = SentenceTransformer(model_name, device="cpu")
+        self.dim = self._model.get_sentence_embedding_dimension()
+        self.name = f"st-{model_name}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = self._model.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+        return np.asarray(vectors, dtype=np.float32).reshape(len(texts), self.dim)
+
+
+def _create_embedder():
+    """Use the configured embedding model if available, else the hashing fallback."""
+    if settings.embedding_model:
+        try:
+            return SentenceTransformerEmbedder(settings.embedding_model)
+        except Exception:
+            logger.exception(
+                "Embedding model %s unavailable, using hashing embedder", settings.embedding_model
+            )
+    return HashingEmbedder(settings.embedding_dim)
+
+
+class _UserIndex:
+    """
+    Append-only, array-backed vector index of one user's meetings.
+
+    vectors.f32 holds float32 rows and ids.i64 the matching meeting IDs; both are
+    appended on ingestion and loaded with np.memmap, so opening an index is
+    cheap and pages are shared with the OS cache. A re-indexed meeting appends
+    a new row; the latest row for an ID wins. Rebuilding compacts the files.
+
+    Writers in all worker processes serialize on an flock of index.lock, so an
+    append never interleaves with another append, truncation or rebuild.
+    """
+
+    def __init__(self, directory: str, dim: int, embedder_name: str):
+        self.directory = directory
+        self.dim = dim
+        self.embedder_name = embedder_name
+        self.vectors_path = os.path.join(directory, "vectors.f32")
+        self.ids_path = os.path.join(directory, "ids.i64")
+        self.meta_path = os.path.join(directory, "meta.json")
+        self.lock_path = os.path.join(directory, "index.lock")
+        self._vectors: Optional[np.ndarray] = None
+        self._ids: Optional[np.ndarray] = None
+        self._latest: Optional[np.ndarray] = None
+
+    def is_compatible(self) -> bool:
+        """An index built by another embedder (or dimension) must be rebuilt."""
+        if not os.path.exists(self.meta_path):
+            return not os.path.exists(self.vectors_path)
+        with open(self.meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        return meta.get("embedder") == self.embedder_name and meta.get("dim") == self.dim
+
+    def _write_meta(self) -> None:
+        with open(self.meta_path, "w", encoding="utf-8") as f:
+            json.dump({"embedder": self.embedder_name, "dim": self.dim}, f)
+
+    def _row_count(self) -> int:
+        return os.path.getsize(self.ids_path) // 8 if os.path.exists(self.ids_path) else 0
+
+    def _load(self) -> None:
+        """Map the index files, remapping when another process has appended rows."""
+        count = self._row_count()
+        if count and os.path.getsize(self.vectors_path) < count * 4 * self.dim:
+            count = os.path.getsize(self.vectors_path) // (4 * self.dim)
+        if self._ids is not None and len(self._ids) == count:
+            return
+        if count == 0:
+            self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+            self._ids = np.zeros(0, dtype=np.int64)
+            self._latest = np.zeros(0, dtype=bool)
+            return
+        self._vectors = np.memmap(
+            self.vectors_path, dtype=np.float32, mode="r", shape=(count, self.dim)
+        )
+        self._ids = np.memmap(self.ids_path, dtype=np.int64, mode="r", shape=(count,))
+        # Only the last row of each meeting ID is live
+        _, first_from_end = np.unique(self._ids[::-1], return_index=True)
+        self._latest = np.zeros(count, dtype=bool)
+        self._latest[count - 1 - first_from_end] = True
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the index's cross-process write lock."""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _truncate_to_consistent(self) -> None:
+        """Drop a partially written trailing row left by an interrupted append. Needs the lock."""
+        if not os.path.exists(self.vectors_path) or not os.path.exists(self.ids_path):
+            return
+        rows = min(self._row_count(), os.path.getsize(self.vectors_path) // (4 * self.dim))
+        for path, row_size in ((self.vectors_path, 4 * self.dim), (self.ids_path, 8)):
+            if os.path.getsize(path) != rows * row_size:
+                os.truncate(path, rows * row_size)
+
+    def append(self, ids: np.ndarray, vectors: np.ndarray) -> None:
+        with self._locked():
+            if not os.path.exists(self.meta_path):
+                self._write_meta()
+            self._truncate_to_consistent()
+            with open(self.vectors_path, "ab") as f:
+                f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+            with open(self.ids_path, "ab") as f:
+                f.write(np.ascontiguousarray(ids, dtype=np.int64).tobytes())
+        self._vectors = self._ids = self._latest = None
+
+    def row_count(self) -> int:
+        """
+        Number of complete rows. Pass it to replace() as since, taken before
+        reading the data to index.
+        """
+        with self._locked():
+            if not os.path.exists(self.vectors_path):
+                return 0
+            return min(self._row_count(), os.path.getsize(self.vectors_path) // (4 * self.dim))
+
+    def _rows_since(self, since: int) -> tuple[np.ndarray, np.ndarray]:
+        count = self._row_count()
+        if count <= since:
+            return np.zeros(0, dtype=np.int64), np.zeros((0, self.dim), dtype=np.float32)
+        rows = count - since
+        ids = np.fromfile(self.ids_path, dtype=np.int64, count=rows, offset=since * 8)
+        vectors = np.fromfile(
+            self.vectors_path, dtype=np.float32, count=rows * self.dim, offset=since * 4 * self.dim
+        ).reshape(rows, self.dim)
+        return ids, vectors
+
+    def replace(self, ids: np.ndarray, vectors: np.ndarray, since: Optional[int] = None) -> None:
+        """
+        Atomically replace the whole index (used by rebuilds).
+
+        Rows appended after the since row count are carried over, so meetings
+        ingested while the rebuild was reading are not lost.
+        """
+        with self._locked():
+            # Rows of an index built by another embedder cannot be carried over
+            if since is not None and self.is_compatible():
+                self._truncate_to_consistent()
+                new_ids, new_vectors = self._rows_since(since)
+                ids = np.concatenate([ids.astype(np.int64), new_ids])
+                vectors = np.vstack([vectors.astype(np.float32), new_vectors])
+            for path, data in ((self.vectors_path, vectors.astype(np.float32)),
+                               (self.ids_path, ids.astype(np.int64))):
+                tmp_path = path + ".tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(np.ascontiguousarray(data).tobytes())
+                os.replace(tmp_path, path)
+            self._write_meta()
+        self._vectors = self._ids = self._latest = None
+
+    def search(self, query: np.ndarray, k: int) -> List[tuple[int, float]]:
+        """Top-k meeting IDs by cosine similarity (vectors are L2-normalized)."""
+        self._load()
+        if not len(self._ids) or k <= 0:
+            return []
+
+        scores = np.where(self._latest, self._vectors @ query, -np.inf)
+        k = min(k, int(self._latest.sum()))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        # Nothing in common with the query at all
+        return [(int(self._ids[row]), float(scores[row])) for row in top if scores[row] > 0]
+
+
+class SearchService:
+    """
+    Offline semantic search over meetings.
+
+    Each user has an on-disk vector index under search_index_dir, updated
+    incrementally as meetings are ingested. Search is an exact inner-product
+    scan over the memory-mapped matrix; at per-user scale (thousands of
+    meetings) this beats approximate structures and needs no training.
+    """
+
+    def __init__(self):
+        self._embedder = None
+        self._indexes: Dict[int, _UserIndex] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def embedder(self):
+        if self._embedder is None:
+            self._embedder = _create_embedder()
+        return self._embedder
+
+    def _index(self, user_id: int) -> _UserIndex:
+        index = self._indexes.get(user_id)
+        if index is None:
+            directory = os.path.join(settings.search_index_dir, f"user_{user_id}")
+            index = _UserIndex(directory, self.embedder.dim, self.embedder.name)
+            self._indexes[user_id] = index
+        return index
+
+    def index_meetings(self, user_id: int, meetings: List[Meeting]) -> int:
+        """Append meetings to a user's index. Returns the number of meetings indexed."""
+        meetings = [m for m in meetings if m.raw_text]
+        if not meetings:
+            return 0
+        vectors = self.embedder.embed([meeting_search_text(m) for m in meetings])
+        ids = np.array([m.id for m in meetings], dtype=np.int64)
+        with self._lock:
+            index = self._index(user_id)
+            if not index.is_compatible():
+                logger.warning("Search index of user %s is stale; run the rebuild job", user_id)
+                return 0
+            index.append(ids, vectors)
+        return len(meetings)
+
+    def index_meeting(self, meeting: Meeting) -> None:
+        """Index one newly ingested meeting. Failures are logged, never raised."""
+        try:
+            self.index_meetings(meeting.user_id, [meeting])
+        except Exception:
+            logger.exception("Failed to index meeting %s for search", meeting.id)
+
+    def rebuild_user(self, db: Session, user_id: int, batch_size: int = 500) -> int:
+        """Re-embed all meetings of a user and replace the index. Returns the number indexed."""
+        with self._lock:
+            since = self._index(user_id).row_count()
+        id_chunks, vector_chunks = [], []
+        last_id = 0
+        while True:
+            meetings = db.query(Meeting).filter(
+                Meeting.user_id == user_id,
+                Meeting.id > last_id
+            ).order_by(Meeting.id).limit(batch_size).all()
+            if not meetings:
+                break
+            meetings_with_text = [m for m in meetings if m.raw_text]
+            if meetings_with_text:
+                id_chunks.append(np.array([m.id for m in meetings_with_text], dtype=np.int64))
+                vector_chunks.append(self.embedder.embed(
+                    [meeting_search_text(m) for m in meetings_with_text]
+                ))
+            last_id = meetings[-1].id
+            db.expunge_all()
+
+        dim = self.embedder.dim
+        ids = np.concatenate(id_chunks) if id_chunks else np.zeros(0, dtype=np.int64)
+        if vector_chunks:
+            vectors = np.vstack(vector_chunks)
+        else:
+            vectors = np.zeros((0, dim), dtype=np.float32)
+        with self._lock:
+            self._index(user_id).replace(ids, vectors, since)
+        return len(ids)
+
+    def search(
+        self,
+        db: Session,
+        user_id: int,
+        query: str,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the meetings most similar to a free-text query.
+
+        Returns:
+            Dicts with meeting, contact_name and score, best first. Meetings deleted
+            since they were indexed are skipped.
+        """
+        index = self._index(user_id)
+        if not index.is_compatible():
+            logger.warning("Search index of user %s is stale; run the rebuild job", user_id)
+            return []
+        query_vector = self.embedder.embed([query])[0]
+        hits = index.search(query_vector, limit)
+        if not hits:
+            return []
+
+        rows = db.query(Meeting, Contact.name).join(
+            Contact, Contact.id == Meeting.contact_id
+        ).filter(
+            Meeting.user_id == user_id,
+            Meeting.id.in_([meeting_id for meeting_id, _ in hits])
+        ).all()
+        by_id = {meeting.id: (meeting, name) for meeting, name in rows}
+
+        return [
+            {"meeting": by_id[meeting_id][0], "contact_name": by_id[meeting_id][1], "score": score}
+            for meeting_id, score in hits if meeting_id in by_id
+        ]
+
+
+search_service = SearchService()
@@ -0,0 +1,146 @@
+"""
+Tag service: normalized topic/tag tables mirrored from JSON list columns.
+"""
+from typing import Any, Dict, Iterable, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
+
+from app.models.models import Contact, ContactTag, Meeting, MeetingTag, Tag
+
+# Contact columns mirrored into contact_tags, keyed by the filter name used by the API
+CONTACT_TAG_FIELDS = {
+    "topic": "focus_topics",
+    "project": "current_projects",
+    "industry": "current_industry",
+}
+
+
+def normalize_tag(value: Any) -> Optional[str]:
+    """Trim, collapse whitespace and lowercase a tag name; None if empty."""
+    if value is None or isinstance(value, (dict, list)):
+        return None
+    name = " ".join(str(value).split()).lower()[:100]
+    return name or None
+
+
+def _tag_names(value: Any) -> Set[str]:
+    values = value if isinstance(value, list) else [value]
+    return {name for name in map(normalize_tag, values) if name}
+
+
+class TagService:
+    """
+    Keeps contact_tags / meeting_tags in sync with Contact.focus_topics,
+    current_projects, current_industry and Meeting.topics, and builds the
+    indexed filters used by the list endpoints. The JSON columns stay the
+    source of truth; the link tables are a secondary index over them.
+    """
+
+    @staticmethod
+    def get_or_create_tags(db: Session, user_id: int, names: Iterable[str]) -> Dict[str, Tag]:
+        """Tags by normalized name, creating missing ones."""
+        names = set(names)
+        if not names:
+            return {}
+        tags = {
+            tag.name: tag for tag in db.query(Tag).filter(
+                Tag.user_id == user_id, Tag.name.in_(names)
+            )
+        }
+        for name in names - tags.keys():
+            try:
+                # Savepoint: another request may create the same tag concurrently
+                with db.begin_nested():
+                    tag = Tag(user_id=user_id, name=name)
+                    db.add(tag)
+            except IntegrityError:
+                tag = db.query(Tag).filter(Tag.user_id == user_id, Tag.name == name).one()
+            tags[name] = tag
+        return tags
+
+    @staticmethod
+    def sync_contact(db: Session, contact: Contact) -> None:
+        """Mirror a contact's topic fields into contact_tags. The caller commits."""
+        wanted = {
+            (column, name)
+            for column in CONTACT_TAG_FIELDS.values()
+            for name in _tag_names(getattr(contact, column))
+        }
+        tags = TagService.get_or_create_tags(db, contact.user_id, {name for _, name in wanted})
+        wanted_ids = {(column, tags[name].id) for column, name in wanted}
+
+        existing = {(link.field, link.tag_id): link for link in contact.tag_links}
+        for key, link in existing.items():
+            if key not in wanted_ids:
+                contact.tag_links.remove(link)
+        for column, tag_id in wanted_ids - existing.keys():
+            contact.tag_links.append(ContactTag(tag_id=tag_id, field=column))
+
+    @staticmethod
+    def sync_meeting(db: Session, meeting: Meeting) -> None:
+        """Mirror a meeting's topics into meeting_tags. The caller commits."""
+        tags = TagService.get_or_create_tags(db, meeting.user_id, _tag_names(meeting.topics or []))
+        wanted_ids = {tag.id for tag in tags.values()}
+
+        existing = {link.tag_id: link for link in meeting.tag_links}
+        for tag_id, link in existing.items():
+            if tag_id not in wanted_ids:
+                meeting.tag_links.remove(link)
+        for tag_id in wanted_ids - existing.keys():
+            meeting.tag_links.append(MeetingTag(tag_id=tag_id))
+
+    @staticmethod
+    def contact_filter(user_id: int, filter_name: str, value: str):
+        """SQL criterion: contact has the tag in the given field (topic, project, industry)."""
+        return Contact.id.in_(
+            select(ContactTag.contact_id).join(
+                Tag, Tag.id == ContactTag.tag_id
+            ).where(
+                Tag.user_id == user_id,
+                Tag.name == normalize_tag(value),
+                ContactTag.field == CONTACT_TAG_FIELDS[filter_name]
+            )
+        )
+
+    @staticmethod
+    def meeting_filter(user_id: int, topic: str):
+        """SQL criterion: meeting was about the topic."""
+        return Meeting.id.in_(
+            select(MeetingTag.meeting_id).join(
+                Tag, Tag.id == MeetingTag.tag_id
+            ).where(
+                Tag.user_id == user_id,
+                Tag.name == normalize_tag(topic)
+            )
+        )
+
+    @staticmethod
+    def rebuild_user(db: Session, user_id: int, batch_size: int = 500) -> int:
+        """
+        Backfill tag links for all contacts and meetings of a user, in batches.
+
+        Returns:
+            Number of contacts and meetings synced
+        """
+        synced = 0
+        for model, sync in ((Contact, TagService.sync_contact), (Meeting, TagService.sync_meeting)):
+            last_id = 0
+            while True:
+                rows = db.query(model).options(selectinload(model.tag_links)).filter(
+                    model.user_id == user_id,
+                    model.id > last_id
+                ).order_by(model.id).limit(batch_size).all()
+                if not rows:
+                    break
+                for row in rows:
+                    sync(db, row)
+                last_id = rows[-1].id
+                db.commit()
+                db.expunge_all()
+                synced += len(rows)
+        return synced
+
+
+tag_service = TagService()
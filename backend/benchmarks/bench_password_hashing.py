@@ -0,0 +1,80 @@
+"""
+Benchmark: event loop latency during a login storm.
+
+Compares hashing bcrypt passwords inline on the event loop against the
+offloaded pool in app.core.security. A ticker task measures how late the
+loop wakes up while the logins run.
+
+Usage:
+    python -m benchmarks.bench_password_hashing [--logins 32] [--rounds 12]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from app.core import security
+
+
+async def _ticker(samples: list[float], stop: asyncio.Event, interval: float = 0.005):
+    """Record how late each wake-up is compared to the requested interval."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append((time.perf_counter() - start - interval) * 1000)
+
+
+async def _inline_login(password: str, hashed: str):
+    security.pwd_context.verify_and_update(password, hashed)
+
+
+async def _offloaded_login(password: str, hashed: str):
+    await security.verify_and_update_password_async(password, hashed)
+
+
+async def _run(login, logins: int, password: str, hashed: str) -> dict:
+    samples: list[float] = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_ticker(samples, stop))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login(password, hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await ticker
+    samples = samples or [0.0]
+    return {
+        "logins": logins,
+        "wall_seconds": round(elapsed, 3),
+        "loop_lag_ms_p50": round(statistics.median(samples), 2),
+        "loop_lag_ms_max": round(max(samples), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=None, help="Override bcrypt cost")
+    args = parser.parse_args()
+
+    if args.rounds:
+        security.pwd_context.update(
+            bcrypt__rounds=args.rounds,
+            bcrypt__min_rounds=args.rounds,
+            bcrypt__max_rounds=args.rounds,
+        )
+
+    password = "correct horse battery staple"
+    hashed = security.get_password_hash(password)
+
+    results = {
+        "inline": asyncio.run(_run(_inline_login, args.logins, password, hashed)),
+        "offloaded": asyncio.run(_run(_offloaded_login, args.logins, password, hashed)),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: CPU per response for large list and timeline payloads.
+
+Compares FastAPI's classic path (validate ORM objects into the response model
+with from_attributes, jsonable_encoder, json.dumps) against the fast path used
+by the list and timeline endpoints (row tuples to dicts, pydantic-core dump_json).
+
+Usage:
+    python -m benchmarks.bench_serialization [--rows 100] [--repeat 200]
+"""
+import argparse
+import json
+import timeit
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.responses import FastJSONResponse, rows_to_dicts
+from app.models.database import Base
+from app.models.models import Contact, Meeting, User
+from app.models.schemas import ContactListItem, MeetingListItem
+
+
+def _seed(db, rows: int):
+    user = User(email="bench@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    now = datetime.now()
+    contact = Contact(user_id=user.id, name="联系人")
+    db.add(contact)
+    db.flush()
+    for i in range(rows):
+        db.add(Contact(
+            user_id=user.id, name=f"联系人{i}", current_company="星辰科技有限公司",
+            current_position="产品总监", last_meeting_date=now - timedelta(days=i),
+            relationship_stage="friend", temperature_score=60.0 + i % 40,
+        ))
+        db.add(Meeting(
+            user_id=user.id, contact_id=contact.id, meeting_date=now - timedelta(days=i),
+            location="上海", scenario="咖啡见面", raw_text="对话" * 500,
+            topics=["融资", "招聘", "出海"], sentiment="positive", status="completed",
+        ))
+    db.commit()
+    return user.id
+
+
+def _bench(label: str, model, orm_query, row_query, repeat: int) -> dict:
+    def classic():
+        items = [model.model_validate(obj) for obj in orm_query()]
+        return json.dumps(jsonable_encoder(items)).encode()
+
+    def fast():
+        return FastJSONResponse(rows_to_dicts(row_query())).body
+
+    classic_s = min(timeit.repeat(classic, number=repeat, repeat=3)) / repeat
+    fast_s = min(timeit.repeat(fast, number=repeat, repeat=3)) / repeat
+    return {
+        "payload": label,
+        "classic_ms": round(classic_s * 1000, 3),
+        "fast_ms": round(fast_s * 1000, 3),
+        "speedup": round(classic_s / fast_s, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    user_id = _seed(db, args.rows)
+
+    contact_cols = [getattr(Contact, f) for f in ContactListItem.model_fields]
+    meeting_cols = [getattr(Meeting, f) for f in MeetingListItem.model_fields]
+
+    results = [
+        _bench(
+            f"{args.rows} contacts", ContactListItem,
+            lambda: db.query(Contact).filter(Contact.user_id == user_id).limit(args.rows).all(),
+            lambda: (
+                db.query(*contact_cols).filter(Contact.user_id == user_id).limit(args.rows).all()
+            ),
+            args.repeat,
+        ),
+        _bench(
+            f"{args.rows} timeline meetings", MeetingListItem,
+            lambda: db.query(Meeting).filter(Meeting.user_id == user_id).all(),
+            lambda: db.query(*meeting_cols).filter(Meeting.user_id == user_id).all(),
+            args.repeat,
+        ),
+    ]
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
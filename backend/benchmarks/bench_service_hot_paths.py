@@ -0,0 +1,298 @@
+"""
+Benchmark: service hot paths against a large seeded database.
+
+Seeds a deterministic dataset (by default 50k contacts and 1M meetings with
+JSON fields populated, meetings skewed so a few contacts have thousands) and
+times the contact list, timeline, export, name lookup and playbook merge
+paths. Results are written as JSON so runs can be compared with --compare.
+
+The seeded database is reused across runs with the same size and seed.
+
+Usage:
+    python -m benchmarks.bench_service_hot_paths [--contacts 50000] [--meetings 1000000]
+        [--database-url sqlite:////tmp/rapport_bench.db] [--output results.json]
+        [--compare previous.json]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import sqlalchemy
+from sqlalchemy import create_engine, func, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.models.database import Base
+from app.models.models import ActionPlaybook, Contact, Meeting, User
+from app.models.schemas import ContactListItem, MeetingListItem
+from app.services.contact_service import contact_service, meeting_service
+
+BENCH_EMAIL = "bench-hot-paths@example.com"
+LIST_FIELDS = list(ContactListItem.model_fields)
+MEETING_LIST_FIELDS = list(MeetingListItem.model_fields)
+
+SURNAMES = "王李张刘陈杨黄赵吴周徐孙马朱胡郭何高林罗"
+GIVEN = "伟芳娜敏静丽强磊军洋勇艳杰娟涛明超秀霞平刚桂英华"
+COMPANIES = [
+    "星辰科技", "云帆资本", "蓝海医疗", "启明教育", "远景能源", "极光机器人", "晨曦传媒", "万象零售"
+]
+POSITIONS = ["CEO", "CTO", "产品总监", "投资经理", "销售总监", "工程师", "创始人", "合伙人"]
+CITIES = ["北京", "上海", "深圳", "杭州", "成都", "广州"]
+INDUSTRIES = ["科技", "金融", "医疗", "教育", "能源", "零售"]
+TOPICS = ["融资", "招聘", "出海", "AI", "供应链", "品牌", "并购", "政策", "增长", "数据安全"]
+STAGES = ["new", "acquaintance", "friend", "ally", "key_partner"]
+
+
+def _seed(db, contacts: int, meetings: int, seed: int, chunk: int = 5000) -> int:
+    rng = random.Random(seed)
+    user = User(email=BENCH_EMAIL, hashed_password="x")
+    db.add(user)
+    db.commit()
+    now = datetime.now()
+
+    contact_rows = []
+    for i in range(contacts):
+        contact_rows.append({
+            "user_id": user.id,
+            "name": rng.choice(SURNAMES) + rng.choice(GIVEN) + (rng.choice(GIVEN) if i % 2 else ""),
+            "current_company": rng.choice(COMPANIES),
+            "current_position": rng.choice(POSITIONS),
+            "current_industry": rng.choice(INDUSTRIES),
+            "city": rng.choice(CITIES),
+            "phone": f"138{i:08d}",
+            "focus_topics": rng.sample(TOPICS, 3),
+            "current_projects": [f"项目{rng.randint(1, 500)}"],
+            "resource_needs": rng.sample(TOPICS, 2),
+            "resource_offers": rng.sample(TOPICS, 2),
+            "relationship_stage": rng.choice(STAGES),
+            "temperature_score": round(rng.uniform(0, 100), 1),
+        })
+        if len(contact_rows) == chunk:
+            db.execute(insert(Contact), contact_rows)
+            contact_rows = []
+    if contact_rows:
+        db.execute(insert(Contact), contact_rows)
+    db.commit()
+
+    first_id = db.query(func.min(Contact.id)).filter(Contact.user_id == user.id).scalar()
+    last_meeting = {}
+    meeting_rows = []
+    for _ in range(meetings):
+        # Skewed towards low ids: a few contacts carry thousands of meetings
+        contact_id = first_id + int(contacts * rng.random() ** 2)
+        meeting_date = now - timedelta(minutes=rng.randint(0, 5 * 365 * 24 * 60))
+        last_meeting[contact_id] = max(last_meeting.get(contact_id, meeting_date), meeting_date)
+        meeting_rows.append({
+            "user_id": user.id,
+            "contact_id": contact_id,
+            "meeting_date": meeting_date,
+            "location": rng.choice(CITIES),
+            "scenario": "咖啡见面",
+            "raw_text": "今天聊了融资和招聘的进展，对方提到下个月要出海。" * 10,
+            "topics": rng.sample(TOPICS, 3),
+            "key_facts": [{"fact": "正在推进新一轮融资", "category": "公司"}],
+            "sentiment": rng.choice(["positive", "neutral", "negative"]),
+            "my_commitments": [{"commitment": "介绍投资人", "deadline": "下周五"}],
+            "their_commitments": [],
+            "open_loops": ["估值"],
+            "next_conversation_hooks": ["团队情况"],
+            "status": "completed",
+        })
+        if len(meeting_rows) == chunk:
+            db.execute(insert(Meeting), meeting_rows)
+            meeting_rows = []
+    if meeting_rows:
+        db.execute(insert(Meeting), meeting_rows)
+
+    playbook_rows = [
+        {
+            "contact_id": contact_id,
+            "preferences": ["咖啡", "跑步"],
+            "top_topics": rng.sample(TOPICS, 3),
+            "conversation_questions": ["最近融资进展如何？"],
+            "how_i_can_help_them": ["介绍投资人"],
+            "how_they_can_help_me": ["行业洞察"],
+            "relationship_stage": rng.choice(STAGES),
+            "temperature_score": round(rng.uniform(0, 100), 1),
+        }
+        for contact_id in last_meeting
+    ]
+    for start in range(0, len(playbook_rows), chunk):
+        db.execute(insert(ActionPlaybook), playbook_rows[start:start + chunk])
+
+    db.execute(
+        sqlalchemy.update(Contact),
+        [{"id": cid, "last_meeting_date": date} for cid, date in last_meeting.items()]
+    )
+    db.commit()
+    return user.id
+
+
+def _prepare(db, contacts: int, meetings: int, seed: int) -> int:
+    """Reuse a previously seeded dataset of the same size, or seed a new one."""
+    user = db.query(User).filter(User.email == BENCH_EMAIL).first()
+    if user:
+        n_contacts = db.query(func.count(Contact.id)).filter(Contact.user_id == user.id).scalar()
+        n_meetings = db.query(func.count(Meeting.id)).filter(Meeting.user_id == user.id).scalar()
+        if (n_contacts, n_meetings) == (contacts, meetings):
+            return user.id
+        raise SystemExit(
+            "Benchmark database holds a dataset of another size; "
+            "point --database-url at a fresh database or delete it"
+        )
+    return _seed(db, contacts, meetings, seed)
+
+
+def _time(name: str, fn, repeat: int, after=None) -> dict:
+    fn()  # Warm up caches and the connection
+    if after:
+        after()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+        if after:
+            after()
+    timings.sort()
+    return {
+        "name": name,
+        "repeat": repeat,
+        "min_ms": round(timings[0], 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        "max_ms": round(timings[-1], 3),
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _compare(results: list[dict], previous_path: str) -> None:
+    with open(previous_path, encoding="utf-8") as f:
+        previous = {r["name"]: r for r in json.load(f)["results"]}
+    print(f"\n{'benchmark':<48} {'before':>10} {'after':>10} {'change':>8}")
+    for result in results:
+        before = previous.get(result["name"])
+        if not before:
+            continue
+        change = (result["median_ms"] - before["median_ms"]) / before["median_ms"] * 100
+        print(
+            f"{result['name']:<48} {before['median_ms']:>9.2f}ms {result['median_ms']:>9.2f}ms "
+            f"{change:>+7.1f}%"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--contacts", type=int, default=50_000)
+    parser.add_argument("--meetings", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--database-url",
+        default="sqlite:///" + os.path.join(tempfile.gettempdir(), "rapport_bench.db"),
+        help="SQLite or MySQL URL; seeded on first use and reused afterwards"
+    )
+    parser.add_argument(
+        "--output", default="bench_hot_paths.json", help="Where to write JSON results"
+    )
+    parser.add_argument("--compare", default=None, help="Previous results file to compare against")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+
+    start = time.perf_counter()
+    user_id = _prepare(db, args.contacts, args.meetings, args.seed)
+    seed_seconds = time.perf_counter() - start
+
+    # Heaviest timeline and a typical one
+    by_meetings = db.query(Meeting.contact_id, func.count(Meeting.id)).filter(
+        Meeting.user_id == user_id
+    ).group_by(Meeting.contact_id).order_by(func.count(Meeting.id).desc()).all()
+    heavy_id, heavy_meetings = by_meetings[0]
+    typical_id, typical_meetings = by_meetings[len(by_meetings) // 2]
+    existing_name = db.get(Contact, typical_id).name
+    db.expunge_all()
+
+    playbook_update = {
+        "gift_care": {"preferences": ["茶", "高尔夫"]},
+        "conversation_hooks": {
+            "top_topics": ["出海"], "conversation_questions": ["团队扩张计划？"]
+        },
+        "collaboration_map": {"how_i_can_help_them": ["引荐客户"]},
+        "relationship_health": {"relationship_stage": "ally", "temperature_score": 80},
+    }
+
+    def reset():
+        db.rollback()
+        db.expunge_all()
+
+    repeat = args.repeat
+    results = [
+        _time("list_contacts", lambda: contact_service.list_contacts(
+            db, user_id, fields=LIST_FIELDS), repeat, reset),
+        _time("list_contacts search", lambda: contact_service.list_contacts(
+            db, user_id, search="星辰", fields=LIST_FIELDS), repeat, reset),
+        _time("list_contacts deep page", lambda: contact_service.list_contacts(
+            db, user_id, skip=args.contacts // 2, fields=LIST_FIELDS), repeat, reset),
+        _time(f"get_contact_with_timeline heavy ({heavy_meetings} meetings)",
+              lambda: contact_service.get_contact_with_timeline(
+                  db, heavy_id, user_id, meeting_fields=MEETING_LIST_FIELDS), repeat, reset),
+        _time(f"get_contact_with_timeline typical ({typical_meetings} meetings)",
+              lambda: contact_service.get_contact_with_timeline(
+                  db, typical_id, user_id, meeting_fields=MEETING_LIST_FIELDS), repeat, reset),
+        _time(f"export_contact_markdown heavy ({heavy_meetings} meetings)",
+              lambda: contact_service.export_contact_markdown(db, heavy_id, user_id),
+              max(1, repeat // 4), reset),
+        _time("find_or_create_contact_by_name exact",
+              lambda: contact_service.find_or_create_contact_by_name(
+                  db, user_id, existing_name), repeat, reset),
+        _time("find_or_create_contact_by_name partial",
+              lambda: contact_service.find_or_create_contact_by_name(
+                  db, user_id, existing_name[:-1]), repeat, reset),
+        _time("merge_action_playbook", lambda: (
+            meeting_service.merge_action_playbook(db, typical_id, playbook_update), db.flush()
+        ), repeat, reset),
+    ]
+
+    report = {
+        "benchmark": "service_hot_paths",
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "database": engine.dialect.name,
+        "dataset": {
+            "contacts": args.contacts,
+            "meetings": args.meetings,
+            "seed": args.seed,
+            "seed_or_load_seconds": round(seed_seconds, 2),
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    print(f"\nResults written to {args.output}")
+    if args.compare:
+        _compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
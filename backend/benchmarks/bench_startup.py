@@ -0,0 +1,101 @@
+"""
+Benchmark: cold start and per-query logging overhead.
+
+Runs each measurement in a fresh interpreter: importing app.main, running
+the lifespan startup (engine, pool warm-up, LLM client) and serving the
+first request. Also compares SQL execution with and without echo logging.
+
+Usage:
+    python -m benchmarks.bench_startup [--runs 5] [--queries 2000]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+_COLD_START = r"""
+import json, time
+t0 = time.perf_counter()
+import app.main
+t1 = time.perf_counter()
+from fastapi.testclient import TestClient
+from app.models.database import Base, get_engine
+Base.metadata.create_all(get_engine())
+with TestClient(app.main.app) as client:
+    t2 = time.perf_counter()
+    client.get("/health")
+    t3 = time.perf_counter()
+    client.post("/api/v1/auth/login", json={"email": "nobody@example.com", "password": "x"})
+    t4 = time.perf_counter()
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "startup_ms": (t2 - t1) * 1000,
+    "first_request_ms": (t3 - t2) * 1000,
+    "first_db_request_ms": (t4 - t3) * 1000,
+}))
+"""
+
+_QUERY_LOGGING = r"""
+import json, logging, sys, time
+from sqlalchemy import create_engine, text
+logging.basicConfig(stream=open("/dev/null", "w") if sys.platform != "win32" else None)
+queries = int(sys.argv[1])
+result = {}
+for echo in (False, True):
+    engine = create_engine(sys.argv[2], echo=echo)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        t0 = time.perf_counter()
+        for _ in range(queries):
+            conn.execute(text("SELECT 1")).scalar()
+        result["echo_on_us" if echo else "echo_off_us"] = (time.perf_counter() - t0) / queries * 1e6
+    engine.dispose()
+print(json.dumps(result))
+"""
+
+
+def _run(code: str, env: dict, *args: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", code, *args],
+        env=env, capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def _summarize(samples: list[dict]) -> dict:
+    return {
+        key: round(statistics.median(sample[key] for sample in samples), 2)
+        for key in samples[0]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(prefix="rapport-startup-"), "startup.db")
+    database_url = f"sqlite:///{db_path}"
+    base_env = {**os.environ, "DATABASE_URL": database_url, "SCHEDULER_ENABLED": "false"}
+
+    profiles = {
+        "production": {**base_env, "DEBUG": "false", "SQL_ECHO": "false", "STARTUP_WARMUP": "true"},
+        "debug": {**base_env, "DEBUG": "true", "SQL_ECHO": "true", "STARTUP_WARMUP": "false"},
+    }
+    results = {
+        name: _summarize([_run(_COLD_START, env) for _ in range(args.runs)])
+        for name, env in profiles.items()
+    }
+    results["query_logging"] = _summarize(
+        [_run(_QUERY_LOGGING, base_env, str(args.queries), database_url) for _ in range(args.runs)]
+    )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Shared test fixtures: a throwaway SQLite database, a stubbed LLM, an
+authenticated API client and strict SQL query budgets.
+"""
+import copy
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+# Settings are read at import time, so the environment must be set up first
+_TMP_DIR = tempfile.mkdtemp(prefix="rapport-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP_DIR}/test.db"
+os.environ["SEARCH_INDEX_DIR"] = os.path.join(_TMP_DIR, "search_index")
+os.environ["PASSWORD_HASH_ROUNDS"] = "4"
+os.environ["STARTUP_WARMUP"] = "false"
+os.environ["SCHEDULER_ENABLED"] = "false"
+os.environ["CACHE_BACKEND"] = "memory"
+os.environ["DEBUG"] = "false"
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.cache import cache  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.query_budget import track_queries  # noqa: E402
+from app.core.security import create_access_token, get_password_hash  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.database import Base, SessionLocal, get_engine  # noqa: E402
+from app.models.models import User  # noqa: E402
+from app.services.llm_service import llm_service  # noqa: E402
+from app.services.matchmaking_service import matchmaking_service  # noqa: E402
+from app.services.search_service import search_service  # noqa: E402
+
+Base.metadata.create_all(get_engine())
+
+FAKE_EXTRACTION = {
+    "contact": {
+        "name": "张伟",
+        "current_company": "星辰科技",
+        "current_industry": "科技",
+        "city": "上海",
+        "focus_topics": ["融资", "AI"],
+        "resource_needs": ["种子轮融资", "AI人才"],
+        "resource_offers": ["供应链渠道"],
+    },
+    "meeting": {
+        "topics": ["融资", "招聘"],
+        "sentiment": "positive",
+        "key_facts": [{"fact": "正在融资", "category": "公司"}],
+        "my_commitments": [{"commitment": "介绍投资人", "deadline": "2026-10-25"}],
+        "their_commitments": [{"commitment": "发BP", "deadline": None}],
+        "open_loops": ["估值"],
+        "next_conversation_hooks": ["团队情况"],
+    },
+    "action_playbook": {
+        "relationship_health": {
+            "relationship_stage": "friend",
+            "temperature_score": 70,
+            "next_action": {"action": "约咖啡", "timing": "下周", "reason": "跟进"},
+        },
+    },
+}
+
+MEETING_TEXT = "今天和张伟聊了融资和招聘的事情"
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_TMP_DIR, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def _reset_state():
+    """Empty all tables and in-process caches after each test."""
+    yield
+    with get_engine().begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+    cache.clear()
+    matchmaking_service._indexes.clear()
+    search_service._indexes.clear()
+    shutil.rmtree(settings.search_index_dir, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def fake_llm(monkeypatch):
+    """
+    Replace the LLM call with a canned extraction. Tests can swap the result
+    or make it raise through the returned dict:
+
+        fake_llm["error"] = RuntimeError("LLM down")
+    """
+    state = {"result": FAKE_EXTRACTION, "error": None, "calls": 0}
+
+    def extract_contact_info(text, known_name=None):
+        state["calls"] += 1
+        if state["error"] is not None:
+            raise state["error"]
+        result = copy.deepcopy(state["result"])
+        if known_name:
+            result["contact"]["name"] = known_name
+        return result
+
+    monkeypatch.setattr(llm_service, "extract_contact_info", extract_contact_info)
+    return state
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def user(db):
+    db_user = User(email="tester@example.com", hashed_password=get_password_hash("secret1"))
+    db.add(db_user)
+    db.commit()
+    db.refresh(db_user)
+    return db_user
+
+
+@pytest.fixture
+def client(user, monkeypatch):
+    """
+    API client authenticated as user. Route query budgets are strict, so an
+    endpoint going over its declared budget fails the test.
+    """
+    monkeypatch.setattr(settings, "query_budget_strict", True)
+    token = create_access_token(data={"sub": str(user.id)})
+    with TestClient(app) as test_client:
+        test_client.headers["Authorization"] = f"Bearer {token}"
+        yield test_client
+
+
+@pytest.fixture
+def max_queries():
+    """
+    Strict SQL statement budget for a block; the statement that would exceed
+    it raises QueryBudgetExceeded:
+
+        with max_queries(2) as log:
+            contact_service.list_contacts(db, user.id)
+        assert log.count == 2
+    """
+    @contextmanager
+    def _max_queries(budget: int, label: str = "test"):
+        with track_queries(label, budget, strict=True) as log:
+            yield log
+
+    return _max_queries
@@ -0,0 +1,138 @@
+"""
+Admission control for LLM work: fair ordering, caps, cancellation and rejection.
+"""
+import asyncio
+
+import pytest
+
+from app.core.admission import AdmissionController, AdmissionRejected
+from app.models.models import Contact, IdempotencyKey, Meeting
+from app.services import contact_service as contact_module
+from conftest import MEETING_TEXT
+
+
+async def settle():
+    """Let every runnable task advance until it blocks."""
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+async def run_in_grant_order(controller: AdmissionController, jobs: list[int]) -> list[int]:
+    """Queue one job per user ID in jobs behind a held slot; return users in the order served."""
+    served = []
+
+    async def job(user_id):
+        async with controller.slot(user_id):
+            served.append(user_id)
+            await asyncio.sleep(0)
+
+    async with controller.slot(0):
+        tasks = [asyncio.create_task(job(user_id)) for user_id in jobs]
+        await settle()
+        assert controller.queued == len(jobs)
+    await asyncio.gather(*tasks)
+    return served
+
+
+async def test_users_interleave_regardless_of_submission_order():
+    controller = AdmissionController(1, 1, 100, 100)
+    served = await run_in_grant_order(controller, [1] * 10 + [2] * 3)
+    assert served == [1, 2, 1, 2, 1, 2] + [1] * 7
+
+
+async def test_weights_scale_a_users_share():
+    controller = AdmissionController(1, 1, 100, 100, weights={"1": 2.0})
+    served = await run_in_grant_order(controller, [1] * 6 + [2] * 3)
+    assert served == [1, 1, 2, 1, 1, 2, 1, 1, 2]
+
+
+async def test_per_user_concurrency_cap():
+    controller = AdmissionController(4, 2, 100, 100)
+    release = asyncio.Event()
+    peak = {}
+
+    async def job(user_id):
+        async with controller.slot(user_id):
+            peak[user_id] = max(peak.get(user_id, 0), controller._running_by_user[user_id])
+            await release.wait()
+
+    tasks = [asyncio.create_task(job(1)) for _ in range(5)]
+    await settle()
+    assert (controller.running, controller.queued) == (2, 3)
+
+    # Another user is not stuck behind user 1's queue
+    tasks.append(asyncio.create_task(job(2)))
+    await settle()
+    assert controller.running == 3
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert peak == {1: 2, 2: 1}
+    assert (controller.running, controller.queued) == (0, 0)
+
+
+async def test_cancelled_waiter_leaves_the_queue():
+    controller = AdmissionController(1, 1, 100, 100)
+    async with controller.slot(1):
+        waiter = asyncio.create_task(controller.slot(2).__aenter__())
+        await settle()
+        assert controller.queued == 1
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert controller.queued == 0
+
+    assert (controller.running, controller.queued) == (0, 0)
+    # The slot is free again, not held by the cancelled waiter
+    async with controller.slot(3):
+        assert controller.running == 1
+
+
+async def test_full_queues_reject_with_retry_after():
+    controller = AdmissionController(1, 1, 2, 1, initial_service_seconds=10.0)
+    async with controller.slot(1):
+        queued = asyncio.create_task(controller.slot(1).__aenter__())
+        await settle()
+
+        # User 1's own queue is full
+        with pytest.raises(AdmissionRejected) as rejected:
+            controller.check(1)
+        # One running and one queued, 10 s each, one at a time
+        assert rejected.value.retry_after == 20
+        with pytest.raises(AdmissionRejected):
+            async with controller.slot(1):
+                pass
+
+        # Other users can still queue until the global queue is full
+        other = asyncio.create_task(controller.slot(2).__aenter__())
+        await settle()
+        with pytest.raises(AdmissionRejected) as rejected:
+            controller.check(3)
+        assert rejected.value.reason == "LLM queue is full"
+
+        for task in (queued, other):
+            task.cancel()
+        await asyncio.gather(queued, other, return_exceptions=True)
+
+
+def test_meeting_api_answers_429_without_writing(client, db, monkeypatch):
+    controller = AdmissionController(1, 1, 0, 0, initial_service_seconds=30.0)
+    monkeypatch.setattr(contact_module, "llm_admission", controller)
+    payload = {"raw_text": MEETING_TEXT, "contact_name": "张伟"}
+
+    response = client.post("/api/v1/meetings", json=payload)
+    assert response.status_code == 429
+    # Nothing queued or running: the minimum
+    assert response.headers["Retry-After"] == "1"
+
+    response = client.post("/api/v1/meetings", json=payload, headers={"Idempotency-Key": "k1"})
+    assert response.status_code == 429
+    assert db.query(Meeting).count() == 0
+    assert db.query(Contact).count() == 0
+    assert db.query(IdempotencyKey).count() == 0
+
+    # The rejected key is free for the retry
+    controller.max_queue_depth = controller.user_max_queue_depth = 10
+    response = client.post("/api/v1/meetings", json=payload, headers={"Idempotency-Key": "k1"})
+    assert response.status_code == 201
+    assert db.query(Meeting).count() == 1
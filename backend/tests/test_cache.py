@@ -0,0 +1,184 @@
+"""
+Cache versioning on the Redis backend, and invalidation of cached results on commit.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.cache import Cache, RedisBackend, cache_errors_total, cache_requests_total
+from app.core.config import settings
+from app.models.models import ActionPlaybook, Contact, Meeting
+from app.services import cache_invalidation
+from app.services.contact_service import meeting_service
+from app.services.follow_up_service import follow_up_service
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def worker_cache(server) -> Cache:
+    """Cache of one worker process: its own client and Cache objects, shared Redis."""
+    return Cache(RedisBackend("", client=fakeredis.FakeRedis(server=server)), prefix="test")
+
+
+def counter_value(counter, *labels) -> float:
+    return counter._values.get(labels, 0.0)
+
+
+def test_invalidation_reaches_other_workers(server):
+    first = worker_cache(server).namespace("contacts")
+    second = worker_cache(server).namespace("contacts")
+    computed = []
+
+    def compute():
+        computed.append(1)
+        return {"count": len(computed)}
+
+    assert first.get_or_set("facets", compute, scope=1) == {"count": 1}
+    assert second.get_or_set("facets", compute, scope=1) == {"count": 1}
+    assert len(computed) == 1
+
+    second.invalidate(1)
+    assert first.get_or_set("facets", compute, scope=1) == {"count": 2}
+    assert len(computed) == 2
+
+
+def test_invalidation_is_per_scope(server):
+    namespace = worker_cache(server).namespace("contacts")
+    namespace.get_or_set("facets", lambda: "user 1", scope=1)
+    namespace.get_or_set("facets", lambda: "user 2", scope=2)
+
+    namespace.invalidate(1)
+    assert namespace.get_or_set("facets", lambda: "recomputed", scope=1) == "recomputed"
+    assert namespace.get_or_set("facets", lambda: "recomputed", scope=2) == "user 2"
+
+
+def test_redis_errors_count_as_misses(server):
+    namespace = worker_cache(server).namespace("errors")
+    misses = counter_value(cache_requests_total, "errors", "miss")
+    get_errors = counter_value(cache_errors_total, "get")
+
+    server.connected = False
+    assert namespace.get_or_set("key", lambda: "fresh") == "fresh"
+    assert namespace.get_or_set("key", lambda: "fresher") == "fresher"
+
+    assert counter_value(cache_requests_total, "errors", "miss") == misses + 2
+    assert counter_value(cache_requests_total, "errors", "hit") == 0
+    assert counter_value(cache_errors_total, "get") > get_errors
+
+    # Nothing was cached while Redis was down
+    server.connected = True
+    assert namespace.get_or_set("key", lambda: "after recovery") == "after recovery"
+
+
+@pytest.fixture
+def invalidated(monkeypatch):
+    """(namespace, user ID) pairs invalidated by the commit hooks."""
+    calls = []
+
+    class Recorder:
+        def __init__(self, name):
+            self.name = name
+
+        def invalidate(self, scope):
+            calls.append((self.name, scope))
+
+    recorders = {name: Recorder(name) for name in cache_invalidation.NAMESPACES}
+    monkeypatch.setattr(cache_invalidation, "NAMESPACES", recorders)
+    return calls
+
+
+def make_contact(db, user_id):
+    contact = Contact(user_id=user_id, name="张伟")
+    db.add(contact)
+    db.commit()
+    return contact
+
+
+def test_contact_write_invalidates_contacts_and_timelines(db, user, invalidated):
+    contact = make_contact(db, user.id)
+    assert sorted(invalidated) == [("contacts", user.id), ("timelines", user.id)]
+
+    invalidated.clear()
+    contact.city = "上海"
+    db.commit()
+    assert sorted(invalidated) == [("contacts", user.id), ("timelines", user.id)]
+
+
+def test_meeting_and_playbook_writes_invalidate_timelines(db, user, invalidated):
+    user_id = user.id
+    contact = make_contact(db, user_id)
+    invalidated.clear()
+
+    db.add(Meeting(
+        user_id=user_id, contact_id=contact.id, meeting_date=datetime.now(), raw_text="x"
+    ))
+    db.commit()
+    assert invalidated == [("timelines", user_id)]
+
+    # The playbook's user is resolved through its contact, here not loaded in the session
+    contact_id = contact.id
+    db.expunge_all()
+    invalidated.clear()
+    db.add(ActionPlaybook(contact_id=contact_id, relationship_stage="friend"))
+    db.commit()
+    assert invalidated == [("timelines", user_id)]
+
+
+def test_rollback_invalidates_nothing(db, user, invalidated):
+    contact = make_contact(db, user.id)
+    invalidated.clear()
+
+    contact.city = "北京"
+    db.flush()
+    db.rollback()
+    assert invalidated == []
+
+    # Writes of the rolled back transaction are not carried into the next commit
+    db.commit()
+    assert invalidated == []
+
+
+def processing_meeting(db, user_id, attempts):
+    contact = make_contact(db, user_id)
+    meeting = Meeting(
+        user_id=user_id, contact_id=contact.id, meeting_date=datetime.now(), raw_text="x",
+        status="processing", attempts=attempts,
+        lease_expires_at=datetime.now() - timedelta(seconds=1)
+    )
+    db.add(meeting)
+    db.commit()
+    return meeting.id
+
+
+def test_recorded_failure_invalidates_timelines(db, user, invalidated, monkeypatch):
+    monkeypatch.setattr(settings, "meeting_max_attempts", 1)
+    user_id = user.id
+    meeting_id = processing_meeting(db, user_id, attempts=1)
+    invalidated.clear()
+
+    meeting_service.record_failure(db, meeting_id, user_id, 1, RuntimeError("LLM timeout"))
+    assert invalidated == [("timelines", user_id)]
+
+
+def test_recovery_failing_meetings_invalidates_timelines(db, user, invalidated, monkeypatch):
+    monkeypatch.setattr(settings, "meeting_max_attempts", 1)
+    user_id = user.id
+    processing_meeting(db, user_id, attempts=1)
+    invalidated.clear()
+
+    assert meeting_service.recover_expired(db) == {"recovered": 0, "failed": 1}
+    assert invalidated == [("timelines", user_id)]
+
+
+def test_follow_up_rebuild_invalidates_contacts_and_timelines(db, user, invalidated):
+    user_id = user.id
+    make_contact(db, user_id)
+    invalidated.clear()
+
+    assert follow_up_service.rebuild_user(db, user_id) == 1
+    assert sorted(invalidated) == [("contacts", user_id), ("timelines", user_id)]
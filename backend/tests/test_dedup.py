@@ -0,0 +1,65 @@
+"""
+Merging duplicate contacts.
+"""
+from sqlalchemy import select
+
+from app.models.models import (
+    ActionPlaybook, Commitment, Contact, ContactChange, ContactTag, Meeting, MeetingTag
+)
+from conftest import MEETING_TEXT
+
+# (child column, parent ID column) of every reference a merge must keep intact
+REFERENCES = [
+    (Meeting.contact_id, Contact.id),
+    (Commitment.contact_id, Contact.id),
+    (Commitment.meeting_id, Meeting.id),
+    (ActionPlaybook.contact_id, Contact.id),
+    (ContactChange.contact_id, Contact.id),
+    (ContactTag.contact_id, Contact.id),
+    (MeetingTag.meeting_id, Meeting.id),
+]
+
+
+def add_contact_with_meeting(client, name):
+    response = client.post(
+        "/api/v1/meetings", json={"raw_text": MEETING_TEXT, "contact_name": name}
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_merge_moves_everything_and_leaves_no_orphans(client, db):
+    add_contact_with_meeting(client, "张伟")
+    add_contact_with_meeting(client, "Zhang Wei")
+    primary_id, duplicate_id = sorted(contact_id for contact_id, in db.query(Contact.id))
+    response = client.put(f"/api/v1/contacts/{duplicate_id}", json={"wechat": "zhangwei88"})
+    assert response.status_code == 200
+
+    # Each contact has its own meeting, commitments, playbook, history and tags
+    for model in (Meeting, ActionPlaybook, ContactChange, ContactTag):
+        assert db.query(model).filter(model.contact_id == duplicate_id).count() > 0
+    assert db.query(Commitment).filter(Commitment.contact_id == duplicate_id).count() == 2
+
+    response = client.post("/api/v1/contacts/merge", json={
+        "primary_id": primary_id, "duplicate_ids": [duplicate_id]
+    })
+    assert response.status_code == 200, response.text
+    merged = response.json()
+    assert merged["wechat"] == "zhangwei88"
+    assert merged["nickname"] == "Zhang Wei"
+
+    db.expire_all()
+    assert db.get(Contact, duplicate_id) is None
+    assert {m.contact_id for m in db.query(Meeting)} == {primary_id}
+    assert db.query(Meeting).count() == 2
+    assert {c.contact_id for c in db.query(Commitment)} == {primary_id}
+    assert db.query(Commitment).count() == 4
+    assert [p.contact_id for p in db.query(ActionPlaybook)] == [primary_id]
+    # The duplicate's history and tag links go with it
+    assert db.query(ContactChange).filter(ContactChange.contact_id == duplicate_id).count() == 0
+    assert db.query(ContactTag).filter(ContactTag.contact_id == duplicate_id).count() == 0
+    assert db.query(ContactTag).filter(ContactTag.contact_id == primary_id).count() > 0
+
+    for column, parent in REFERENCES:
+        orphans = db.query(column).filter(column.not_in(select(parent))).count()
+        assert orphans == 0, f"orphaned {column}"
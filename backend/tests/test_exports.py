@@ -0,0 +1,83 @@
+"""
+Incremental bulk exports and their watermark, and the markdown zip export.
+"""
+import io
+import json
+import zipfile
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.models.models import Contact, Meeting
+from app.services.export_service import export_service
+
+
+def exported_names(response):
+    return sorted(json.loads(line)["data"]["name"] for line in response.text.splitlines())
+
+
+def test_watermark_is_database_time_minus_overlap(db, monkeypatch):
+    monkeypatch.setattr(settings, "export_watermark_overlap_seconds", 60)
+    database_now = db.execute(select(func.current_timestamp())).scalar_one()
+    overlap = database_now - export_service.watermark(db)
+    assert timedelta(seconds=59) <= overlap <= timedelta(seconds=61)
+
+
+def test_incremental_export_overlaps_the_previous_one(client, db, user):
+    # created_at/updated_at are stamped by the database clock
+    database_now = db.execute(select(func.current_timestamp())).scalar_one()
+    db.add(Contact(user_id=user.id, name="recent"))
+    db.add(Contact(user_id=user.id, name="old", created_at=database_now - timedelta(hours=1)))
+    db.commit()
+
+    first = client.get("/api/v1/exports/bulk", params={"entity": "contacts"})
+    assert exported_names(first) == ["old", "recent"]
+    watermark = first.headers["X-Export-Watermark"]
+    assert datetime.fromisoformat(watermark)
+
+    # Rows changed within the overlap are sent again; consumers dedupe by id
+    second = client.get("/api/v1/exports/bulk", params={"entity": "contacts", "since": watermark})
+    assert exported_names(second) == ["recent"]
+
+
+def add_contacts_with_meetings(db, user_id, meeting_counts):
+    """One contact per count, with that many completed meetings on consecutive days."""
+    contacts = []
+    for index, count in enumerate(meeting_counts):
+        contact = Contact(user_id=user_id, name=f"contact{index}")
+        db.add(contact)
+        db.flush()
+        for day in range(count):
+            db.add(Meeting(
+                user_id=user_id, contact_id=contact.id, status="completed",
+                meeting_date=datetime(2026, 1, day + 1), raw_text="x"
+            ))
+        contacts.append(contact)
+    db.commit()
+    return [(contact.id, contact.name) for contact in contacts]
+
+
+def test_markdown_zip_reads_meetings_per_contact_batch(db, user, max_queries, monkeypatch):
+    monkeypatch.setattr(settings, "export_batch_size", 2)
+    user_id = user.id
+    meeting_counts = [3, 0, 1, 2, 0]
+    contacts = add_contacts_with_meetings(db, user_id, meeting_counts)
+    db.expire_all()
+
+    # Contact batches of 2, 2 and 1, each with one playbook query and the
+    # meeting batches of its contacts: 3 meetings take 2 queries, 3 take 2, none 1
+    with max_queries(11) as log:
+        data = b"".join(export_service.iter_markdown_zip(db, user_id))
+    assert log.count == 11
+
+    archive = zipfile.ZipFile(io.BytesIO(data))
+    assert len(archive.namelist()) == len(contacts)
+    for (contact_id, name), count in zip(contacts, meeting_counts, strict=True):
+        markdown = archive.read(f"{name}_{contact_id}.md").decode("utf-8")
+        assert markdown.startswith(f"# {name}")
+        # Only the contact's own meetings, newest first
+        headings = [line for line in markdown.splitlines() if line.startswith("### ")]
+        assert headings == [f"### 2026-01-{day:02d}" for day in range(count, 0, -1)]
+        if count == 0:
+            assert "*暂无会谈记录*" in markdown
@@ -0,0 +1,30 @@
+"""
+Parsing of free-text contact rhythms and next-action timings.
+"""
+import pytest
+
+from app.services.follow_up_service import parse_interval_days
+
+
+@pytest.mark.parametrize("text, days", [
+    ("每两周", 14),
+    ("下周", 7),
+    ("3个月", 90),
+    ("every 3 weeks", 21),
+    ("quarterly", 90),
+    ("每个月", 30),
+    # A frequency divides the period
+    ("一年两次", 182),
+    ("每月两次", 15),
+    ("每周三次", 2),
+    ("每年一次", 365),
+    ("3 times a year", 121),
+    ("twice a month", 15),
+])
+def test_parse_interval_days(text, days):
+    assert parse_interval_days(text) == days
+
+
+@pytest.mark.parametrize("text", ["年底前", "月底", "2026年底前联系", "", None, "有空再聊"])
+def test_unrecognised_timing(text):
+    assert parse_interval_days(text) is None
@@ -0,0 +1,65 @@
+"""
+Contact change history: net changes since a time and point-in-time reads.
+"""
+from datetime import timedelta
+
+from sqlalchemy import func, select
+
+from app.models.models import Contact, ContactChange
+from app.models.schemas import ContactCreate, ContactUpdate
+from app.services.contact_service import contact_service
+from app.services.history_service import contact_history_service
+
+
+def database_time(db):
+    # SQLite stamps whole seconds; step back one so "since" precedes the changes
+    return db.execute(select(func.current_timestamp())).scalar_one() - timedelta(seconds=1)
+
+
+def update(db, user_id, contact_id, **values):
+    contact_service.update_contact(db, contact_id, user_id, ContactUpdate(**values))
+
+
+def test_changes_since_nets_each_field(db, user, max_queries):
+    user_id = user.id
+    contact = contact_service.create_contact(
+        db, user_id, ContactCreate(name="张伟", city="上海", phone="1")
+    )
+    since = database_time(db)
+    update(db, user_id, contact.id, city="北京", phone="2")
+    update(db, user_id, contact.id, city="深圳", phone="1")
+
+    with max_queries(1) as log:
+        items = contact_history_service.changes_since(db, user_id, since)
+    assert log.count == 1
+    # The phone number is back where it started
+    assert [(i["field"], i["old_value"], i["new_value"], i["change_count"]) for i in items] == [
+        ("city", "上海", "深圳", 2)
+    ]
+
+
+def test_changes_since_applies_limit_most_recent_first(db, user):
+    user_id = user.id
+    since = database_time(db)
+    contact_ids = []
+    for name in ["张伟", "李娜", "王芳"]:
+        contact_ids.append(contact_service.create_contact(db, user_id, ContactCreate(name=name)).id)
+    for contact_id in contact_ids:
+        update(db, user_id, contact_id, city="上海")
+
+    items = contact_history_service.changes_since(db, user_id, since, limit=2)
+    assert [item["contact_id"] for item in items] == contact_ids[:0:-1]
+
+    items = contact_history_service.changes_since(db, user_id, since, contact_id=contact_ids[0])
+    assert [(item["contact_id"], item["field"]) for item in items] == [(contact_ids[0], "city")]
+
+
+def test_changes_are_stamped_by_the_database_clock(db, user):
+    contact = contact_service.create_contact(db, user.id, ContactCreate(name="张伟"))
+    before = database_time(db)
+    update(db, user.id, contact.id, city="上海")
+    after = db.execute(select(func.current_timestamp())).scalar_one()
+
+    change = db.query(ContactChange).one()
+    assert before <= change.changed_at <= after
+    assert change.changed_at >= db.get(Contact, contact.id).created_at
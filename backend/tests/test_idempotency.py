@@ -0,0 +1,144 @@
+"""
+Idempotency-Key handling of meeting creation.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.models.models import IdempotencyKey, Meeting
+from app.models.schemas import MeetingCreate
+from app.services.contact_service import meeting_service
+from app.services.idempotency_service import idempotency_service
+from conftest import MEETING_TEXT
+
+PAYLOAD = {"raw_text": MEETING_TEXT, "contact_name": "张伟"}
+
+
+def post_meeting(client, key, payload=PAYLOAD):
+    return client.post("/api/v1/meetings", json=payload, headers={"Idempotency-Key": key})
+
+
+def test_retry_with_same_key_replays_the_response(client, db, fake_llm):
+    first = post_meeting(client, "k1")
+    assert first.status_code == 201
+    assert "Idempotent-Replayed" not in first.headers
+
+    second = post_meeting(client, "k1")
+    assert second.status_code == 201
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert second.json() == first.json()
+    assert db.query(Meeting).count() == 1
+    assert fake_llm["calls"] == 1
+
+
+def test_same_key_with_different_body_is_rejected(client, db):
+    assert post_meeting(client, "k1").status_code == 201
+    response = post_meeting(client, "k1", {**PAYLOAD, "raw_text": MEETING_TEXT + "，还有估值"})
+    assert response.status_code == 422
+    assert db.query(Meeting).count() == 1
+
+
+def test_failed_request_releases_the_key(client, db, monkeypatch):
+    create = meeting_service.create_meeting_from_text
+
+    async def fail_once(*args, **kwargs):
+        monkeypatch.setattr(meeting_service, "create_meeting_from_text", create)
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(meeting_service, "create_meeting_from_text", fail_once)
+    with pytest.raises(RuntimeError):
+        post_meeting(client, "k1")
+    assert db.query(IdempotencyKey).count() == 0
+
+    retry = post_meeting(client, "k1")
+    assert retry.status_code == 201
+    assert "Idempotent-Replayed" not in retry.headers
+    assert db.query(Meeting).count() == 1
+
+
+def test_failed_extraction_is_replayed_not_rerun(client, db, fake_llm):
+    # The meeting is stored and left to recovery, so the request itself succeeded
+    fake_llm["error"] = RuntimeError("LLM timeout")
+    first = post_meeting(client, "k1")
+    assert first.status_code == 201
+    assert first.json()["status"] == "processing"
+
+    fake_llm["error"] = None
+    second = post_meeting(client, "k1")
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert second.json()["id"] == first.json()["id"]
+    assert db.query(Meeting).count() == 1
+    assert fake_llm["calls"] == 1
+
+
+def add_key(db, user, status="processing", claimed_for=None, expires_in=timedelta(hours=1)):
+    """Store a key for PAYLOAD, as left behind by a request on another worker."""
+    fingerprint = idempotency_service.fingerprint(
+        "POST", "/api/v1/meetings", MeetingCreate(**PAYLOAD).model_dump(mode="json")
+    )
+    now = datetime.now().replace(microsecond=0)
+    db.add(IdempotencyKey(
+        user_id=user.id, key="k1", request_fingerprint=fingerprint, status=status,
+        processing_expires_at=now + claimed_for if claimed_for is not None else None,
+        response_status=201 if status == "completed" else None,
+        response_body={"id": -1} if status == "completed" else None,
+        expires_at=now + expires_in
+    ))
+    db.commit()
+
+
+def test_key_in_progress_on_another_worker(client, db, user, monkeypatch):
+    monkeypatch.setattr(settings, "idempotency_wait_seconds", 0)
+    add_key(db, user, claimed_for=timedelta(minutes=5))
+
+    response = post_meeting(client, "k1")
+    assert response.status_code == 409
+    assert response.headers["Retry-After"] == "5"
+    assert db.query(Meeting).count() == 0
+
+
+def test_key_of_a_dead_request_is_taken_over(client, db, user, fake_llm):
+    # The worker holding the key crashed; its claim expired
+    add_key(db, user, claimed_for=timedelta(seconds=-1))
+
+    response = post_meeting(client, "k1")
+    assert response.status_code == 201
+    assert "Idempotent-Replayed" not in response.headers
+    assert fake_llm["calls"] == 1
+
+    record = db.query(IdempotencyKey).one()
+    assert record.status == "completed"
+    assert record.processing_expires_at is None
+    assert post_meeting(client, "k1").json() == response.json()
+    assert db.query(Meeting).count() == 1
+
+
+def test_only_one_retry_takes_over_a_dead_key(db, user):
+    add_key(db, user, claimed_for=timedelta(seconds=-1))
+    # Both retries read the record before either took it over
+    record = db.query(IdempotencyKey).one()
+    db.expunge(record)
+
+    claim = idempotency_service._reclaim(db, record)
+    assert claim is not None
+    assert idempotency_service._reclaim(db, record) is None
+
+
+def test_expired_key_is_reused(client, db, user):
+    add_key(db, user, status="completed", expires_in=timedelta(seconds=-1))
+
+    response = post_meeting(client, "k1")
+    assert response.status_code == 201
+    assert "Idempotent-Replayed" not in response.headers
+    assert response.json()["id"] != -1
+    assert db.query(IdempotencyKey).one().status == "completed"
+
+
+def test_purge_deletes_only_expired_keys(db, user):
+    add_key(db, user, status="completed", expires_in=timedelta(seconds=-1))
+    assert idempotency_service.purge_expired(db) == 1
+
+    add_key(db, user, status="completed")
+    assert idempotency_service.purge_expired(db) == 0
+    assert db.query(IdempotencyKey).count() == 1
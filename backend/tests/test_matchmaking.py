@@ -0,0 +1,43 @@
+"""
+Per-user matchmaking indexes held in memory.
+"""
+from app.core.config import settings
+from app.models.models import Contact, User
+from app.services.matchmaking_service import matchmaking_service
+
+
+def add_user(db, number):
+    user = User(email=f"user{number}@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    db.add(Contact(user_id=user.id, name="张伟", resource_needs=["种子轮融资"]))
+    db.add(Contact(user_id=user.id, name="李娜", resource_offers=["种子轮融资"]))
+    db.commit()
+    return user.id
+
+
+def test_finds_introductions(db):
+    user_id = add_user(db, 1)
+    introductions = matchmaking_service.find_introductions(db, user_id)
+    assert len(introductions) == 1
+
+
+def test_least_recently_used_indexes_are_dropped(db, monkeypatch):
+    monkeypatch.setattr(settings, "matchmaking_max_indexes", 2)
+    first, second, third = (add_user(db, number) for number in range(3))
+
+    matchmaking_service.find_introductions(db, first)
+    matchmaking_service.find_introductions(db, second)
+    matchmaking_service.find_introductions(db, first)
+    matchmaking_service.find_introductions(db, third)
+    assert list(matchmaking_service._indexes) == [first, third]
+
+
+def test_expired_indexes_are_dropped(db, monkeypatch):
+    first, second = (add_user(db, number) for number in range(2))
+    matchmaking_service.find_introductions(db, first)
+    matchmaking_service._indexes[first].built_at -= settings.matchmaking_index_ttl_seconds + 1
+
+    # Served for another user, the expired index is dropped rather than kept until reuse
+    matchmaking_service.find_introductions(db, second)
+    assert list(matchmaking_service._indexes) == [second]
@@ -0,0 +1,243 @@
+"""
+Meeting ingestion: LLM extraction, search indexing and recovery of stuck meetings.
+"""
+import asyncio
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, update
+
+from app.core.admission import AdmissionController
+from app.core.config import settings
+from app.models.database import SessionLocal, get_engine
+from app.models.models import Contact, Meeting
+from app.models.schemas import MeetingCreate
+from app.services import contact_service as contact_module
+from app.services.contact_service import meeting_service
+from app.services.llm_service import llm_service
+from app.services.search_service import search_service
+from conftest import MEETING_TEXT
+
+
+async def test_meeting_is_indexed_off_the_event_loop(db, user, monkeypatch):
+    threads = []
+    monkeypatch.setattr(
+        search_service, "index_meeting", lambda meeting: threads.append(threading.get_ident())
+    )
+
+    meeting = await meeting_service.create_meeting_from_text(
+        db, user.id, MeetingCreate(raw_text=MEETING_TEXT, contact_name="张伟")
+    )
+    assert meeting.status == "completed"
+    assert len(threads) == 1
+    assert threads[0] != threading.get_ident()
+
+
+async def test_created_meeting_is_searchable(db, user):
+    meeting = await meeting_service.create_meeting_from_text(
+        db, user.id, MeetingCreate(raw_text=MEETING_TEXT, contact_name="张伟")
+    )
+    hits = search_service.search(db, user.id, "融资", limit=5)
+    assert [hit["meeting"].id for hit in hits] == [meeting.id]
+
+
+def create_meeting(db, user):
+    return meeting_service.create_meeting_from_text(
+        db, user.id, MeetingCreate(raw_text=MEETING_TEXT, contact_name="张伟")
+    )
+
+
+def expire_lease(db, meeting_id):
+    db.execute(update(Meeting).where(Meeting.id == meeting_id).values(
+        lease_expires_at=datetime.now() - timedelta(seconds=1)
+    ))
+    db.commit()
+
+
+def reload(db, meeting_id) -> Meeting:
+    db.expire_all()
+    return db.get(Meeting, meeting_id)
+
+
+@pytest.fixture
+def max_attempts(monkeypatch):
+    monkeypatch.setattr(settings, "meeting_max_attempts", 3)
+    monkeypatch.setattr(settings, "meeting_retry_delay_seconds", 60)
+    return 3
+
+
+async def test_failure_keeps_meeting_processing_with_backoff(db, user, fake_llm, max_attempts):
+    fake_llm["error"] = RuntimeError("LLM timeout")
+    meeting = await create_meeting(db, user)
+
+    assert meeting.status == "processing"
+    assert meeting.attempts == 1
+    assert meeting.error_message == "LLM timeout"
+    # Not retried before the backoff has elapsed
+    backoff = meeting.lease_expires_at - datetime.now()
+    assert timedelta(seconds=55) < backoff <= timedelta(seconds=60)
+    assert meeting_service.recover_expired(db) == {"recovered": 0, "failed": 0}
+
+
+async def test_sweeps_retry_until_out_of_attempts(db, user, fake_llm, max_attempts):
+    fake_llm["error"] = RuntimeError("LLM timeout")
+    meeting_id = (await create_meeting(db, user)).id
+
+    expire_lease(db, meeting_id)
+    assert meeting_service.recover_expired(db) == {"recovered": 1, "failed": 0}
+    meeting = reload(db, meeting_id)
+    assert (meeting.status, meeting.attempts) == ("processing", 2)
+    # The second retry waits twice as long
+    assert meeting.lease_expires_at - datetime.now() > timedelta(seconds=115)
+
+    expire_lease(db, meeting_id)
+    assert meeting_service.recover_expired(db) == {"recovered": 1, "failed": 0}
+    meeting = reload(db, meeting_id)
+    assert (meeting.status, meeting.attempts) == ("failed", 3)
+    assert meeting.lease_expires_at is None
+    assert fake_llm["calls"] == 3
+
+
+async def test_sweep_completes_meeting_after_transient_failure(db, user, fake_llm, max_attempts):
+    fake_llm["error"] = RuntimeError("LLM timeout")
+    meeting_id = (await create_meeting(db, user)).id
+
+    fake_llm["error"] = None
+    expire_lease(db, meeting_id)
+    assert meeting_service.recover_expired(db) == {"recovered": 1, "failed": 0}
+    meeting = reload(db, meeting_id)
+    assert (meeting.status, meeting.attempts) == ("completed", 2)
+    assert meeting.lease_expires_at is None
+    assert meeting.error_message is None
+    assert meeting.topics == ["融资", "招聘"]
+
+
+def stuck_meeting(db, user, attempts=1) -> Meeting:
+    """A meeting whose worker died mid-extraction."""
+    contact = Contact(user_id=user.id, name="张伟")
+    db.add(contact)
+    db.flush()
+    now = datetime.now()
+    meeting = Meeting(
+        user_id=user.id, contact_id=contact.id, raw_text=MEETING_TEXT, meeting_date=now,
+        status="processing", attempts=attempts, lease_expires_at=now - timedelta(seconds=1)
+    )
+    db.add(meeting)
+    db.commit()
+    return meeting
+
+
+def test_meeting_out_of_attempts_fails_without_llm_call(db, user, fake_llm, max_attempts):
+    meeting_id = stuck_meeting(db, user, attempts=max_attempts).id
+    assert meeting_service.recover_expired(db) == {"recovered": 0, "failed": 1}
+    meeting = reload(db, meeting_id)
+    assert meeting.status == "failed"
+    assert meeting.error_message == "Processing did not finish"
+    assert fake_llm["calls"] == 0
+
+
+def test_stale_worker_cannot_write_after_takeover(db, user, fake_llm, max_attempts, monkeypatch):
+    meeting_id = stuck_meeting(db, user).id
+    user_id = user.id
+    stale_results = []
+
+    def stale_worker_finishes():
+        # The original worker (attempt 1) returns while recovery (attempt 2) is extracting
+        stale = SessionLocal()
+        try:
+            meeting = stale.get(Meeting, meeting_id)
+            extracted = {"contact": {"city": "深圳"}, "meeting": {"topics": ["stale"]}}
+            stale_results.append(
+                meeting_service.apply_extraction(stale, meeting, meeting.contact, extracted, 1)
+            )
+            meeting_service.record_failure(
+                stale, meeting_id, user_id, 1, RuntimeError("stale failure")
+            )
+        finally:
+            stale.close()
+
+    extract = llm_service.extract_contact_info
+
+    def extract_during_stale_write(text, known_name=None):
+        stale_worker_finishes()
+        return extract(text, known_name)
+
+    monkeypatch.setattr(llm_service, "extract_contact_info", extract_during_stale_write)
+    assert meeting_service.recover_expired(db) == {"recovered": 1, "failed": 0}
+
+    assert stale_results == [False]
+    meeting = reload(db, meeting_id)
+    assert (meeting.status, meeting.attempts) == ("completed", 2)
+    assert meeting.topics == ["融资", "招聘"]
+    assert meeting.error_message is None
+    assert meeting.contact.city == "上海"
+
+
+def test_racing_sweepers_claim_a_meeting_once(user, fake_llm, max_attempts):
+    with SessionLocal() as db:
+        meeting_id = stuck_meeting(db, user).id
+    barrier = threading.Barrier(2, timeout=5)
+
+    def claim_together(conn, cursor, statement, parameters, context, executemany):
+        # Both sweepers have selected the meeting as a candidate before either claims it
+        if statement.startswith("UPDATE meetings SET attempts="):
+            barrier.wait()
+
+    def sweep(results):
+        with SessionLocal() as session:
+            results.append(meeting_service.recover_expired(session))
+
+    results = []
+    event.listen(get_engine(), "before_cursor_execute", claim_together)
+    try:
+        sweepers = [threading.Thread(target=sweep, args=(results,)) for _ in range(2)]
+        for sweeper in sweepers:
+            sweeper.start()
+        for sweeper in sweepers:
+            sweeper.join()
+    finally:
+        event.remove(get_engine(), "before_cursor_execute", claim_together)
+
+    assert sorted(result["recovered"] for result in results) == [0, 1]
+    assert fake_llm["calls"] == 1
+    with SessionLocal() as db:
+        meeting = db.get(Meeting, meeting_id)
+        assert (meeting.status, meeting.attempts) == ("completed", 2)
+
+
+async def test_recovery_waits_for_an_admission_slot(db, user, fake_llm, max_attempts, monkeypatch):
+    controller = AdmissionController(1, 1, 10, 10)
+    monkeypatch.setattr(contact_module, "llm_admission", controller)
+    meeting_id = stuck_meeting(db, user).id
+    loop = asyncio.get_running_loop()
+
+    async with controller.slot(user.id + 1):
+        sweep = asyncio.create_task(
+            asyncio.to_thread(meeting_service.recover_expired, db, 20, loop)
+        )
+        while not controller.queued:
+            await asyncio.sleep(0.01)
+        assert fake_llm["calls"] == 0
+
+    assert await sweep == {"recovered": 1, "failed": 0}
+    assert fake_llm["calls"] == 1
+    assert reload(db, meeting_id).status == "completed"
+
+
+async def test_recovery_rejected_by_full_queue_gives_the_attempt_back(
+    db, user, fake_llm, max_attempts, monkeypatch
+):
+    controller = AdmissionController(1, 1, 0, 0)
+    monkeypatch.setattr(contact_module, "llm_admission", controller)
+    meeting_id = stuck_meeting(db, user).id
+    loop = asyncio.get_running_loop()
+
+    async with controller.slot(user.id + 1):
+        result = await asyncio.to_thread(meeting_service.recover_expired, db, 20, loop)
+
+    assert result == {"recovered": 0, "failed": 0}
+    assert fake_llm["calls"] == 0
+    meeting = reload(db, meeting_id)
+    assert (meeting.status, meeting.attempts) == ("processing", 1)
+    assert meeting.lease_expires_at <= datetime.now()
@@ -0,0 +1,157 @@
+"""
+SQL statement counts of the contact read/write paths.
+
+The route budgets (query_budget(3/4/5) in app/api/contacts.py) are these
+service counts plus one statement for loading the authenticated user.
+"""
+import io
+import logging
+import zipfile
+
+import pytest
+
+from app.core.config import settings
+from app.core.query_budget import QueryBudgetExceeded
+from app.models.schemas import ContactUpdate
+from app.services.contact_service import contact_service
+from app.services.export_service import export_service
+from conftest import MEETING_TEXT
+
+CONTACT_NAMES = ["张伟", "李娜", "王芳"]
+
+
+@pytest.fixture
+def user_id(user):
+    # Read once, so later expire_all() calls do not add a users query to the counts
+    return user.id
+
+
+@pytest.fixture
+def contact_ids(client, db, user_id):
+    for name in CONTACT_NAMES:
+        response = client.post(
+            "/api/v1/meetings", json={"raw_text": MEETING_TEXT, "contact_name": name}
+        )
+        assert response.status_code == 201, response.text
+    contacts, _ = contact_service.list_contacts(db, user_id)
+    db.expire_all()
+    return sorted(contact.id for contact in contacts)
+
+
+def test_max_queries_raises_before_the_statement_over_budget(db, user_id, contact_ids, max_queries):
+    with pytest.raises(QueryBudgetExceeded):
+        with max_queries(1) as log:
+            contact_service.list_contacts(db, user_id)
+    assert log.count == 1
+
+
+def test_list_contacts(db, user_id, contact_ids, max_queries):
+    # COUNT(*) and the page itself
+    with max_queries(2) as log:
+        _, total = contact_service.list_contacts(db, user_id)
+    assert total == len(CONTACT_NAMES)
+    assert log.count == 2
+
+    with max_queries(2) as log:
+        contact_service.list_contacts(
+            db, user_id, fields=["id", "name"], filters={"topic": "融资", "city": "上海"}
+        )
+    assert log.count == 2
+
+
+def test_get_contact_with_timeline(db, user_id, contact_ids, max_queries):
+    # Contact, meetings, playbook
+    with max_queries(3) as log:
+        data = contact_service.get_contact_with_timeline(db, contact_ids[0], user_id)
+    assert len(data["meetings"]) == 1
+    assert data["action_playbook"] is not None
+    assert log.count == 3
+
+    with max_queries(2) as log:
+        contact_service.get_contact_with_timeline(db, contact_ids[0], user_id, include=["meetings"])
+    assert log.count == 2
+
+
+def test_get_contacts(db, user_id, contact_ids, max_queries):
+    with max_queries(1) as log:
+        contacts = contact_service.get_contacts(db, contact_ids, user_id)
+    assert sorted(contacts) == contact_ids
+    assert log.count == 1
+
+
+def test_update_contacts(db, user_id, contact_ids, max_queries):
+    # Fixed: load contacts, load their tag links, one batched UPDATE, reload.
+    # Per contact: tag lookup and the contact_changes insert.
+    budget = 4 + 2 * len(contact_ids)
+    updates = [(contact_id, ContactUpdate(city="北京")) for contact_id in contact_ids]
+    with max_queries(budget) as log:
+        updated = contact_service.update_contacts(db, user_id, updates)
+    assert {contact.city for contact in updated.values()} == {"北京"}
+    assert log.count == budget
+
+
+def test_export_paths(db, user_id, contact_ids, max_queries):
+    # Contact, playbook, one batch of meetings
+    with max_queries(3) as log:
+        markdown = contact_service.export_contact_markdown(db, contact_ids[0], user_id)
+    assert "互动历史" in markdown
+    assert log.count == 3
+
+    # One streamed query per entity
+    with max_queries(3) as log:
+        lines = "".join(
+            export_service.iter_jsonl(db, user_id, ["contacts", "meetings", "playbooks"], None)
+        )
+    assert len(lines.splitlines()) == 3 * len(CONTACT_NAMES)
+    assert log.count == 3
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("/api/v1/contacts", 3),
+    ("/api/v1/contacts/{id}", 2),
+    ("/api/v1/contacts/{id}/timeline", 4),
+    ("/api/v1/contacts/{id}/meetings", 4),
+    ("/api/v1/contacts/{id}/export", 4),
+    ("/api/v1/exports/bulk", 5),
+])
+def test_route_budgets(client, contact_ids, max_queries, path, expected):
+    # The client runs route budgets in strict mode, so going over one is a 500
+    with max_queries(expected) as log:
+        response = client.get(path.format(id=contact_ids[0]))
+    assert response.status_code == 200, response.text
+    assert log.count == expected
+
+
+def test_cached_timeline_only_loads_the_user(client, contact_ids, max_queries):
+    path = f"/api/v1/contacts/{contact_ids[0]}/timeline"
+    assert client.get(path).status_code == 200
+    with max_queries(1) as log:
+        response = client.get(path)
+    assert response.status_code == 200
+    assert log.count == 1
+
+
+def test_streaming_exports_have_no_budget(client, contact_ids, monkeypatch, caplog):
+    for _ in range(2):
+        response = client.post(
+            "/api/v1/meetings", json={"raw_text": MEETING_TEXT, "contact_name": "张伟"}
+        )
+        assert response.status_code == 201, response.text
+
+    # One row per batch, so every export runs more statements than the default budget
+    monkeypatch.setattr(settings, "export_batch_size", 1)
+    monkeypatch.setattr(settings, "query_budget_default", 3)
+    monkeypatch.setattr(settings, "query_repeat_threshold", 2)
+
+    with caplog.at_level(logging.WARNING, logger="app.core.query_budget"):
+        archive = client.get("/api/v1/contacts/export/zip")
+        markdown = client.get(f"/api/v1/contacts/{contact_ids[0]}/export")
+        bulk = client.get("/api/v1/exports/bulk")
+
+    assert archive.status_code == 200
+    assert len(zipfile.ZipFile(io.BytesIO(archive.content)).namelist()) == len(CONTACT_NAMES)
+    assert markdown.status_code == 200
+    assert markdown.text.count("### 20") == 3
+    assert bulk.status_code == 200
+    assert len(bulk.text.splitlines()) == 3 * len(CONTACT_NAMES) + 2
+    assert caplog.records == []
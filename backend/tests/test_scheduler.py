@@ -0,0 +1,74 @@
+"""
+Scheduled jobs: one worker per run through job leases, and shutdown.
+"""
+import asyncio
+import threading
+import time
+from datetime import timedelta
+
+from app import main
+from app.jobs.leases import acquire_job_lease, try_acquire
+from app.jobs.scheduler import JobScheduler
+from app.models.models import JobLease
+
+
+def test_lease_is_held_until_it_expires(db):
+    assert try_acquire(db, "job", 60, owner="worker-1")
+    assert not try_acquire(db, "job", 60, owner="worker-2")
+    assert try_acquire(db, "other job", 60, owner="worker-2")
+
+    lease = db.get(JobLease, "job")
+    lease.expires_at -= timedelta(seconds=61)
+    db.commit()
+    assert try_acquire(db, "job", 60, owner="worker-2")
+    db.refresh(lease)
+    assert lease.owner == "worker-2"
+
+
+async def test_exclusive_job_runs_on_one_worker():
+    runs = []
+    workers = [JobScheduler(acquire_lease=acquire_job_lease) for _ in range(3)]
+    for worker in workers:
+        worker.register("exclusive", 3600, lambda: runs.append("exclusive"),
+                        run_on_startup=True, exclusive=True)
+        worker.register("everywhere", 3600, lambda: runs.append("everywhere"),
+                        run_on_startup=True)
+        await worker.start()
+    await asyncio.sleep(0.2)
+    for worker in workers:
+        await worker.stop()
+
+    assert runs.count("exclusive") == 1
+    assert runs.count("everywhere") == 3
+
+
+async def test_stop_waits_for_running_job():
+    started = threading.Event()
+    finished = []
+
+    def slow_job():
+        started.set()
+        time.sleep(0.2)
+        finished.append(True)
+
+    scheduler = JobScheduler()
+    scheduler.register("slow", 3600, slow_job, run_on_startup=True)
+    await scheduler.start()
+    await asyncio.to_thread(started.wait, 1)
+
+    await scheduler.stop(timeout=5)
+    assert finished == [True]
+
+
+async def test_workers_starting_together_run_recovery_once(monkeypatch):
+    sweeps = []
+    monkeypatch.setattr(main, "recover_meetings", lambda loop=None: sweeps.append(loop))
+    loop = asyncio.get_running_loop()
+    workers = [main.create_scheduler(loop) for _ in range(3)]
+    for worker in workers:
+        await worker.start()
+    await asyncio.sleep(0.2)
+    for worker in workers:
+        await worker.stop()
+
+    assert sweeps == [loop]
@@ -0,0 +1,102 @@
+"""
+Concurrent writers of the on-disk search index, and the search endpoint.
+"""
+import asyncio
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from app.services.search_service import _UserIndex, fcntl, search_service
+from conftest import MEETING_TEXT
+
+DIM = 8
+
+
+def make_rows(ids):
+    # Every component of a row holds its meeting ID, so misaligned files are detectable
+    ids = np.asarray(ids, dtype=np.int64)
+    return ids, np.repeat(ids[:, None], DIM, axis=1).astype(np.float32)
+
+
+def read_rows(index: _UserIndex):
+    index._load()
+    return np.asarray(index._ids), np.asarray(index._vectors)
+
+
+def _append_worker(directory, first_id, batches):
+    index = _UserIndex(directory, DIM, "test")
+    for batch in range(batches):
+        index.append(*make_rows(range(first_id + batch * 3, first_id + batch * 3 + 3)))
+
+
+@pytest.mark.skipif(fcntl is None, reason="needs flock")
+def test_appends_from_several_processes_stay_aligned(tmp_path):
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(target=_append_worker, args=(str(tmp_path), worker * 10000, 50))
+        for worker in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+
+    ids, vectors = read_rows(_UserIndex(str(tmp_path), DIM, "test"))
+    assert len(ids) == 4 * 50 * 3
+    assert (vectors == ids[:, None]).all()
+
+
+def test_replace_keeps_rows_appended_during_rebuild(tmp_path):
+    index = _UserIndex(str(tmp_path), DIM, "test")
+    index.append(*make_rows([1, 2, 3]))
+
+    since = index.row_count()
+    # A worker ingests a meeting after the rebuild has read the database
+    index.append(*make_rows([4]))
+    index.replace(*make_rows([1, 2, 3]), since=since)
+
+    ids, vectors = read_rows(index)
+    assert ids.tolist() == [1, 2, 3, 4]
+    assert (vectors == ids[:, None]).all()
+
+
+def test_append_drops_partial_trailing_row(tmp_path):
+    index = _UserIndex(str(tmp_path), DIM, "test")
+    index.append(*make_rows([1, 2]))
+    # An append interrupted after writing the vector but not the ID
+    with open(index.vectors_path, "ab") as f:
+        f.write(make_rows([3])[1].tobytes())
+
+    index.append(*make_rows([4]))
+    ids, vectors = read_rows(index)
+    assert ids.tolist() == [1, 2, 4]
+    assert (vectors == ids[:, None]).all()
+
+
+def test_search_route_finds_new_meetings(client, monkeypatch):
+    # The route embeds and scans in a worker thread, not on the event loop
+    search = search_service.search
+    on_event_loop = []
+
+    def recording_search(*args, **kwargs):
+        try:
+            asyncio.get_running_loop()
+            on_event_loop.append(True)
+        except RuntimeError:
+            on_event_loop.append(False)
+        return search(*args, **kwargs)
+
+    monkeypatch.setattr(search_service, "search", recording_search)
+    created = client.post(
+        "/api/v1/meetings", json={"raw_text": MEETING_TEXT, "contact_name": "张伟"}
+    )
+    assert created.status_code == 201
+
+    response = client.get("/api/v1/search/meetings", params={"q": "融资"})
+    assert response.status_code == 200
+    hits = response.json()
+    assert [hit["meeting"]["id"] for hit in hits] == [created.json()["id"]]
+    assert hits[0]["contact_name"] == "张伟"
+    assert on_event_loop == [False]